@@ -0,0 +1,53 @@
+import logging
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.models.commodity import ReclassificationProgress
+from app.repositories.base import RequestRepository
+from app.services.request_reclassification import get_request_reclassifier
+from app.services.request_service import get_request_repository
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+logger = logging.getLogger("app")
+
+
+def _ndjson(events: Iterator[ReclassificationProgress]) -> Iterator[bytes]:
+    for event in events:
+        yield (event.model_dump_json() + "\n").encode("utf-8")
+
+
+@router.post(
+    "/requests/reclassify",
+    summary="Re-run commodity classification over all stored requests",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": (
+                "One ReclassificationProgress per written chunk; the last has done=true."
+            ),
+        },
+        409: {"description": "A run is already in progress"},
+    },
+)
+async def reclassify_requests(
+    restart: bool = False,
+    repo: RequestRepository = Depends(get_request_repository),
+) -> StreamingResponse:
+    """
+    Resumes an interrupted run from its checkpoint unless ``restart`` is set.
+    The (blocking) run is iterated in Starlette's thread pool.
+
+    The run lock is taken here, before the response starts, so a concurrent
+    call (from any worker or the CLI) gets a 409 instead of a failed stream;
+    the run's generator releases it when the stream ends.
+    """
+    reclassifier = get_request_reclassifier(repo)
+    if not reclassifier.acquire():
+        raise HTTPException(status_code=409, detail="Re-classification is already running")
+    logger.info("Starting request re-classification (restart=%s)", restart)
+    return StreamingResponse(
+        _ndjson(reclassifier.run(restart=restart)), media_type="application/x-ndjson"
+    )
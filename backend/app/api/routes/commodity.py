@@ -0,0 +1,69 @@
+import logging
+import os
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.config import settings
+from app.models.commodity import CommodityModelInfo
+from app.repositories.base import RequestRepository
+from app.services.commodity_model import (
+    CommodityModel,
+    get_commodity_model,
+    set_commodity_model,
+    train_from_requests,
+)
+from app.services.request_service import get_request_repository
+
+router = APIRouter(prefix="/commodity-model", tags=["commodity"])
+logger = logging.getLogger("app")
+
+
+def _info(model: CommodityModel) -> CommodityModelInfo:
+    return CommodityModelInfo(
+        trained_at=model.trained_at,
+        examples=model.examples,
+        groups=model.labels,
+        size_bytes=os.path.getsize(settings.commodity_model_path),
+    )
+
+
+@router.get(
+    "",
+    response_model=CommodityModelInfo,
+    summary="Describe the local commodity classifier",
+)
+async def get_model_info() -> CommodityModelInfo:
+    model = get_commodity_model()
+    if model is None:
+        raise HTTPException(status_code=404, detail="No commodity model has been trained")
+    return _info(model)
+
+
+@router.post(
+    "/train",
+    response_model=CommodityModelInfo,
+    summary="Train the local commodity classifier on the stored requests",
+)
+async def train_model(
+    repo: RequestRepository = Depends(get_request_repository),
+) -> CommodityModelInfo:
+    def train() -> CommodityModel:
+        # Page through the store so only each request's text is held at once.
+        requests = (request for page in repo.iter_pages() for request in page)
+        model = train_from_requests(
+            requests, min_examples=settings.commodity_model_min_examples
+        )
+        set_commodity_model(model)
+        return model
+
+    try:
+        model = await anyio.to_thread.run_sync(train)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    logger.info(
+        "Trained commodity model on %s requests (%s groups)",
+        model.examples,
+        len(model.labels),
+    )
+    return _info(model)
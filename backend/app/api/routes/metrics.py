@@ -0,0 +1,18 @@
+import anyio
+from fastapi import APIRouter, Depends, Response
+
+from app.core.metrics import CONTENT_TYPE, REGISTRY, REPOSITORY_REQUESTS
+from app.repositories.base import RequestRepository
+from app.services.request_service import get_request_repository
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=Response)
+async def metrics(
+    repo: RequestRepository = Depends(get_request_repository),
+) -> Response:
+    # Aggregates are rollups, so this stays O(groups) on every scrape.
+    aggregates = await anyio.to_thread.run_sync(repo.aggregates)
+    REPOSITORY_REQUESTS.set(aggregates.request_count)
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
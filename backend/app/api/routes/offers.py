@@ -1,16 +1,73 @@
+import json
 import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 
-from app.models.offer import OfferExtractionResult
+from app.core.config import settings
+from app.core.uploads import SpooledUpload, UploadTooLargeError, spool_upload
+from app.models.offer import OfferExtractionJob, OfferExtractionResult, OfferJobStatus
+from app.services.offer_cache import OfferExtractionCache, get_offer_cache
 from app.services.offer_extraction_service import (
     OfferExtractionService,
     get_offer_extraction_service,
 )
+from app.services.offer_job_service import (
+    JobQueueFullError,
+    OfferJobManager,
+    get_offer_job_manager,
+)
 
 router = APIRouter(prefix="/offers", tags=["offers"])
 logger = logging.getLogger("app")
 
+_MAX_POLL_WAIT_SECONDS = 30.0
+
+
+async def _submit_upload(
+    file: UploadFile, use_cache: bool, manager: OfferJobManager
+) -> OfferExtractionJob:
+    if file.content_type != "application/pdf":
+        logger.warning("Rejected upload with invalid content type: %s", file.content_type)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only PDF files are supported.",
+        )
+    try:
+        upload = await spool_upload(
+            file,
+            max_bytes=settings.offer_upload_max_bytes,
+            spool_threshold=settings.offer_upload_spool_bytes,
+        )
+    except UploadTooLargeError as exc:
+        logger.warning("Rejected oversized upload '%s'", file.filename)
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(exc),
+        )
+    try:
+        return await manager.submit(upload, use_cache)
+    except JobQueueFullError:
+        upload.close()
+        logger.warning("Rejected offer '%s': extraction queue is full", file.filename)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many offers are being parsed right now. Please retry shortly.",
+            headers={"Retry-After": "5"},
+        )
+
+
+def _batch_error(index: int, filename: Optional[str], detail: str) -> Dict[str, Any]:
+    return {"index": index, "filename": filename, "status": "error", "error": detail}
+
+
+def _get_job_or_404(job_id: str, manager: OfferJobManager) -> OfferExtractionJob:
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
 
 @router.post(
     "/parse",
@@ -19,21 +76,170 @@ logger = logging.getLogger("app")
 )
 async def parse_offer(
     file: UploadFile = File(...),
-    service: OfferExtractionService = Depends(get_offer_extraction_service),
+    use_cache: bool = Query(
+        True, description="Set to false to bypass the extraction cache lookup."
+    ),
+    manager: OfferJobManager = Depends(get_offer_job_manager),
 ) -> OfferExtractionResult:
-    if file.content_type != "application/pdf":
-        logger.warning("Rejected upload with invalid content type: %s", file.content_type)
+    # Synchronous wrapper around the job API: submit, then wait for the result.
+    job = await _submit_upload(file, use_cache, manager)
+    finished = await manager.wait(job.id, timeout=settings.offer_parse_timeout_seconds)
+    if finished is not None and not finished.is_finished:
+        logger.warning("Timed out waiting for offer job %s ('%s')", job.id, file.filename)
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only PDF files are supported.",
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Offer is still being parsed; poll /api/offers/jobs/{job.id} for the result.",
         )
-    try:
-        result = await service.extract(file)
-        logger.info("Successfully parsed uploaded offer '%s'", file.filename)
-        return result
-    except Exception:  # noqa: BLE001
-        logger.exception("Failed to parse uploaded offer '%s'", file.filename)
+    if finished is None or finished.status != OfferJobStatus.SUCCEEDED:
+        logger.error("Failed to parse uploaded offer '%s'", file.filename)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to parse offer document.",
         )
+    logger.info("Successfully parsed uploaded offer '%s'", file.filename)
+    return finished.result or OfferExtractionResult(order_lines=[])
+
+
+@router.post(
+    "/parse/batch",
+    summary="Parse several offer PDFs concurrently, streaming results as NDJSON",
+    response_class=StreamingResponse,
+)
+async def parse_offers_batch(
+    files: List[UploadFile] = File(...),
+    use_cache: bool = Query(
+        True, description="Set to false to bypass the extraction cache lookup."
+    ),
+    service: OfferExtractionService = Depends(get_offer_extraction_service),
+) -> StreamingResponse:
+    if len(files) > settings.offer_batch_max_files:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.offer_batch_max_files} files per batch.",
+        )
+
+    # Copy every file out of the request first; rejected files become error lines.
+    uploads: List[SpooledUpload] = []
+    positions: List[int] = []
+    rejected: List[Dict[str, Any]] = []
+    for index, file in enumerate(files):
+        if file.content_type != "application/pdf":
+            rejected.append(_batch_error(index, file.filename, "Only PDF files are supported."))
+            continue
+        try:
+            uploads.append(
+                await spool_upload(
+                    file,
+                    max_bytes=settings.offer_upload_max_bytes,
+                    spool_threshold=settings.offer_upload_spool_bytes,
+                )
+            )
+            positions.append(index)
+        except UploadTooLargeError as exc:
+            rejected.append(_batch_error(index, file.filename, str(exc)))
+
+    logger.info(
+        "Parsing batch of %s offers (%s rejected up front)", len(files), len(rejected)
+    )
+
+    async def ndjson_lines() -> AsyncIterator[str]:
+        try:
+            for line in rejected:
+                yield json.dumps(line) + "\n"
+            results = service.extract_many(
+                uploads, concurrency=settings.offer_batch_concurrency, use_cache=use_cache
+            )
+            async for upload_index, outcome in results:
+                index = positions[upload_index]
+                filename = uploads[upload_index].filename
+                if isinstance(outcome, Exception):
+                    line = _batch_error(index, filename, "Failed to parse offer document.")
+                else:
+                    line = {
+                        "index": index,
+                        "filename": filename,
+                        "status": "ok",
+                        "result": outcome.model_dump(mode="json"),
+                    }
+                yield json.dumps(line) + "\n"
+        finally:
+            for upload in uploads:
+                upload.close()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/jobs",
+    response_model=OfferExtractionJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit an offer PDF for background extraction",
+)
+async def submit_offer_job(
+    file: UploadFile = File(...),
+    use_cache: bool = Query(
+        True, description="Set to false to bypass the extraction cache lookup."
+    ),
+    manager: OfferJobManager = Depends(get_offer_job_manager),
+) -> OfferExtractionJob:
+    job = await _submit_upload(file, use_cache, manager)
+    logger.info("Queued offer job %s for '%s'", job.id, file.filename)
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=OfferExtractionJob,
+    summary="Get the status and result of an extraction job",
+)
+async def get_offer_job(
+    job_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=_MAX_POLL_WAIT_SECONDS,
+        description="Long-poll: wait up to this many seconds for the job to finish.",
+    ),
+    manager: OfferJobManager = Depends(get_offer_job_manager),
+) -> OfferExtractionJob:
+    job = _get_job_or_404(job_id, manager)
+    if wait and not job.is_finished:
+        job = await manager.wait(job_id, timeout=wait) or job
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="Stream extraction job updates as server-sent events",
+    response_class=StreamingResponse,
+)
+async def stream_offer_job(
+    job_id: str,
+    manager: OfferJobManager = Depends(get_offer_job_manager),
+) -> StreamingResponse:
+    _get_job_or_404(job_id, manager)
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for job in manager.watch(job_id):
+            if job is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {job.status.value}\ndata: {job.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/cache",
+    summary="Offer extraction cache statistics",
+)
+async def offer_cache_stats(
+    cache: Optional[OfferExtractionCache] = Depends(get_offer_cache),
+) -> Dict[str, Any]:
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -1,18 +1,36 @@
 import logging
-from typing import List
+from typing import List, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
-from app.models.request import ProcurementRequest, ProcurementRequestCreate
+from app.core.config import settings
+from app.core.json_response import json_bytes_response
+from app.core.ndjson import aiter_ndjson_lines
+from app.models.aggregates import SpendAggregates
+from app.models.request import (
+    ProcurementRequest,
+    ProcurementRequestCreate,
+    RequestImportResult,
+)
 from app.models.status import RequestStatus
-from app.services.request_service import RequestService, get_request_service
+from app.repositories.base import StaleRequestError
+from app.repositories.pagination import InvalidCursorError, RequestSortField
+from app.services.request_export import csv_chunks, ndjson_chunks
+from app.services.request_service import (
+    AsyncRequestService,
+    get_async_request_service,
+)
 
 router = APIRouter(prefix="/requests", tags=["requests"])
 logger = logging.getLogger("app")
 
 
+_REQUEST_LIST = TypeAdapter(List[ProcurementRequest])
+
+
 class StatusUpdatePayload(BaseModel):
     status: RequestStatus
 
@@ -23,16 +41,34 @@ class StatusUpdatePayload(BaseModel):
     summary="List procurement requests",
 )
 async def list_requests(
+    request: Request,
     status_filter: RequestStatus | None = None,
     department: str | None = None,
     search: str | None = None,
-    service: RequestService = Depends(get_request_service),
-) -> List[ProcurementRequest]:
-    results = service.list_requests(
-        status_filter=status_filter,
-        department=department,
-        search=search,
-    )
+    limit: int = Query(
+        settings.requests_page_default_limit, ge=1, le=settings.requests_page_max_limit
+    ),
+    cursor: str | None = Query(
+        None, description="Opaque cursor from the X-Next-Cursor header of the previous page."
+    ),
+    sort: RequestSortField | None = Query(
+        None, description="Defaults to relevance when searching, else created_at."
+    ),
+    order: Literal["asc", "desc"] = "asc",
+    service: AsyncRequestService = Depends(get_async_request_service),
+) -> Response:
+    try:
+        results, next_cursor = await service.list_requests_page(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            descending=order == "desc",
+            status_filter=status_filter,
+            department=department,
+            search=search,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     logger.debug(
         "Listed requests with filters status=%s department=%s search=%s -> %s items",
         status_filter,
@@ -40,7 +76,14 @@ async def list_requests(
         search,
         len(results),
     )
-    return results
+    # The repository returns complete models: serialize them straight to JSON
+    # bytes instead of letting response_model validate and dump them again.
+    return await json_bytes_response(
+        _REQUEST_LIST.dump_json(results),
+        request,
+        gzip_min_bytes=settings.requests_list_gzip_min_bytes,
+        headers={"X-Next-Cursor": next_cursor} if next_cursor is not None else None,
+    )
 
 
 @router.post(
@@ -51,9 +94,9 @@ async def list_requests(
 )
 async def create_request(
     payload: ProcurementRequestCreate,
-    service: RequestService = Depends(get_request_service),
+    service: AsyncRequestService = Depends(get_async_request_service),
 ) -> ProcurementRequest:
-    created = service.create_request(payload)
+    created = await service.create_request(payload)
     logger.info(
         "Created request %s for vendor %s with total %s",
         created.id,
@@ -63,6 +106,94 @@ async def create_request(
     return created
 
 
+@router.post(
+    "/import",
+    response_model=RequestImportResult,
+    summary="Bulk-create requests from a streamed NDJSON body",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+            "required": True,
+        }
+    },
+)
+async def import_requests(
+    request: Request,
+    service: AsyncRequestService = Depends(get_async_request_service),
+) -> RequestImportResult:
+    """
+    Each line is one ProcurementRequestCreate JSON object. Lines are validated
+    and stored in batches; invalid lines are reported by line number.
+    """
+    result = await service.import_requests(
+        aiter_ndjson_lines(
+            request.stream(), max_line_bytes=settings.requests_import_max_line_bytes
+        ),
+        batch_size=settings.requests_import_batch_size,
+        max_errors=settings.requests_import_max_errors,
+    )
+    logger.info(
+        "Imported %s requests (%s failed)", result.imported, result.failed
+    )
+    return result
+
+
+@router.get(
+    "/export",
+    summary="Stream all matching requests as NDJSON or CSV",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "NDJSON (one request per line) or CSV (one row per order line).",
+        }
+    },
+)
+async def export_requests(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status_filter: RequestStatus | None = None,
+    department: str | None = None,
+    search: str | None = None,
+    service: AsyncRequestService = Depends(get_async_request_service),
+) -> StreamingResponse:
+    batches = service.iter_request_batches(
+        batch_size=settings.requests_export_batch_size,
+        status_filter=status_filter,
+        department=department,
+        search=search,
+    )
+    logger.info(
+        "Exporting requests as %s (status=%s department=%s search=%s)",
+        format,
+        status_filter,
+        department,
+        search,
+    )
+    if format == "csv":
+        return StreamingResponse(
+            csv_chunks(batches),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="requests.csv"'},
+        )
+    return StreamingResponse(
+        ndjson_chunks(batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="requests.ndjson"'},
+    )
+
+
+@router.get(
+    "/aggregates",
+    response_model=SpendAggregates,
+    summary="Request counts and spend per commodity group, department, vendor and status",
+)
+async def get_aggregates(
+    service: AsyncRequestService = Depends(get_async_request_service),
+) -> SpendAggregates:
+    """Served from incrementally maintained rollups, not a scan of all requests."""
+    return await service.get_aggregates()
+
+
 @router.get(
     "/{request_id}",
     response_model=ProcurementRequest,
@@ -70,9 +201,9 @@ async def create_request(
 )
 async def get_request(
     request_id: UUID,
-    service: RequestService = Depends(get_request_service),
+    service: AsyncRequestService = Depends(get_async_request_service),
 ) -> ProcurementRequest:
-    req = service.get_request(request_id)
+    req = await service.get_request(request_id)
     if req is None:
         raise HTTPException(status_code=404, detail="Request not found")
     return req
@@ -86,9 +217,12 @@ async def get_request(
 async def update_request_status(
     request_id: UUID,
     payload: StatusUpdatePayload,
-    service: RequestService = Depends(get_request_service),
+    service: AsyncRequestService = Depends(get_async_request_service),
 ) -> ProcurementRequest:
-    updated = service.update_status(request_id, payload.status)
+    try:
+        updated = await service.update_status(request_id, payload.status)
+    except StaleRequestError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
     if updated is None:
         raise HTTPException(status_code=404, detail="Request not found")
     logger.info(
@@ -0,0 +1,65 @@
+"""
+Command-line maintenance tasks.
+
+Run from backend/:  python -m app.cli reclassify [--restart] [--workers N]
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.services.request_reclassification import RequestReclassifier
+from app.services.request_service import get_request_repository
+
+
+def _reclassify(args: argparse.Namespace) -> int:
+    if settings.request_repository_backend != "sqlite":
+        print(
+            "reclassify needs a shared store: set REQUEST_REPOSITORY_BACKEND=sqlite "
+            "(the in-memory store only lives inside the API process; use "
+            "POST /api/admin/requests/reclassify there instead).",
+            file=sys.stderr,
+        )
+        return 2
+    reclassifier = RequestReclassifier(
+        get_request_repository(),
+        checkpoint_path=args.checkpoint,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    for event in reclassifier.run(restart=args.restart):
+        if event.done:
+            print(event.model_dump_json(indent=2))
+        else:
+            print(
+                f"{event.scanned}/{event.total} scanned, {event.changed} changed",
+                file=sys.stderr,
+                flush=True,
+            )
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    setup_logging()
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reclassify = commands.add_parser(
+        "reclassify",
+        help="re-run commodity classification over all stored requests",
+        description="Resumes from the checkpoint of an interrupted run unless --restart is given.",
+    )
+    reclassify.add_argument("--restart", action="store_true", help="ignore the checkpoint")
+    reclassify.add_argument("--workers", type=int, default=settings.reclassify_workers)
+    reclassify.add_argument("--chunk-size", type=int, default=settings.reclassify_chunk_size)
+    reclassify.add_argument("--checkpoint", default=settings.reclassify_checkpoint_path)
+    reclassify.set_defaults(handler=_reclassify)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+# app/clients/openai_cassette.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+CASSETTE_MODES = ("record", "replay")
+
+
+def request_hash(request: httpx.Request) -> str:
+    """
+    SHA-256 of the method, path and canonical JSON body of an API request.
+
+    The body holds the model, prompt and document, so changing any of them
+    gives a new hash (and, in replay mode, a miss). Headers are ignored.
+    """
+    try:
+        body: Any = json.loads(request.content)
+    except ValueError:
+        body = request.content.decode("latin-1")
+    canonical = json.dumps(
+        {"method": request.method, "path": request.url.path, "body": body},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    Record OpenAI HTTP exchanges on disk, or answer from those recordings.
+
+    In "record" mode requests go to ``inner`` (the real network by default)
+    and every successful response body is stored as ``<request hash>.json``.
+    In "replay" mode no request leaves the process: recorded bodies are
+    returned as-is, and unknown requests get a 404 error response naming the
+    missing hash (a 404 is not retried by the SDK, so misses fail fast).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        mode: str,
+        inner: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self._inner = inner
+        if mode == "record" and self._inner is None:
+            self._inner = httpx.AsyncHTTPTransport()
+        self._logger = logging.getLogger("app")
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        key = request_hash(request)
+        if self.mode == "replay":
+            return self._replay(key)
+
+        assert self._inner is not None
+        response = await self._inner.handle_async_request(request)
+        body = await response.aread()
+        content_type = response.headers.get("content-type", "application/json")
+        if response.is_success:
+            self._record(key, request, response.status_code, content_type, body)
+        # The body is already decoded, so only the content type is passed on.
+        return httpx.Response(
+            response.status_code, headers={"content-type": content_type}, content=body
+        )
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            await self._inner.aclose()
+
+    def _replay(self, key: str) -> httpx.Response:
+        try:
+            with open(self.path_for(key), "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except FileNotFoundError:
+            self._logger.warning("No cassette recording for OpenAI request %s", key)
+            return httpx.Response(
+                404,
+                json={
+                    "error": {
+                        "message": f"No cassette recording for request {key} in {self.directory}",
+                        "type": "cassette_miss",
+                    }
+                },
+            )
+        return httpx.Response(
+            entry["status_code"],
+            headers={"content-type": entry["content_type"]},
+            content=entry["body"].encode("utf-8"),
+        )
+
+    def _record(
+        self,
+        key: str,
+        request: httpx.Request,
+        status_code: int,
+        content_type: str,
+        body: bytes,
+    ) -> None:
+        try:
+            model = json.loads(request.content).get("model")
+        except (ValueError, AttributeError):
+            model = None
+        entry: Dict[str, Any] = {
+            "request_hash": key,
+            "method": request.method,
+            "path": request.url.path,
+            "model": model,
+            "recorded_at": time.time(),
+            "status_code": status_code,
+            "content_type": content_type,
+            "body": body.decode("utf-8"),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(entry, handle, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path_for(key))
+        self._logger.debug("Recorded OpenAI response %s", key)
@@ -1,11 +1,20 @@
+import asyncio
 import base64
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
+from openai.types.responses import (
+    EasyInputMessageParam,
+    ResponseInputMessageContentListParam,
+)
 
+from app.clients.openai_cassette import CassetteTransport
 from app.core.config import settings
+from app.core.metrics import OPENAI_TOKENS, time_stage
+from app.core.uploads import SpooledUpload, encode_base64
 
 COMMODITY_GROUPS_PROMPT = [
     "General Services - Accommodation Rentals",
@@ -62,6 +71,11 @@ COMMODITY_GROUPS_PROMPT = [
 ]
 
 OFFER_EXTRACTION_MODEL = "gpt-5.1"
+# Bump whenever the extraction prompt changes so cached results are invalidated.
+OFFER_PROMPT_VERSION = "2"
+
+
+_OPENAI_CLIENT: Optional["OpenAIClient"] = None
 
 
 class OpenAIClient:
@@ -69,18 +83,66 @@ class OpenAIClient:
     Thin wrapper around the OpenAI API for offer extraction.
 
     This client:
-    - Receives the raw PDF bytes of a vendor offer.
-    - Sends the PDF to an LLM with a carefully engineered prompt.
+    - Receives the raw PDF bytes of a vendor offer, or its extracted text layer.
+    - Sends the PDF (or the compact text) to an LLM with a carefully engineered prompt.
     - Expects back a JSON object with the fields required by OfferExtractionResult.
+
+    It is built on AsyncOpenAI with a keep-alive connection pool and is meant to
+    be created once per process (see get_openai_client) and shared. A semaphore
+    bounds the number of extractions in flight at the same time.
     """
 
-    def __init__(self, api_key: str | None = None) -> None:
-        self._client = OpenAI(api_key=api_key or settings.openai_api_key)
+    def __init__(
+        self,
+        api_key: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self._http_client = http_client or self._build_http_client()
+        self._client = AsyncOpenAI(
+            api_key=api_key or settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            http_client=self._http_client,
+        )
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency or settings.openai_max_concurrency
+        )
         self._logger = logging.getLogger("app")
 
-    def extract_offer_from_pdf(self, pdf_bytes: bytes, filename: str = "offer.pdf") -> Dict[str, Any]:
+    @staticmethod
+    def _build_http_client() -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+        )
+        timeout = httpx.Timeout(settings.openai_timeout_seconds, connect=10.0)
+        if settings.openai_cassette_mode == "off":
+            return httpx.AsyncClient(limits=limits, timeout=timeout)
+        # Record through a pooled transport; replay never opens a connection.
+        inner = (
+            httpx.AsyncHTTPTransport(limits=limits)
+            if settings.openai_cassette_mode == "record"
+            else None
+        )
+        transport = CassetteTransport(
+            settings.openai_cassette_dir, settings.openai_cassette_mode, inner=inner
+        )
+        return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.close()
+
+    async def extract_offer_from_pdf(
+        self,
+        pdf: bytes | SpooledUpload,
+        filename: str = "offer.pdf",
+        note: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
-        Parse the given offer PDF bytes into a structured JSON object.
+        Parse the given offer PDF (raw bytes or a spooled upload) into a structured JSON object.
+
+        ``note`` is sent after the prompt, e.g. to say the file is an excerpt.
 
         Returns a dict with at least:
         - requestor_name: str | None
@@ -92,26 +154,71 @@ class OpenAIClient:
         - total_cost: float | None
         - commodity_group_suggestion: str | None
         """
+        with time_stage("base64_encode"):
+            if isinstance(pdf, SpooledUpload):
+                size = pdf.size
+                base64_string = encode_base64(pdf)
+            else:
+                size = len(pdf)
+                base64_string = base64.b64encode(pdf).decode("utf-8")
         self._logger.debug(
             "Calling OpenAI for offer extraction from PDF (bytes=%s, filename=%s)",
-            len(pdf_bytes),
+            size,
             filename,
         )
 
-        base64_string = base64.b64encode(pdf_bytes).decode("utf-8")
-        allowed_groups_str = ", ".join(f'"{g}"' for g in COMMODITY_GROUPS_PROMPT)
+        content: ResponseInputMessageContentListParam = [
+            {
+                "type": "input_file",
+                "filename": filename,
+                "file_data": f"data:application/pdf;base64,{base64_string}",
+            },
+            {
+                "type": "input_text",
+                "text": self._build_user_prompt("as a PDF file"),
+            },
+        ]
+        if note:
+            content.append({"type": "input_text", "text": note})
+        return await self._extract(content)
 
-        instructions = (
-            "You are an expert procurement extraction engine. "
-            "Given a vendor offer (a quote) as a PDF in German or English, "
-            "you extract the commercial information needed to create a procurement request. "
-            "You MUST strictly follow the JSON format requested by the user. "
-            "If you are unsure about a field, use null. "
-            "Never invent values that are not supported by the document."
+    async def extract_offer(
+        self, offer_text: str, filename: str = "offer.pdf"
+    ) -> Dict[str, Any]:
+        """
+        Parse offer text taken from the PDF's text layer into a structured JSON object.
+
+        Returns the same fields as extract_offer_from_pdf, but sends compact
+        text instead of the whole file, which is far cheaper for digital PDFs.
+        """
+        self._logger.debug(
+            "Calling OpenAI for offer extraction from text (chars=%s, filename=%s)",
+            len(offer_text),
+            filename,
+        )
+
+        return await self._extract(
+            [
+                {
+                    "type": "input_text",
+                    "text": self._build_user_prompt(
+                        "as text extracted from a PDF file. Pages are separated by "
+                        "'--- Page N ---' markers and tables are rendered as rows of "
+                        "cells separated by ' | '"
+                    ),
+                },
+                {
+                    "type": "input_text",
+                    "text": f"Offer document ({filename}):\n\n{offer_text}",
+                },
+            ]
         )
 
-        user_prompt = f"""
-            You receive a vendor offer (quote) as a PDF file.
+    def _build_user_prompt(self, source_description: str) -> str:
+        allowed_groups_str = ", ".join(f'"{g}"' for g in COMMODITY_GROUPS_PROMPT)
+
+        return f"""
+            You receive a vendor offer (quote) {source_description}.
 
             Your goal is to extract all commercial information needed for a procurement request.
 
@@ -154,29 +261,32 @@ class OpenAIClient:
             [{allowed_groups_str}]
             """
 
-        response = self._client.responses.create(
-            model=OFFER_EXTRACTION_MODEL,
-            instructions=instructions,
-            input=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "input_file",
-                            "filename": filename,
-                            "file_data": f"data:application/pdf;base64,{base64_string}",
-                        },
-                        {
-                            "type": "input_text",
-                            "text": user_prompt,
-                        },
-                    ],
-                }
-            ],
-            # response_format={"type": "json_object"},
-            temperature=0.2,  # less creative, more consistent
+    async def _extract(self, content: ResponseInputMessageContentListParam) -> Dict[str, Any]:
+        instructions = (
+            "You are an expert procurement extraction engine. "
+            "Given a vendor offer (a quote) as a PDF in German or English, "
+            "you extract the commercial information needed to create a procurement request. "
+            "You MUST strictly follow the JSON format requested by the user. "
+            "If you are unsure about a field, use null. "
+            "Never invent values that are not supported by the document."
         )
 
+        message: EasyInputMessageParam = {"role": "user", "content": content}
+        with time_stage("openai_queue_wait"):
+            await self._semaphore.acquire()
+        try:
+            with time_stage("openai_roundtrip"):
+                response = await self._client.responses.create(
+                    model=OFFER_EXTRACTION_MODEL,
+                    instructions=instructions,
+                    input=[message],
+                    # response_format={"type": "json_object"},
+                    temperature=0.2,  # less creative, more consistent
+                )
+        finally:
+            self._semaphore.release()
+        self._record_usage(response)
+
         # Prefer the SDK helper, but fall back to manual extraction if needed
         raw_text = getattr(response, "output_text", None)
         if raw_text is None:
@@ -195,7 +305,8 @@ class OpenAIClient:
             raise RuntimeError("OpenAI returned empty content for offer extraction.")
 
         try:
-            data = json.loads(raw_text)
+            with time_stage("json_parse"):
+                data = json.loads(raw_text)
         except json.JSONDecodeError as exc:
             snippet = raw_text[:500]
             self._logger.error(
@@ -208,4 +319,31 @@ class OpenAIClient:
                 f"Snippet: {snippet}"
             ) from exc
 
-        return data
\ No newline at end of file
+        return data
+
+    @staticmethod
+    def _record_usage(response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        model = getattr(response, "model", None) or OFFER_EXTRACTION_MODEL
+        for kind in ("input_tokens", "output_tokens"):
+            count = getattr(usage, kind, None)
+            if isinstance(count, int):
+                OPENAI_TOKENS.labels(model, kind.split("_")[0]).inc(count)
+
+
+def get_openai_client() -> OpenAIClient:
+    """Return the process-wide OpenAIClient, creating it on first use."""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        _OPENAI_CLIENT = OpenAIClient()
+    return _OPENAI_CLIENT
+
+
+async def close_openai_client() -> None:
+    """Close and forget the shared OpenAIClient (called on app shutdown)."""
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is not None:
+        await _OPENAI_CLIENT.aclose()
+        _OPENAI_CLIENT = None
@@ -0,0 +1,39 @@
+# app/clients/openai_responses.py
+
+import time
+from typing import Any, Dict
+
+# Model name reported by answers that did not come from a real model.
+FAKE_MODEL = "fake-model"
+
+
+def responses_payload(
+    text: str, input_tokens: int = 0, output_tokens: int = 0, model: str = FAKE_MODEL
+) -> Dict[str, Any]:
+    """A minimal Responses API object carrying ``text`` as its output, for fakes and tests."""
+    return {
+        "id": f"resp_fake_{time.monotonic_ns()}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [
+            {
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
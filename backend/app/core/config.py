@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,6 +15,82 @@ class Settings(BaseSettings):
     ]
     openai_api_key: str
 
+    # Prometheus-style /metrics endpoint and request timing middleware
+    metrics_enabled: bool = True
+
+    # Request storage: "memory" (per process) or "sqlite" (shared file, WAL mode)
+    request_repository_backend: Literal["memory", "sqlite"] = "memory"
+    request_sqlite_path: str = "data/requests.db"
+
+    # Cursor pagination of GET /api/requests
+    requests_page_default_limit: int = 100
+    requests_page_max_limit: int = 500
+    # List responses at least this large are gzipped for clients that accept it (0: never)
+    requests_list_gzip_min_bytes: int = 32 * 1024
+
+    # Bulk NDJSON import of requests
+    requests_import_batch_size: int = 1000
+    requests_import_max_errors: int = 1000
+    requests_import_max_line_bytes: int = 1024 * 1024
+
+    # Streaming export: requests fetched per keyset page
+    requests_export_batch_size: int = 500
+
+    # Local commodity classifier (char n-gram TF-IDF centroids) trained on stored
+    # requests; used before the keyword rules when its cosine score is high enough
+    commodity_model_path: str = "data/commodity_model.npz"
+    commodity_model_min_score: float = 0.25
+    commodity_model_min_examples: int = 20
+    # Re-classification of all stored requests (process pool, resumable)
+    reclassify_chunk_size: int = 500
+    reclassify_workers: Optional[int] = None
+    reclassify_checkpoint_path: str = "data/reclassify_checkpoint.json"
+
+    # Shared AsyncOpenAI client: connection pool and in-flight extraction limit
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_timeout_seconds: float = 120.0
+    openai_max_concurrency: int = 8
+    # Point at a compatible server instead of api.openai.com (e.g. the fake in benchmarks/)
+    openai_base_url: Optional[str] = None
+    # Record OpenAI responses to disk, or replay them without network access
+    openai_cassette_mode: Literal["off", "record", "replay"] = "off"
+    openai_cassette_dir: str = "data/openai_cassettes"
+
+    # Offer uploads: per-file limit, per-request limit and in-memory spool size
+    offer_upload_max_bytes: int = 20 * 1024 * 1024
+    offer_upload_max_request_bytes: int = 100 * 1024 * 1024
+    offer_upload_spool_bytes: int = 1024 * 1024
+
+    # Offer extraction cache (keyed by PDF hash + model/prompt version)
+    offer_cache_enabled: bool = True
+    offer_cache_max_entries: int = 512
+    offer_cache_ttl_seconds: int = 7 * 24 * 3600
+    offer_cache_dir: Optional[str] = None
+
+    # Local text-layer extraction before the LLM call
+    offer_text_layer_enabled: bool = True
+    offer_text_min_chars_per_page: int = 100
+    offer_text_max_chars: int = 60000
+    # Deterministic parser that skips the LLM for self-consistent offers
+    offer_rule_parser_enabled: bool = True
+    # Long offers are split into page groups that are extracted in parallel
+    offer_chunking_enabled: bool = True
+    offer_chunk_min_pages: int = 8
+    offer_chunk_pages: int = 4
+
+    # Batch parsing of several offers in one request
+    offer_batch_max_files: int = 20
+    offer_batch_concurrency: int = 4
+
+    # Background offer extraction jobs
+    offer_job_workers: int = 4
+    offer_job_queue_size: int = 100
+    offer_job_ttl_seconds: int = 3600
+    offer_job_purge_interval_seconds: float = 60
+    # POST /api/offers/parse waits this long for its job before answering 504
+    offer_parse_timeout_seconds: float = 300
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
@@ -0,0 +1,47 @@
+import gzip
+from typing import Mapping, Optional
+
+import anyio
+from fastapi import Request, Response
+
+# Level 5 gets most of level 9's ratio on JSON at a fraction of the CPU time.
+_GZIP_LEVEL = 5
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether the Accept-Encoding header allows gzip (not excluded with q=0)."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+async def json_bytes_response(
+    body: bytes,
+    request: Request,
+    gzip_min_bytes: int = 0,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """
+    Send already serialized JSON, gzip-compressed when it is large enough.
+
+    Returning a Response skips FastAPI's response_model validation and
+    re-serialization; the caller is responsible for the body matching it.
+    Compression (zlib releases the GIL) runs in a worker thread.
+    """
+    response_headers = dict(headers or {})
+    if gzip_min_bytes > 0 and len(body) >= gzip_min_bytes:
+        response_headers["Vary"] = "Accept-Encoding"
+        if accepts_gzip(request):
+            body = await anyio.to_thread.run_sync(gzip.compress, body, _GZIP_LEVEL)
+            response_headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=response_headers)
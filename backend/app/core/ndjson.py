@@ -0,0 +1,33 @@
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
+
+
+async def aiter_ndjson_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int = 1024 * 1024
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a streamed body into (1-based line number, line) pairs.
+
+    Blank lines are skipped but still counted. A line longer than
+    ``max_line_bytes`` is discarded as it streams in, instead of buffering
+    without bound, and yielded as (number, None) once it ends.
+    """
+    buffer = b""
+    number = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            number += 1
+            if oversized or len(line) > max_line_bytes:
+                oversized = False
+                yield number, None
+            elif line.strip():
+                yield number, line
+        if len(buffer) > max_line_bytes:
+            oversized = True
+            buffer = b""
+    if oversized:
+        yield number + 1, None
+    elif buffer.strip():
+        yield number + 1, buffer
@@ -0,0 +1,213 @@
+import base64
+import hashlib
+import io
+import json
+import mmap
+import tempfile
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Iterator, Mapping, Optional
+
+import anyio
+from fastapi import HTTPException, UploadFile
+
+from app.core.metrics import time_stage
+
+_CHUNK_SIZE = 64 * 1024
+
+# Room for the multipart boundaries and part headers around a single file.
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        super().__init__(f"Upload exceeds the maximum size of {max_bytes} bytes.")
+        self.max_bytes = max_bytes
+
+
+class SpooledUpload:
+    """
+    An uploaded file copied out of the request, with its SHA-256 computed on the way.
+
+    Small uploads stay in memory; once ``spool_threshold`` bytes are written the
+    content moves to an anonymous temporary file, so memory per upload stays
+    bounded. Readers get independent views (a read-only mmap for spooled files)
+    instead of a full ``bytes`` copy.
+    """
+
+    def __init__(self, filename: str, spool_threshold: int = 1024 * 1024) -> None:
+        self.filename = filename
+        self.size = 0
+        self._threshold = spool_threshold
+        self._hasher = hashlib.sha256()
+        self._buffer: BinaryIO = io.BytesIO()
+        self._on_disk = False
+
+    @classmethod
+    def from_bytes(cls, data: bytes, filename: str) -> "SpooledUpload":
+        upload = cls(filename, spool_threshold=max(len(data), 1))
+        upload.write(data)
+        return upload
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
+
+    def write(self, chunk: bytes) -> None:
+        if not self._on_disk and self.size + len(chunk) > self._threshold:
+            assert isinstance(self._buffer, io.BytesIO)
+            spooled = tempfile.TemporaryFile()
+            spooled.write(self._buffer.getbuffer())
+            self._buffer = spooled  # type: ignore[assignment]
+            self._on_disk = True
+        self._buffer.write(chunk)
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+
+    @contextmanager
+    def open_view(self) -> Iterator[BinaryIO]:
+        """Yield an independent, seekable read-only view of the content."""
+        if not self._on_disk or self.size == 0:
+            assert isinstance(self._buffer, io.BytesIO)
+            yield io.BytesIO(self._buffer.getvalue())
+            return
+        self._buffer.flush()
+        view = mmap.mmap(self._buffer.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield view  # type: ignore[misc]
+        finally:
+            view.close()
+
+    def read_bytes(self) -> bytes:
+        """Return the whole content; prefer open_view() for large uploads."""
+        with self.open_view() as view:
+            return view.read()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int,
+    spool_threshold: int = 1024 * 1024,
+) -> SpooledUpload:
+    """
+    Copy an UploadFile chunk by chunk into a SpooledUpload.
+
+    Raises UploadTooLargeError as soon as more than ``max_bytes`` have been
+    read, without reading the rest of the file. By then Starlette has already
+    received the whole request; UploadSizeLimitMiddleware is what stops
+    oversized bodies while they stream in.
+    """
+    upload = SpooledUpload(file.filename or "offer.pdf", spool_threshold=spool_threshold)
+
+    def copy() -> None:
+        file.file.seek(0)
+        while True:
+            chunk = file.file.read(_CHUNK_SIZE)
+            if not chunk:
+                return
+            if upload.size + len(chunk) > max_bytes:
+                raise UploadTooLargeError(max_bytes)
+            upload.write(chunk)
+
+    try:
+        # Disk writes for large uploads are blocking; do the whole copy in a thread.
+        with time_stage("upload_read"):
+            await anyio.to_thread.run_sync(copy)
+    except BaseException:
+        upload.close()
+        raise
+    return upload
+
+
+def encode_base64(upload: SpooledUpload) -> str:
+    """Base64-encode an upload straight from its (memory-mapped) view."""
+    with upload.open_view() as view:
+        if isinstance(view, io.BytesIO):
+            return base64.b64encode(view.getbuffer()).decode("ascii")
+        return base64.b64encode(memoryview(view)).decode("ascii")  # type: ignore[arg-type]
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized request bodies on upload routes with 413.
+
+    Requests announcing a too-large Content-Length are refused before any of
+    the body is read; chunked or lying clients are cut off once the limit is
+    crossed while streaming. ``path_limits`` gives individual paths a lower
+    limit than ``max_body_bytes``, e.g. single-file routes the per-file limit.
+    Add it before CORSMiddleware so the 413 responses carry CORS headers.
+    """
+
+    def __init__(
+        self,
+        app: Callable[..., Any],
+        max_body_bytes: int,
+        path_prefix: str,
+        path_limits: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_prefix = path_prefix
+        self.path_limits = dict(path_limits or {})
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if (
+            scope["type"] != "http"
+            or scope.get("method") != "POST"
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        max_body_bytes = self.path_limits.get(scope["path"], self.max_body_bytes)
+        content_length = self._content_length(scope)
+        if content_length is not None and content_length > max_body_bytes:
+            await self._reject(send, max_body_bytes)
+            return
+
+        received = 0
+
+        async def limited_receive() -> dict:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_bytes:
+                    # FastAPI re-raises HTTPExceptions from body parsing as-is.
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Request body exceeds {max_body_bytes} bytes.",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _content_length(scope: dict) -> Optional[int]:
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    async def _reject(self, send: Callable, max_body_bytes: int) -> None:
+        body = json.dumps({"detail": f"Request body exceeds {max_body_bytes} bytes."}).encode(
+            "utf-8"
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,13 +1,36 @@
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.routes.admin import router as admin_router
+from app.api.routes.commodity import router as commodity_router
 from app.api.routes.health import router as health_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.offers import router as offers_router
 from app.api.routes.requests import router as requests_router
+from app.clients.openai_client import close_openai_client, get_openai_client
 from app.core.config import settings
 from app.core.logging_config import setup_logging
+from app.core.metrics import MetricsMiddleware
+from app.core.uploads import MULTIPART_OVERHEAD_BYTES, UploadSizeLimitMiddleware
+from app.services.offer_job_service import get_offer_job_manager
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create shared clients on startup and release them on shutdown."""
+    # One pooled OpenAI client per process, reused by every request.
+    get_openai_client()
+    job_manager = get_offer_job_manager()
+    await job_manager.start()
+    try:
+        yield
+    finally:
+        await job_manager.stop()
+        await close_openai_client()
 
 
 def create_app() -> FastAPI:
@@ -19,19 +42,40 @@ def create_app() -> FastAPI:
         title=settings.app_name,
         version="0.1.0",
         description="Backend for the askLio procurement case study (FastAPI).",
+        lifespan=lifespan,
     )
 
+    # Single-file upload routes are capped at the per-file limit while the body
+    # streams in; the batch route only at the per-request limit.
+    single_file_limit = settings.offer_upload_max_bytes + MULTIPART_OVERHEAD_BYTES
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        max_body_bytes=settings.offer_upload_max_request_bytes,
+        path_prefix="/api/offers",
+        path_limits={
+            "/api/offers/parse": single_file_limit,
+            "/api/offers/jobs": single_file_limit,
+        },
+    )
+    # Added after the size limit so it wraps it and its 413s get CORS headers.
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_allow_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
+    if settings.metrics_enabled:
+        # Outermost, so rejected uploads and CORS preflights are counted too.
+        app.add_middleware(MetricsMiddleware, routes=app.router.routes)
+        app.include_router(metrics_router)
 
     app.include_router(health_router, prefix="/api")
     app.include_router(requests_router, prefix="/api")
     app.include_router(offers_router, prefix="/api")
+    app.include_router(commodity_router, prefix="/api")
+    app.include_router(admin_router, prefix="/api")
 
     logger.info("FastAPI application initialised.")
     return app
@@ -0,0 +1,22 @@
+# app/models/aggregates.py
+
+from decimal import Decimal
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class SpendBucket(BaseModel):
+    key: Optional[str] = None
+    request_count: int
+    total_spend: Decimal
+
+
+class SpendAggregates(BaseModel):
+    """Request counts and total spend, overall and per dimension."""
+    request_count: int = 0
+    total_spend: Decimal = Decimal("0")
+    by_commodity_group: List[SpendBucket] = []
+    by_department: List[SpendBucket] = []
+    by_vendor: List[SpendBucket] = []
+    by_status: List[SpendBucket] = []
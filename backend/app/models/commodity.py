@@ -0,0 +1,31 @@
+# app/models/commodity.py
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class CommodityModelInfo(BaseModel):
+    """Summary of the local commodity classifier currently in use."""
+    trained_at: datetime
+    examples: int
+    groups: List[str]
+    size_bytes: int
+
+
+class GroupTransition(BaseModel):
+    """How many requests moved from one commodity group to another."""
+    old: Optional[str] = None
+    new: str
+    count: int
+
+
+class ReclassificationProgress(BaseModel):
+    """Progress of a re-classification run; the last event has ``done`` set."""
+    scanned: int = 0
+    changed: int = 0
+    total: int = 0
+    resumed: bool = False
+    done: bool = False
+    transitions: List[GroupTransition] = []
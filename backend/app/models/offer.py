@@ -1,6 +1,7 @@
 # app/models/offer.py
 
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 
 from pydantic import BaseModel, Field, condecimal
@@ -26,3 +27,26 @@ class OfferExtractionResult(BaseModel):
     order_lines: List[OrderLine] = []
     total_cost: Optional[condecimal(max_digits=14, decimal_places=2)] = None
     commodity_group_suggestion: Optional[str] = None
+
+
+class OfferJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class OfferExtractionJob(BaseModel):
+    """Background offer extraction job as exposed by the jobs API."""
+    id: str
+    filename: str
+    status: OfferJobStatus = OfferJobStatus.QUEUED
+    result: Optional[OfferExtractionResult] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (OfferJobStatus.SUCCEEDED, OfferJobStatus.FAILED)
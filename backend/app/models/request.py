@@ -32,3 +32,17 @@ class ProcurementRequest(ProcurementRequestBase):
     status: RequestStatus = RequestStatus.OPEN
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class RequestImportError(BaseModel):
+    """A rejected line of a bulk import (1-based line number)."""
+    line: int
+    error: str
+
+
+class RequestImportResult(BaseModel):
+    """Summary of a bulk NDJSON import."""
+    imported: int = 0
+    failed: int = 0
+    errors: List[RequestImportError] = []
+    errors_truncated: bool = False
@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Iterator, List, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
 
+from app.models.aggregates import SpendAggregates
 from app.models.request import ProcurementRequest, ProcurementRequestCreate
 from app.models.status import RequestStatus
+from app.repositories.pagination import RequestSortField, paginate_sorted
+from app.repositories.rollups import SpendRollup, contribution
+
+
+class StaleRequestError(RuntimeError):
+    """Raised by update() when the stored request changed after the caller read it."""
 
 
 class RequestRepository(ABC):
@@ -19,6 +26,68 @@ class RequestRepository(ABC):
         """Return all requests matching the provided optional filters."""
         raise NotImplementedError
 
+    def list_page(
+        self,
+        sort: RequestSortField,
+        descending: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[ProcurementRequest], Optional[str]]:
+        """
+        Return one page of matching requests and the cursor of the next page.
+
+        Raises InvalidCursorError for cursors issued for another sort order.
+        This default sorts the full filtered list; repositories with ordered
+        storage should override it. RELEVANCE falls back to creation order.
+        """
+        if sort is RequestSortField.RELEVANCE:
+            sort = RequestSortField.CREATED_AT
+        items = self.list(
+            status_filter=status_filter, department=department, search=search
+        )
+        return paginate_sorted(items, sort, descending, limit, cursor)
+
+    def iter_pages(self, page_size: int = 500) -> Iterator[List[ProcurementRequest]]:
+        """Yield every stored request in creation order, one keyset page at a time."""
+        cursor: Optional[str] = None
+        while True:
+            page, cursor = self.list_page(
+                RequestSortField.CREATED_AT, limit=page_size, cursor=cursor
+            )
+            if page:
+                yield page
+            if cursor is None:
+                return
+
+    def aggregates(self) -> SpendAggregates:
+        """
+        Return request counts and spend per commodity group, department, vendor
+        and status. This default scans every request; stores should keep rollups.
+        """
+        rollup = SpendRollup()
+        for request in self.list():
+            rollup.add(contribution(request))
+        return rollup.snapshot()
+
+    def update_commodity_groups(self, groups: Mapping[UUID, str]) -> int:
+        """
+        Set the commodity group of several requests, leaving other fields as
+        they are. Returns how many of the requests exist. This default updates
+        them one at a time; stores should apply the batch in one step.
+        """
+        updated = 0
+        for request_id, group in groups.items():
+            request = self.get(request_id)
+            if request is None:
+                continue
+            request.commodity_group = group
+            self.update(request)
+            updated += 1
+        return updated
+
     @abstractmethod
     def get(self, request_id: UUID) -> Optional[ProcurementRequest]:
         """Return a single request by id or None if not found."""
@@ -29,7 +98,75 @@ class RequestRepository(ABC):
         """Persist a newly created procurement request."""
         raise NotImplementedError
 
+    def create_many(
+        self, payloads: Sequence[ProcurementRequestCreate]
+    ) -> List[ProcurementRequest]:
+        """Persist several new requests; stores should override this to batch."""
+        return [self.create(payload) for payload in payloads]
+
     @abstractmethod
     def update(self, request: ProcurementRequest) -> ProcurementRequest:
-        """Persist updates to an existing procurement request."""
+        """
+        Persist updates to an existing procurement request.
+
+        ``request`` replaces the stored version only if that is still the one
+        it was read from (same ``updated_at``); otherwise nothing is written
+        and StaleRequestError is raised, so a stale copy never reverts another
+        write. Raises KeyError for unknown ids.
+        """
+        raise NotImplementedError
+
+
+class AsyncRequestRepository(ABC):
+    """Async counterpart of RequestRepository for use on the event loop."""
+
+    @abstractmethod
+    async def list(
+        self,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[ProcurementRequest]:
+        """Return all requests matching the provided optional filters."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list_page(
+        self,
+        sort: RequestSortField,
+        descending: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[ProcurementRequest], Optional[str]]:
+        """Return one page of matching requests and the cursor of the next page."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def aggregates(self) -> SpendAggregates:
+        """Return request counts and spend per dimension."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, request_id: UUID) -> Optional[ProcurementRequest]:
+        """Return a single request by id or None if not found."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(self, payload: ProcurementRequestCreate) -> ProcurementRequest:
+        """Persist a newly created procurement request."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_many(
+        self, payloads: Sequence[ProcurementRequestCreate]
+    ) -> List[ProcurementRequest]:
+        """Persist several new requests in one batch."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update(self, request: ProcurementRequest) -> ProcurementRequest:
+        """Persist updates to an existing procurement request (see RequestRepository)."""
         raise NotImplementedError
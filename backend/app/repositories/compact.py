@@ -0,0 +1,183 @@
+# app/repositories/compact.py
+
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Optional, Tuple, Union
+from uuid import UUID
+
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequest
+from app.models.status import RequestStatus
+from app.repositories.rollups import Contribution, department_key
+from app.repositories.search_index import IndexedFields, indexed_fields
+
+# A packed amount: (coefficient << 2) | decimal places, for up to three places.
+# Anything else (more places, exponents like 1E+3) stays a Decimal.
+Fixed = Union[int, Decimal]
+
+_MAX_PLACES = 3
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# (id, position_description, unit_price, amount, unit, total_price)
+LineRecord = Tuple[Optional[int], str, Fixed, Fixed, str, Fixed]
+
+
+def pack_decimal(value: Any) -> Fixed:
+    """Pack a decimal into a small int that keeps its value and its scale."""
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    exponent = value.as_tuple().exponent
+    if not isinstance(exponent, int) or not -_MAX_PLACES <= exponent <= 0:
+        return value
+    places = -exponent
+    return (int(value.scaleb(places)) << 2) | places
+
+
+def unpack_decimal(packed: Fixed) -> Decimal:
+    if isinstance(packed, Decimal):
+        return packed
+    return Decimal(packed >> 2).scaleb(-(packed & 3))
+
+
+def to_cents(packed: Fixed) -> int:
+    return int((unpack_decimal(packed) * 100).to_integral_value())
+
+
+def to_micros(value: datetime) -> int:
+    """Microseconds since the epoch; aware datetimes are converted to naive UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class RequestRecord:
+    """
+    The stored form of a ProcurementRequest, a fraction of the model's size.
+
+    Plain slots instead of a pydantic model, order lines as tuples, vendor,
+    department, commodity group, unit and description strings interned (they
+    repeat across requests), amounts as packed fixed-point ints and
+    timestamps as epoch microseconds. ``to_model`` rebuilds an equal model
+    without validation; records are replaced, never handed out.
+    """
+
+    __slots__ = (
+        "id",
+        "requestor_name",
+        "title",
+        "vendor_name",
+        "vendor_vat_id",
+        "department",
+        "department_key",
+        "commodity_group",
+        "order_lines",
+        "total_cost",
+        "status",
+        "created_at",
+        "updated_at",
+    )
+
+    id: UUID
+    requestor_name: str
+    title: str
+    vendor_name: str
+    vendor_vat_id: str
+    department: str
+    department_key: str
+    commodity_group: Optional[str]
+    order_lines: Tuple[LineRecord, ...]
+    total_cost: Fixed
+    status: RequestStatus
+    created_at: int
+    updated_at: int
+
+    @classmethod
+    def from_model(cls, request: ProcurementRequest) -> "RequestRecord":
+        record = cls()
+        record.id = request.id
+        record.requestor_name = sys.intern(request.requestor_name)
+        record.title = request.title
+        record.vendor_name = sys.intern(request.vendor_name)
+        record.vendor_vat_id = sys.intern(request.vendor_vat_id)
+        record.department = sys.intern(request.department)
+        record.department_key = sys.intern(department_key(request.department))
+        record.commodity_group = _intern(request.commodity_group)
+        record.order_lines = tuple(
+            (
+                line.id,
+                sys.intern(line.position_description),
+                pack_decimal(line.unit_price),
+                pack_decimal(line.amount),
+                sys.intern(line.unit),
+                pack_decimal(line.total_price),
+            )
+            for line in request.order_lines
+        )
+        record.total_cost = pack_decimal(request.total_cost)
+        record.status = RequestStatus(request.status)
+        record.created_at = to_micros(request.created_at)
+        record.updated_at = to_micros(request.updated_at)
+        return record
+
+    def copy(self, **changes: Any) -> "RequestRecord":
+        record = RequestRecord()
+        for name in self.__slots__:
+            setattr(record, name, changes.get(name, getattr(self, name)))
+        return record
+
+    def to_model(self) -> ProcurementRequest:
+        return ProcurementRequest.model_construct(
+            id=self.id,
+            requestor_name=self.requestor_name,
+            title=self.title,
+            vendor_name=self.vendor_name,
+            vendor_vat_id=self.vendor_vat_id,
+            department=self.department,
+            commodity_group=self.commodity_group,
+            order_lines=[
+                OrderLine.model_construct(
+                    id=line_id,
+                    position_description=description,
+                    unit_price=unpack_decimal(unit_price),
+                    amount=unpack_decimal(amount),
+                    unit=unit,
+                    total_price=unpack_decimal(total_price),
+                )
+                for line_id, description, unit_price, amount, unit, total_price in (
+                    self.order_lines
+                )
+            ],
+            total_cost=unpack_decimal(self.total_cost),
+            status=self.status,
+            created_at=from_micros(self.created_at),
+            updated_at=from_micros(self.updated_at),
+        )
+
+    def contribution(self) -> Contribution:
+        """What this request adds to the spend rollups (see rollups.contribution)."""
+        keys = (
+            self.commodity_group or None,
+            self.department_key,
+            self.vendor_name,
+            self.status.value,
+        )
+        return keys, unpack_decimal(self.total_cost)
+
+    def search_fields(self) -> IndexedFields:
+        return indexed_fields(
+            self.title,
+            self.vendor_name,
+            self.vendor_vat_id,
+            self.commodity_group,
+            (line[1] for line in self.order_lines),
+        )
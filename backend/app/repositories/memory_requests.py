@@ -1,60 +1,557 @@
+import functools
+import inspect
 import logging
+import sys
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
-from uuid import UUID
+from decimal import Decimal
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from uuid import UUID, uuid4
 
+from app.core.metrics import REPOSITORY_LIST_SECONDS, filters_label
+from app.models.aggregates import SpendAggregates
 from app.models.request import ProcurementRequest, ProcurementRequestCreate
 from app.models.status import RequestStatus
-from app.repositories.base import RequestRepository
+from app.repositories.base import RequestRepository, StaleRequestError
+from app.repositories.compact import (
+    RequestRecord,
+    from_micros,
+    to_cents,
+    to_micros,
+)
+from app.repositories.pagination import (
+    RequestSortField,
+    decode_cursor,
+    encode_cursor,
+)
+from app.repositories.rollups import SpendRollup, department_key
+from app.repositories.search_index import TrigramSearchIndex
+
+
+class _IdSet:
+    """
+    Ids in one index bucket, iterated in creation order.
+
+    Backed by a dict for O(1) add/remove. Re-inserting an older request (e.g.
+    after a status change) marks the bucket unsorted; it is re-sorted once on
+    the next read instead of on every list call.
+    """
+
+    __slots__ = ("_ids", "_seq", "_last", "_sorted")
+
+    def __init__(self, seq: Dict[UUID, int]) -> None:
+        self._ids: Dict[UUID, None] = {}
+        self._seq = seq
+        self._last = -1
+        self._sorted = True
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, request_id: object) -> bool:
+        return request_id in self._ids
+
+    def add(self, request_id: UUID) -> None:
+        position = self._seq[request_id]
+        if position < self._last:
+            self._sorted = False
+        self._last = max(self._last, position)
+        self._ids[request_id] = None
+
+    def discard(self, request_id: UUID) -> None:
+        self._ids.pop(request_id, None)
+
+    def ordered(self) -> Collection[UUID]:
+        if not self._sorted:
+            self._ids = dict.fromkeys(sorted(self._ids, key=self._seq.__getitem__))
+            self._sorted = True
+        return self._ids
+
+
+class _DerivedCache:
+    """
+    A small LRU of values computed from the store (search results, ordered
+    match keys). The repository clears it on every write, so an entry is
+    always current and pages of one query reuse the work of the first page.
+    """
+
+    __slots__ = ("_entries", "_size")
+
+    def __init__(self, size: int) -> None:
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._size = size
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        value = self._entries[key] = build()
+        if len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _synchronized(method: _F) -> _F:
+    """Run a repository method under the instance lock."""
+
+    @functools.wraps(method)
+    def wrapper(self: "InMemoryRequestRepository", *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _timed(operation: str) -> Callable[[_F], _F]:
+    """Record a list method's duration, labelled by the filters it was called with."""
+
+    def decorate(method: _F) -> _F:
+        names = list(inspect.signature(method).parameters)[1:]
+        positions = [names.index(n) for n in ("status_filter", "department", "search")]
+
+        @functools.wraps(method)
+        def wrapper(self: "InMemoryRequestRepository", *args: Any, **kwargs: Any) -> Any:
+            status, department, search = (
+                args[i] if i < len(args) else kwargs.get(names[i]) for i in positions
+            )
+            label = filters_label(status, department, search)
+            with REPOSITORY_LIST_SECONDS.labels(operation, label).time():
+                return method(self, *args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+# (sort value, creation sequence, id); the sequence makes every key unique.
+_SortKey = Tuple[Any, int, UUID]
+# Queries whose results are kept between pages (cleared on every write).
+_DERIVED_CACHE_SIZE = 8
+# Matches at most 1/8 of the store are ordered once and cached; broader ones
+# are found by walking the sort index, where a page needs ~8x its size in keys.
+_SELECTIVE_FRACTION = 8
+_STORED_SORTS = [field for field in RequestSortField if field is not RequestSortField.RELEVANCE]
+_STATUS_RANK = {status: rank for rank, status in enumerate(RequestStatus)}
+
+
+def _sort_value(field: RequestSortField, record: RequestRecord) -> int:
+    """The int a record is ordered by: epoch microseconds, cents or status rank."""
+    if field is RequestSortField.CREATED_AT:
+        return record.created_at
+    if field is RequestSortField.UPDATED_AT:
+        return record.updated_at
+    if field is RequestSortField.TOTAL_COST:
+        return to_cents(record.total_cost)
+    return _STATUS_RANK[record.status]
+
+
+def _cursor_value(field: RequestSortField, value: Any) -> Any:
+    """Stored sort value -> the public value cursors carry (and back, below)."""
+    if field in (RequestSortField.CREATED_AT, RequestSortField.UPDATED_AT):
+        return from_micros(value)
+    if field is RequestSortField.TOTAL_COST:
+        return Decimal(value).scaleb(-2)
+    return value
+
+
+def _stored_value(field: RequestSortField, value: Any) -> Any:
+    if isinstance(value, datetime):
+        return to_micros(value)
+    if field is RequestSortField.TOTAL_COST:
+        return to_cents(Decimal(value))
+    return value
+
+
+def _walk(
+    keys: List[_SortKey], after: Optional[Tuple[Any, int]], descending: bool
+) -> Iterator[_SortKey]:
+    """Iterate sorted keys strictly after (or before, descending) a cursor position."""
+    if descending:
+        start = len(keys) if after is None else bisect_left(keys, after)
+        for index in range(start - 1, -1, -1):
+            yield keys[index]
+        return
+    start = 0
+    if after is not None:
+        start = bisect_left(keys, after)
+        if start < len(keys) and keys[start][:2] == tuple(after):
+            start += 1
+    for index in range(start, len(keys)):
+        yield keys[index]
+
+
+class _SortedKeys:
+    """Keys of every request for one sort field, kept in order with bisect."""
+
+    __slots__ = ("keys", "_by_id")
+
+    def __init__(self) -> None:
+        self.keys: List[_SortKey] = []
+        self._by_id: Dict[UUID, _SortKey] = {}
+
+    def key_of(self, request_id: UUID) -> _SortKey:
+        return self._by_id[request_id]
+
+    def upsert(self, key: _SortKey) -> None:
+        request_id = key[2]
+        old = self._by_id.get(request_id)
+        if old == key:
+            return
+        if old is not None:
+            del self.keys[bisect_left(self.keys, old)]
+        insort(self.keys, key)
+        self._by_id[request_id] = key
+
+    def add_many(self, keys: List[_SortKey]) -> None:
+        """Add keys of new requests; one sort instead of an insort per key."""
+        keys.sort()
+        if self.keys and keys and keys[0] < self.keys[-1]:
+            # Timsort merges the two sorted runs in linear time.
+            self.keys.extend(keys)
+            self.keys.sort()
+        else:
+            self.keys.extend(keys)
+        self._by_id.update((key[2], key) for key in keys)
 
 
 class InMemoryRequestRepository(RequestRepository):
-    """Naive in-memory repository for MVP (no persistence across restarts)."""
+    """
+    In-memory repository for MVP (no persistence across restarts).
+
+    Requests are kept as compact RequestRecords (see app.repositories.compact)
+    and turned into ProcurementRequest models only when returned, so callers
+    always get their own copy; changes take effect through ``update``, which
+    finds the stale index entries from the record it replaces.
+
+    Requests are indexed by status and by normalized department so filtered
+    lists only touch matching requests. Searches go through a trigram index
+    and are returned best match first. Paginated lists walk per-field sorted
+    keys (plain ints) from the cursor position, skipping non-matches; the
+    matches of a selective filter or search, and relevance rankings, are
+    ordered once and cached until the next write, so every later page is a
+    bisect and a slice.
+
+    Spend aggregates are kept as running rollups updated on every write.
+
+    All public methods hold a re-entrant lock, so the store and its indexes
+    stay consistent when calls are offloaded to worker threads.
+    """
 
     def __init__(self) -> None:
-        self._store: Dict[UUID, ProcurementRequest] = {}
+        self._store: Dict[UUID, RequestRecord] = {}
+        # Creation sequence per id and back; the search index works on sequences.
+        self._seq: Dict[UUID, int] = {}
+        self._ids: List[UUID] = []
+        self._by_status: Dict[RequestStatus, _IdSet] = {}
+        self._by_department: Dict[str, _IdSet] = {}
+        self._search: TrigramSearchIndex[int] = TrigramSearchIndex()
+        self._rollup = SpendRollup()
+        self._sorted: Dict[RequestSortField, _SortedKeys] = {
+            field: _SortedKeys() for field in _STORED_SORTS
+        }
+        self._derived = _DerivedCache(_DERIVED_CACHE_SIZE)
+        self._lock = threading.RLock()
         self._logger = logging.getLogger("app")
 
+    @_timed("list")
+    @_synchronized
     def list(
         self,
         status_filter: Optional[RequestStatus] = None,
         department: Optional[str] = None,
         search: Optional[str] = None,
     ) -> List[ProcurementRequest]:
-        """Return all requests that match optional filters."""
-        items = list(self._store.values())
-
-        if status_filter is not None:
-            items = [r for r in items if r.status == status_filter]
-
-        if department:
-            items = [r for r in items if r.department.lower() == department.lower()]
+        """
+        Return all requests that match optional filters.
 
+        Results are in creation order, or ranked by relevance when searching.
+        """
         if search:
-            s = search.lower()
+            ranked = self._search.search(search, tiebreak=int)
+            accept = self._filter_predicate(status_filter, department)
+            matched = (self._ids[seq] for seq, _ in ranked)
             items = [
-                r
-                for r in items
-                if s in r.title.lower() or s in r.vendor_name.lower()
+                self._store[request_id].to_model()
+                for request_id in matched
+                if accept is None or accept(request_id)
             ]
+        else:
+            candidates = self._candidate_ids(status_filter, department)
+            if candidates is None:
+                items = [record.to_model() for record in self._store.values()]
+            else:
+                items = [self._store[request_id].to_model() for request_id in candidates]
 
         self._logger.debug("Repository list returning %s items", len(items))
         return items
 
+    @_timed("list_page")
+    @_synchronized
+    def list_page(
+        self,
+        sort: RequestSortField,
+        descending: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[ProcurementRequest], Optional[str]]:
+        """Return one page of matching requests in keyset order and the next cursor."""
+        if sort is RequestSortField.RELEVANCE and not search:
+            sort = RequestSortField.CREATED_AT
+        after = decode_cursor(cursor, sort, descending) if cursor is not None else None
+        if after is not None and sort is not RequestSortField.RELEVANCE:
+            after = (_stored_value(sort, after[0]), after[1])
+
+        accept = self._filter_predicate(status_filter, department)
+        matched: Optional[Sequence[Tuple[int, float]]] = None
+        if search:
+            matched = self._search_matches(search)
+            count = len(matched)
+        else:
+            candidates = self._candidate_ids(status_filter, department)
+            count = len(self._store) if candidates is None else len(candidates)
+        if sort is RequestSortField.RELEVANCE or count * _SELECTIVE_FRACTION < len(self._store):
+            keys = self._match_keys(sort, search, status_filter, department)
+            source = _walk(keys, after, descending)
+            accept = None
+        else:
+            source = _walk(self._sorted[sort].keys, after, descending)
+            if matched is not None:
+                seqs = self._derived.get(("seqs", search), lambda: {seq for seq, _ in matched})
+                source = (key for key in source if key[1] in seqs)
+
+        matching = (key for key in source if accept is None or accept(key[2]))
+        window = list(islice(matching, limit + 1))
+        page = [self._store[key[2]].to_model() for key in window[:limit]]
+        next_cursor = None
+        if len(window) > limit:
+            value, seq, _ = window[limit - 1]
+            if sort is not RequestSortField.RELEVANCE:
+                value = _cursor_value(sort, value)
+            next_cursor = encode_cursor(sort, descending, value, seq)
+        self._logger.debug("Repository page returning %s items", len(page))
+        return page, next_cursor
+
+    def _search_matches(self, search: str) -> List[Tuple[int, float]]:
+        """(sequence, score) of every request matching ``search``, best first."""
+        return self._derived.get(("search", search), lambda: self._search.search(search))
+
+    def _match_keys(
+        self,
+        sort: RequestSortField,
+        search: Optional[str],
+        status_filter: Optional[RequestStatus],
+        department: Optional[str],
+    ) -> List[_SortKey]:
+        """Sorted keys of every matching request, built once per query and write."""
+
+        def build() -> List[_SortKey]:
+            if search:
+                accept = self._filter_predicate(status_filter, department)
+                matches = [
+                    (seq, score)
+                    for seq, score in self._search_matches(search)
+                    if accept is None or accept(self._ids[seq])
+                ]
+                if sort is RequestSortField.RELEVANCE:
+                    keys = [(-score, seq, self._ids[seq]) for seq, score in matches]
+                else:
+                    index = self._sorted[sort]
+                    keys = [index.key_of(self._ids[seq]) for seq, _ in matches]
+            else:
+                index = self._sorted[sort]
+                candidates = self._candidate_ids(status_filter, department)
+                keys = [index.key_of(i) for i in candidates or ()]
+            keys.sort()
+            return keys
+
+        wanted = department_key(department) if department else None
+        return self._derived.get(("keys", sort, search, status_filter, wanted), build)
+
+    @_synchronized
+    def aggregates(self) -> SpendAggregates:
+        """Return the running spend rollups (O(number of groups))."""
+        return self._rollup.snapshot()
+
+    @_synchronized
     def get(self, request_id: UUID) -> Optional[ProcurementRequest]:
         """Return a request by id if present."""
-        return self._store.get(request_id)
+        record = self._store.get(request_id)
+        return record.to_model() if record is not None else None
 
+    @_synchronized
     def create(self, payload: ProcurementRequestCreate) -> ProcurementRequest:
         """Store a new procurement request."""
         req = ProcurementRequest(**payload.model_dump())
-        self._store[req.id] = req
+        record = RequestRecord.from_model(req)
+        self._register(req.id)
+        self._index(record, None)
+        self._store[req.id] = record
         self._logger.debug("Stored new request %s", req.id)
         return req
 
+    @_synchronized
+    def create_many(
+        self, payloads: Sequence[ProcurementRequestCreate]
+    ) -> List[ProcurementRequest]:
+        """Store several new requests under a single lock acquisition."""
+        # Payloads are already validated; construct without a second validation
+        # pass, passing the defaulted fields explicitly as well.
+        now = datetime.utcnow()
+        created = [
+            ProcurementRequest.model_construct(
+                **dict(payload),
+                id=uuid4(),
+                status=RequestStatus.OPEN,
+                created_at=now,
+                updated_at=now,
+            )
+            for payload in payloads
+        ]
+        records = [RequestRecord.from_model(req) for req in created]
+        for record in records:
+            self._register(record.id)
+            self._index_filters(record, None)
+            self._rollup.add(record.contribution())
+            self._search.add(self._seq[record.id], record.search_fields())
+            self._store[record.id] = record
+        self._derived.clear()
+        for field, keys in self._sorted.items():
+            keys.add_many(
+                [(_sort_value(field, r), self._seq[r.id], r.id) for r in records]
+            )
+        self._logger.debug("Stored %s new requests", len(created))
+        return created
+
+    @_synchronized
     def update(self, request: ProcurementRequest) -> ProcurementRequest:
-        """Persist updates to an existing request."""
+        """Persist updates to an existing request (compare-and-set on updated_at)."""
+        previous = self._store.get(request.id)
+        if previous is None:
+            raise KeyError(f"Request {request.id} does not exist")
+        if previous.updated_at != to_micros(request.updated_at):
+            raise StaleRequestError(f"Request {request.id} changed since it was read")
         request.updated_at = datetime.utcnow()
-        self._store[request.id] = request
+        record = RequestRecord.from_model(request)
+        self._index(record, previous)
+        self._store[request.id] = record
         self._logger.debug("Updated request %s", request.id)
         return request
+
+    @_synchronized
+    def update_commodity_groups(self, groups: Mapping[UUID, str]) -> int:
+        """Set the commodity group of several requests under one lock acquisition."""
+        now = to_micros(datetime.utcnow())
+        updated = 0
+        for request_id, group in groups.items():
+            previous = self._store.get(request_id)
+            if previous is None:
+                continue
+            record = previous.copy(commodity_group=sys.intern(group), updated_at=now)
+            self._index(record, previous)
+            self._store[request_id] = record
+            updated += 1
+        self._logger.debug("Updated commodity group of %s requests", updated)
+        return updated
+
+    def _register(self, request_id: UUID) -> None:
+        self._seq[request_id] = len(self._ids)
+        self._ids.append(request_id)
+
+    def _candidate_ids(
+        self, status_filter: Optional[RequestStatus], department: Optional[str]
+    ) -> Optional[Collection[UUID]]:
+        """Ids matching the indexed filters, or None when no filter applies."""
+        sets: List[Optional[_IdSet]] = []
+        if status_filter is not None:
+            sets.append(self._by_status.get(status_filter))
+        if department:
+            sets.append(self._by_department.get(department_key(department)))
+        if not sets:
+            return None
+        found = [ids for ids in sets if ids is not None]
+        if len(found) < len(sets):
+            return []
+        smallest, *others = sorted(found, key=len)
+        if not others:
+            return smallest.ordered()
+        return [i for i in smallest.ordered() if all(i in other for other in others)]
+
+    def _filter_predicate(
+        self, status_filter: Optional[RequestStatus], department: Optional[str]
+    ) -> Optional[Callable[[UUID], bool]]:
+        """An O(1) per-id check for the status/department filters, if any."""
+        if status_filter is None and not department:
+            return None
+        wanted_department = department_key(department) if department else None
+
+        def accept(request_id: UUID) -> bool:
+            record = self._store[request_id]
+            return (status_filter is None or record.status == status_filter) and (
+                wanted_department is None or record.department_key == wanted_department
+            )
+
+        return accept
+
+    def _index_filters(self, record: RequestRecord, previous: Optional[RequestRecord]) -> None:
+        if previous is not None:
+            if (previous.status, previous.department_key) == (
+                record.status,
+                record.department_key,
+            ):
+                return
+            self._discard(self._by_status, previous.status, record.id)
+            self._discard(self._by_department, previous.department_key, record.id)
+        self._bucket(self._by_status, record.status).add(record.id)
+        self._bucket(self._by_department, record.department_key).add(record.id)
+
+    def _index(self, record: RequestRecord, previous: Optional[RequestRecord]) -> None:
+        """Point every index from ``previous`` (the replaced record, if any) to ``record``."""
+        self._derived.clear()
+        self._index_filters(record, previous)
+        self._rollup.replace(
+            previous.contribution() if previous is not None else None, record.contribution()
+        )
+        seq = self._seq[record.id]
+        self._search.add(seq, record.search_fields())
+        for field, keys in self._sorted.items():
+            keys.upsert((_sort_value(field, record), seq, record.id))
+
+    def _bucket(self, index: Dict, key: object) -> _IdSet:
+        ids = index.get(key)
+        if ids is None:
+            ids = index[key] = _IdSet(self._seq)
+        return ids
+
+    @staticmethod
+    def _discard(index: Dict, key: object, request_id: UUID) -> None:
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(request_id)
+        if not len(ids):
+            del index[key]
@@ -0,0 +1,140 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, List, Optional, Tuple
+
+from app.models.request import ProcurementRequest
+from app.models.status import RequestStatus
+
+_STATUS_RANK = {status: rank for rank, status in enumerate(RequestStatus)}
+
+
+class RequestSortField(str, Enum):
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    TOTAL_COST = "total_cost"
+    STATUS = "status"
+    # Only meaningful together with a search query.
+    RELEVANCE = "relevance"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another sort."""
+
+
+def sort_value(field: RequestSortField, request: ProcurementRequest) -> Any:
+    """The comparable value a request is ordered by for ``field``."""
+    if field is RequestSortField.CREATED_AT:
+        return request.created_at
+    if field is RequestSortField.UPDATED_AT:
+        return request.updated_at
+    if field is RequestSortField.TOTAL_COST:
+        return Decimal(request.total_cost)
+    if field is RequestSortField.STATUS:
+        return _STATUS_RANK[request.status]
+    raise ValueError(f"{field.value} is not a stored sort field")
+
+
+def _to_json(field: RequestSortField, value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _from_json(field: RequestSortField, raw: Any) -> Any:
+    if field in (RequestSortField.CREATED_AT, RequestSortField.UPDATED_AT):
+        return datetime.fromisoformat(raw)
+    if field is RequestSortField.TOTAL_COST:
+        value = Decimal(raw)
+        if not value.is_finite():
+            raise ValueError("Cursor total is not a finite number.")
+        return value
+    if field is RequestSortField.STATUS:
+        return int(raw)
+    return float(raw)
+
+
+def encode_cursor(
+    field: RequestSortField, descending: bool, value: Any, tiebreak: Any
+) -> str:
+    """
+    Encode the position after the last returned item as an opaque token.
+
+    ``tiebreak`` is whatever unique, JSON-serialisable value the repository
+    orders equal sort values by.
+    """
+    payload = {
+        "s": field.value,
+        "d": descending,
+        "v": _to_json(field, value),
+        "t": tiebreak,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, field: RequestSortField, descending: bool, tiebreak_type: type = int
+) -> Tuple[Any, Any]:
+    """
+    Return the (sort value, tiebreak) a cursor points at.
+
+    ``tiebreak_type`` is the type the repository issued tiebreaks as; a
+    cursor carrying anything else is rejected like any other malformed one.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["s"] != field.value or payload["d"] != descending:
+            raise InvalidCursorError("Cursor was issued for a different sort order.")
+        tiebreak = payload["t"]
+        # bool is an int subclass, but never a valid tiebreak.
+        if type(tiebreak) is not tiebreak_type:
+            raise InvalidCursorError("Malformed pagination cursor.")
+        return _from_json(field, payload["v"]), tiebreak
+    except InvalidCursorError:
+        raise
+    except (
+        binascii.Error,
+        ValueError,
+        KeyError,
+        TypeError,
+        UnicodeError,
+        ArithmeticError,  # decimal.InvalidOperation, OverflowError
+    ) as exc:
+        raise InvalidCursorError("Malformed pagination cursor.") from exc
+
+
+def paginate_sorted(
+    items: List[ProcurementRequest],
+    field: RequestSortField,
+    descending: bool,
+    limit: int,
+    cursor: Optional[str],
+) -> Tuple[List[ProcurementRequest], Optional[str]]:
+    """
+    Keyset-paginate an in-memory list by sorting it per call.
+
+    Fallback for repositories without ordered storage; ties are broken by id.
+    """
+
+    def key(request: ProcurementRequest) -> Tuple[Any, str]:
+        return sort_value(field, request), str(request.id)
+
+    ordered = sorted(items, key=key, reverse=descending)
+    if cursor is not None:
+        after = decode_cursor(cursor, field, descending, tiebreak_type=str)
+        ordered = [
+            r for r in ordered if (key(r) < after if descending else key(r) > after)
+        ]
+    page = ordered[:limit]
+    next_cursor = None
+    if len(ordered) > limit:
+        value, tiebreak = key(page[-1])
+        next_cursor = encode_cursor(field, descending, value, tiebreak)
+    return page, next_cursor
@@ -0,0 +1,103 @@
+import threading
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models.aggregates import SpendAggregates, SpendBucket
+from app.models.request import ProcurementRequest
+
+# Dimension name -> SpendAggregates field.
+DIMENSIONS = {
+    "commodity_group": "by_commodity_group",
+    "department": "by_department",
+    "vendor": "by_vendor",
+    "status": "by_status",
+}
+
+# What one request adds to the rollups: its key per dimension and its total.
+Contribution = Tuple[Tuple[Optional[str], ...], Decimal]
+
+
+def department_key(department: str) -> str:
+    """Departments compare case-insensitively, in list filters and rollups alike."""
+    return department.lower()
+
+
+def contribution(request: ProcurementRequest) -> Contribution:
+    keys = (
+        request.commodity_group or None,
+        department_key(request.department),
+        request.vendor_name,
+        request.status.value,
+    )
+    return keys, Decimal(request.total_cost)
+
+
+def build_aggregates(
+    buckets: Iterable[Tuple[str, Optional[str], int, Decimal]],
+) -> SpendAggregates:
+    """
+    Assemble the API model from (dimension, key, count, spend) rows.
+
+    Empty buckets are dropped; each dimension is sorted by spend, largest first.
+    Overall totals are summed from the status dimension, which every request is in.
+    """
+    grouped: Dict[str, List[SpendBucket]] = {field: [] for field in DIMENSIONS.values()}
+    for dimension, key, count, spend in buckets:
+        if count:
+            grouped[DIMENSIONS[dimension]].append(
+                SpendBucket(key=key, request_count=count, total_spend=spend)
+            )
+    for items in grouped.values():
+        items.sort(key=lambda bucket: (-bucket.total_spend, bucket.key or ""))
+    by_status = grouped["by_status"]
+    return SpendAggregates(
+        request_count=sum(bucket.request_count for bucket in by_status),
+        total_spend=sum((bucket.total_spend for bucket in by_status), Decimal("0")),
+        **grouped,
+    )
+
+
+class SpendRollup:
+    """
+    Running request counts and Decimal spend totals per dimension key.
+
+    Stores add a request's contribution when it is created and swap the old
+    contribution for the new one when it changes, so reads cost O(groups).
+    Departments are bucketed by ``department_key``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, Optional[str]], List] = {}
+
+    def add(self, item: Contribution, sign: int = 1) -> None:
+        with self._lock:
+            self._apply(item, sign)
+
+    def replace(self, old: Optional[Contribution], new: Contribution) -> None:
+        if old == new:
+            return
+        # One critical section, so no snapshot sees the request counted zero
+        # times (or twice) in between.
+        with self._lock:
+            if old is not None:
+                self._apply(old, -1)
+            self._apply(new, 1)
+
+    def _apply(self, item: Contribution, sign: int) -> None:
+        # Caller must hold self._lock.
+        keys, spend = item
+        for dimension, key in zip(DIMENSIONS, keys):
+            bucket = self._buckets.setdefault((dimension, key), [0, Decimal("0")])
+            bucket[0] += sign
+            bucket[1] += sign * spend
+            if not bucket[0]:
+                del self._buckets[(dimension, key)]
+
+    def snapshot(self) -> SpendAggregates:
+        with self._lock:
+            rows = [
+                (dimension, key, count, spend)
+                for (dimension, key), (count, spend) in self._buckets.items()
+            ]
+        return build_aggregates(rows)
@@ -0,0 +1,175 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+# (normalized text, weight) pairs that make up one indexed document.
+IndexedFields = Tuple[Tuple[str, float], ...]
+
+TITLE_WEIGHT = 3.0
+VENDOR_WEIGHT = 2.0
+VAT_ID_WEIGHT = 2.0
+COMMODITY_WEIGHT = 1.0
+ORDER_LINE_WEIGHT = 1.0
+
+_NGRAM = 3
+
+DocId = TypeVar("DocId", bound=Hashable)
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + _NGRAM] for i in range(len(text) - _NGRAM + 1)}
+
+
+def indexed_fields(
+    title: str,
+    vendor_name: str,
+    vendor_vat_id: str,
+    commodity_group: Optional[str],
+    line_descriptions: Iterable[str],
+) -> IndexedFields:
+    """The searchable fields of a request with their ranking weights."""
+    fields = [
+        (title, TITLE_WEIGHT),
+        (vendor_name, VENDOR_WEIGHT),
+        (vendor_vat_id, VAT_ID_WEIGHT),
+        (commodity_group or "", COMMODITY_WEIGHT),
+    ]
+    fields.extend((description, ORDER_LINE_WEIGHT) for description in line_descriptions)
+    return tuple((normalize(text), weight) for text, weight in fields if text)
+
+
+class TrigramSearchIndex(Generic[DocId]):
+    """
+    Incremental substring search over weighted text fields.
+
+    Every document is split into character trigrams with postings per trigram.
+    A query term is looked up by intersecting the postings of its trigrams
+    (smallest first) and confirming the substring on the few candidates, so
+    the cost follows the number of matches rather than the store size. Terms
+    shorter than three characters have no trigram and fall back to a scan of
+    the candidates of the other terms (or of all documents).
+
+    Results are ranked by the summed weight of the fields each term occurs in;
+    matches at the start of a word count double.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[DocId, IndexedFields] = {}
+        self._postings: Dict[str, Set[DocId]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: DocId, fields: IndexedFields) -> None:
+        """Index (or re-index) a document; unchanged documents are a no-op."""
+        previous = self._docs.get(doc_id)
+        if previous == fields:
+            return
+        new = self._doc_trigrams(fields)
+        if previous is not None:
+            old = self._doc_trigrams(previous)
+            for gram in old - new:
+                self._discard(gram, doc_id)
+            new -= old
+        postings = self._postings
+        for gram in new:
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {doc_id}
+            else:
+                ids.add(doc_id)
+        self._docs[doc_id] = fields
+
+    def remove(self, doc_id: DocId) -> None:
+        fields = self._docs.pop(doc_id, None)
+        if fields is None:
+            return
+        for gram in self._doc_trigrams(fields):
+            self._discard(gram, doc_id)
+
+    def search(
+        self, query: str, tiebreak: Optional[Callable[[DocId], Any]] = None
+    ) -> List[Tuple[DocId, float]]:
+        """
+        Return (doc_id, score) pairs matching every query term, best first.
+
+        Equal scores are ordered by ``tiebreak(doc_id)`` when given.
+        """
+        terms = list(dict.fromkeys(normalize(query).split()))
+        if not terms:
+            return []
+
+        long_terms = sorted((t for t in terms if len(t) >= _NGRAM), key=len, reverse=True)
+        candidates: Optional[Iterable[DocId]] = None
+        if long_terms:
+            # The longest term is usually the most selective.
+            candidates = self._term_candidates(long_terms[0])
+        if candidates is None:
+            candidates = self._docs.keys()
+
+        scored: List[Tuple[DocId, float]] = []
+        for doc_id in candidates:
+            score = self._score(self._docs[doc_id], terms)
+            if score:
+                scored.append((doc_id, score))
+        if tiebreak is not None:
+            scored.sort(key=lambda item: tiebreak(item[0]))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored
+
+    def _term_candidates(self, term: str) -> Set[DocId]:
+        postings = [self._postings.get(gram) for gram in _trigrams(term)]
+        if any(p is None for p in postings):
+            return set()
+        postings.sort(key=len)  # type: ignore[arg-type]
+        result = set(postings[0])  # type: ignore[arg-type]
+        for other in postings[1:]:
+            result.intersection_update(other)  # type: ignore[arg-type]
+            if not result:
+                break
+        return result
+
+    @staticmethod
+    def _score(fields: IndexedFields, terms: Sequence[str]) -> float:
+        total = 0.0
+        for term in terms:
+            term_score = 0.0
+            for text, weight in fields:
+                position = text.find(term)
+                if position < 0:
+                    continue
+                at_word_start = position == 0 or not text[position - 1].isalnum()
+                term_score += weight * (2 if at_word_start else 1)
+            if not term_score:
+                return 0.0
+            total += term_score
+        return total
+
+    @staticmethod
+    def _doc_trigrams(fields: IndexedFields) -> Set[str]:
+        # One pass over all fields; trigrams spanning the separator never match a
+        # query term and only cost a little posting space.
+        return _trigrams("\x00".join([text for text, _ in fields]))
+
+    def _discard(self, gram: str, doc_id: DocId) -> None:
+        ids = self._postings.get(gram)
+        if ids is None:
+            return
+        ids.discard(doc_id)
+        if not ids:
+            del self._postings[gram]
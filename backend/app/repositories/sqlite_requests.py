@@ -0,0 +1,580 @@
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.models.aggregates import SpendAggregates
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequest, ProcurementRequestCreate
+from app.models.status import RequestStatus
+from app.repositories.base import RequestRepository, StaleRequestError
+from app.repositories.pagination import (
+    RequestSortField,
+    decode_cursor,
+    encode_cursor,
+    sort_value,
+)
+from app.repositories.rollups import DIMENSIONS, build_aggregates, department_key
+from app.repositories.search_index import (
+    COMMODITY_WEIGHT,
+    ORDER_LINE_WEIGHT,
+    TITLE_WEIGHT,
+    VAT_ID_WEIGHT,
+    VENDOR_WEIGHT,
+    normalize,
+)
+
+# Fixed-width so that text order equals time order.
+_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    requestor_name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    vendor_name TEXT NOT NULL,
+    vendor_vat_id TEXT NOT NULL,
+    department TEXT NOT NULL,
+    department_key TEXT NOT NULL,
+    commodity_group TEXT,
+    total_cost TEXT NOT NULL,
+    total_cost_cents INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    status_rank INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS order_lines (
+    request_seq INTEGER NOT NULL REFERENCES requests(seq) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    line_id INTEGER,
+    position_description TEXT NOT NULL,
+    unit_price TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    total_price TEXT NOT NULL,
+    PRIMARY KEY (request_seq, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS request_rollups (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    request_count INTEGER NOT NULL,
+    total_cents INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_requests_status ON requests (status, seq);
+CREATE INDEX IF NOT EXISTS ix_requests_department ON requests (department_key, seq);
+CREATE INDEX IF NOT EXISTS ix_requests_created ON requests (created_at, seq);
+CREATE INDEX IF NOT EXISTS ix_requests_updated ON requests (updated_at, seq);
+CREATE INDEX IF NOT EXISTS ix_requests_total ON requests (total_cost_cents, seq);
+CREATE INDEX IF NOT EXISTS ix_requests_status_rank ON requests (status_rank, seq);
+"""
+
+_COLUMNS = (
+    "seq, id, requestor_name, title, vendor_name, vendor_vat_id, department, "
+    "commodity_group, total_cost, status, created_at, updated_at"
+)
+
+_INSERT_REQUEST = """
+INSERT INTO requests (
+    id, requestor_name, title, vendor_name, vendor_vat_id, department,
+    department_key, commodity_group, total_cost, total_cost_cents, status,
+    status_rank, created_at, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE_REQUEST = """
+UPDATE requests SET
+    requestor_name = ?, title = ?, vendor_name = ?, vendor_vat_id = ?,
+    department = ?, department_key = ?, commodity_group = ?, total_cost = ?,
+    total_cost_cents = ?, status = ?, status_rank = ?, updated_at = ?
+WHERE id = ? AND updated_at = ?
+RETURNING seq
+"""
+
+_INSERT_LINE = """
+INSERT INTO order_lines (
+    request_seq, position, line_id, position_description, unit_price, amount,
+    unit, total_price
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Order lines are loaded for at most this many requests per query.
+_IN_BATCH = 500
+
+_UPSERT_ROLLUP = """
+INSERT INTO request_rollups (dimension, key, request_count, total_cents)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (dimension, key) DO UPDATE SET
+    request_count = request_count + excluded.request_count,
+    total_cents = total_cents + excluded.total_cents
+"""
+
+# Rebuilds the rollups of a database created before they existed.
+_BACKFILL_ROLLUPS = """
+INSERT INTO request_rollups (dimension, key, request_count, total_cents)
+SELECT 'commodity_group', coalesce(commodity_group, ''), count(*), sum(total_cost_cents)
+FROM requests GROUP BY 2
+UNION ALL
+SELECT 'department', department_key, count(*), sum(total_cost_cents) FROM requests GROUP BY 2
+UNION ALL
+SELECT 'vendor', vendor_name, count(*), sum(total_cost_cents) FROM requests GROUP BY 2
+UNION ALL
+SELECT 'status', status, count(*), sum(total_cost_cents) FROM requests GROUP BY 2
+"""
+
+# Rollups written before departments were keyed case-insensitively.
+_STALE_DEPARTMENT_ROLLUPS = """
+SELECT 1 FROM request_rollups WHERE dimension = 'department' AND key != lower(key) LIMIT 1
+"""
+_BACKFILL_DEPARTMENT_ROLLUPS = """
+INSERT INTO request_rollups (dimension, key, request_count, total_cents)
+SELECT 'department', department_key, count(*), sum(total_cost_cents) FROM requests GROUP BY 2
+"""
+
+# Columns the rollups are keyed on, in DIMENSIONS order, plus the total.
+_ROLLUP_COLUMNS = (
+    "coalesce(commodity_group, ''), department_key, vendor_name, status, total_cost_cents"
+)
+
+_SORT_COLUMNS = {
+    RequestSortField.CREATED_AT: "created_at",
+    RequestSortField.UPDATED_AT: "updated_at",
+    RequestSortField.TOTAL_COST: "total_cost_cents",
+    RequestSortField.STATUS: "status_rank",
+}
+
+# Per search term: weighted hits in every searchable field, using the field
+# weights of the in-memory search index (without its word-start bonus).
+_TERM_SCORE = (
+    f"((instr(casefold(title), ?) > 0) * {TITLE_WEIGHT}"
+    f" + (instr(casefold(vendor_name), ?) > 0) * {VENDOR_WEIGHT}"
+    f" + (instr(casefold(vendor_vat_id), ?) > 0) * {VAT_ID_WEIGHT}"
+    f" + (instr(casefold(coalesce(commodity_group, '')), ?) > 0) * {COMMODITY_WEIGHT}"
+    " + EXISTS (SELECT 1 FROM order_lines ol WHERE ol.request_seq = requests.seq"
+    f" AND instr(casefold(ol.position_description), ?) > 0) * {ORDER_LINE_WEIGHT})"
+)
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime(_TIMESTAMP_FORMAT)
+
+
+def _cents(value: Decimal) -> int:
+    return int((Decimal(value) * 100).to_integral_value())
+
+
+def _db_sort_value(field: RequestSortField, value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _timestamp(value)
+    if field is RequestSortField.TOTAL_COST:
+        return _cents(value)
+    return value
+
+
+def _casefold(value: Optional[str]) -> Optional[str]:
+    return normalize(value) if value is not None else None
+
+
+@contextmanager
+def _write_transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    """
+    Take the write lock up front, so read-modify-write steps (like the rollup
+    updates) cannot interleave with writers in other processes.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _rollup_rows(values: Sequence[Any], sign: int) -> List[Tuple[str, str, int, int]]:
+    *keys, cents = values
+    return [
+        (dimension, key, sign, sign * cents) for dimension, key in zip(DIMENSIONS, keys)
+    ]
+
+
+class SQLiteRequestRepository(RequestRepository):
+    """
+    Procurement requests stored in a SQLite database file.
+
+    The database runs in WAL mode so several uvicorn worker processes can read
+    while one writes. Each thread gets its own connection; sqlite3 caches the
+    prepared statements per connection. Order lines live in a child table and
+    every list filter and sort order is backed by an index ending in ``seq``,
+    which also serves as the keyset tiebreak. Spend aggregates are kept in a
+    rollup table updated in the same transaction as each write, so every
+    worker process reads the same totals.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000) -> None:
+        self._path = path
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._logger = logging.getLogger("app")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        with _write_transaction(conn):
+            if conn.execute("SELECT 1 FROM request_rollups LIMIT 1").fetchone() is None:
+                conn.execute(_BACKFILL_ROLLUPS)
+            elif conn.execute(_STALE_DEPARTMENT_ROLLUPS).fetchone() is not None:
+                conn.execute("DELETE FROM request_rollups WHERE dimension = 'department'")
+                conn.execute(_BACKFILL_DEPARTMENT_ROLLUPS)
+
+    def close(self) -> None:
+        """Close every connection opened by this repository."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def list(
+        self,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[ProcurementRequest]:
+        """
+        Return all requests that match optional filters.
+
+        Results are in creation order, or ranked by relevance when searching.
+        """
+        clauses, params = self._filters(status_filter, department, search)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        if search:
+            score, score_params = self._score(search)
+            sql = f"SELECT {_COLUMNS} FROM requests{where} ORDER BY {score} DESC, seq"
+            params = params + score_params
+        else:
+            sql = f"SELECT {_COLUMNS} FROM requests{where} ORDER BY seq"
+        items = self._load(self._connection().execute(sql, params).fetchall())
+        self._logger.debug("Repository list returning %s items", len(items))
+        return items
+
+    def list_page(
+        self,
+        sort: RequestSortField,
+        descending: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[ProcurementRequest], Optional[str]]:
+        """Return one page of matching requests in keyset order and the next cursor."""
+        if sort is RequestSortField.RELEVANCE and not search:
+            sort = RequestSortField.CREATED_AT
+        clauses, filter_params = self._filters(status_filter, department, search)
+
+        if sort is RequestSortField.RELEVANCE:
+            score, score_params = self._score(search or "")
+            sort_expr = f"-{score}"
+        else:
+            sort_expr, score_params = _SORT_COLUMNS[sort], []
+
+        params = score_params + filter_params
+        if cursor is not None:
+            value, seq = decode_cursor(cursor, sort, descending)
+            operator = "<" if descending else ">"
+            clauses.append(f"({sort_expr}, seq) {operator} (?, ?)")
+            params += score_params + [_db_sort_value(sort, value), seq]
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            f"SELECT {_COLUMNS}, {sort_expr} AS sort_key FROM requests{where}"
+            f" ORDER BY sort_key {direction}, seq {direction} LIMIT ?"
+        )
+        params.append(limit + 1)
+        rows = self._connection().execute(sql, params).fetchall()
+
+        page = self._load([row[:-1] for row in rows[:limit]])
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            value = (
+                rows[limit - 1][-1]
+                if sort is RequestSortField.RELEVANCE
+                else sort_value(sort, last)
+            )
+            next_cursor = encode_cursor(sort, descending, value, rows[limit - 1][0])
+        self._logger.debug("Repository page returning %s items", len(page))
+        return page, next_cursor
+
+    def aggregates(self) -> SpendAggregates:
+        """Read the rollup table (O(number of groups))."""
+        rows = self._connection().execute(
+            "SELECT dimension, key, request_count, total_cents FROM request_rollups"
+        )
+        return build_aggregates(
+            (
+                dimension,
+                key if key or dimension != "commodity_group" else None,
+                count,
+                Decimal(cents).scaleb(-2),
+            )
+            for dimension, key, count, cents in rows
+        )
+
+    def get(self, request_id: UUID) -> Optional[ProcurementRequest]:
+        """Return a request by id if present."""
+        rows = (
+            self._connection()
+            .execute(f"SELECT {_COLUMNS} FROM requests WHERE id = ?", (str(request_id),))
+            .fetchall()
+        )
+        items = self._load(rows)
+        return items[0] if items else None
+
+    def create(self, payload: ProcurementRequestCreate) -> ProcurementRequest:
+        """Store a new procurement request."""
+        req = ProcurementRequest(**payload.model_dump())
+        conn = self._connection()
+        with _write_transaction(conn):
+            self._insert(conn, req)
+        self._logger.debug("Stored new request %s", req.id)
+        return req
+
+    def create_many(
+        self, payloads: Sequence[ProcurementRequestCreate]
+    ) -> List[ProcurementRequest]:
+        """Store several new requests in one transaction."""
+        created = [ProcurementRequest(**payload.model_dump()) for payload in payloads]
+        conn = self._connection()
+        with _write_transaction(conn):
+            for req in created:
+                self._insert(conn, req)
+        self._logger.debug("Stored %s new requests", len(created))
+        return created
+
+    def update(self, request: ProcurementRequest) -> ProcurementRequest:
+        """Persist updates to an existing request (compare-and-set on updated_at)."""
+        read_at = _timestamp(request.updated_at)
+        updated_at = datetime.utcnow()
+        conn = self._connection()
+        with _write_transaction(conn):
+            old = conn.execute(
+                f"SELECT {_ROLLUP_COLUMNS} FROM requests WHERE id = ?", (str(request.id),)
+            ).fetchone()
+            row = conn.execute(
+                _UPDATE_REQUEST,
+                (
+                    request.requestor_name,
+                    request.title,
+                    request.vendor_name,
+                    request.vendor_vat_id,
+                    request.department,
+                    department_key(request.department),
+                    request.commodity_group,
+                    str(request.total_cost),
+                    _cents(request.total_cost),
+                    request.status.value,
+                    sort_value(RequestSortField.STATUS, request),
+                    _timestamp(updated_at),
+                    str(request.id),
+                    read_at,
+                ),
+            ).fetchone()
+            if row is None:
+                if old is None:
+                    raise KeyError(f"Request {request.id} does not exist")
+                raise StaleRequestError(f"Request {request.id} changed since it was read")
+            conn.execute("DELETE FROM order_lines WHERE request_seq = ?", (row[0],))
+            self._insert_lines(conn, row[0], request.order_lines)
+            new = conn.execute(
+                f"SELECT {_ROLLUP_COLUMNS} FROM requests WHERE seq = ?", (row[0],)
+            ).fetchone()
+            if new != old:
+                conn.executemany(
+                    _UPSERT_ROLLUP, _rollup_rows(old, -1) + _rollup_rows(new, 1)
+                )
+        request.updated_at = updated_at
+        self._logger.debug("Updated request %s", request.id)
+        return request
+
+    def update_commodity_groups(self, groups: Mapping[UUID, str]) -> int:
+        """Set the commodity group of several requests in one transaction."""
+        updated_at = _timestamp(datetime.utcnow())
+        updated = 0
+        conn = self._connection()
+        with _write_transaction(conn):
+            for request_id, group in groups.items():
+                old = conn.execute(
+                    f"SELECT {_ROLLUP_COLUMNS} FROM requests WHERE id = ?",
+                    (str(request_id),),
+                ).fetchone()
+                if old is None:
+                    continue
+                conn.execute(
+                    "UPDATE requests SET commodity_group = ?, updated_at = ? WHERE id = ?",
+                    (group, updated_at, str(request_id)),
+                )
+                new = (group or "", *old[1:])
+                if new != tuple(old):
+                    conn.executemany(
+                        _UPSERT_ROLLUP, _rollup_rows(old, -1) + _rollup_rows(new, 1)
+                    )
+                updated += 1
+        self._logger.debug("Updated commodity group of %s requests", updated)
+        return updated
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Each connection is used by its own thread only, but close() may
+            # run on another one.
+            conn = sqlite3.connect(
+                self._path, timeout=self._busy_timeout_ms / 1000, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute(f"PRAGMA busy_timeout={int(self._busy_timeout_ms)}")
+            # sqlite's lower() only folds ASCII; match the in-memory search instead.
+            conn.create_function("casefold", 1, _casefold, deterministic=True)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _filters(
+        status_filter: Optional[RequestStatus],
+        department: Optional[str],
+        search: Optional[str],
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if status_filter is not None:
+            clauses.append("status = ?")
+            params.append(status_filter.value)
+        if department:
+            clauses.append("department_key = ?")
+            params.append(department_key(department))
+        for term in dict.fromkeys(normalize(search or "").split()):
+            # Every term has to hit at least one field.
+            clauses.append(f"{_TERM_SCORE} > 0")
+            params.extend([term] * 5)
+        return clauses, params
+
+    @staticmethod
+    def _score(search: str) -> Tuple[str, List[Any]]:
+        terms = list(dict.fromkeys(normalize(search).split()))
+        params: List[Any] = []
+        for term in terms:
+            params.extend([term] * 5)
+        return "(" + " + ".join([_TERM_SCORE] * len(terms) or ["0"]) + ")", params
+
+    @classmethod
+    def _insert(cls, conn: sqlite3.Connection, req: ProcurementRequest) -> None:
+        seq = conn.execute(
+            _INSERT_REQUEST,
+            (
+                str(req.id),
+                req.requestor_name,
+                req.title,
+                req.vendor_name,
+                req.vendor_vat_id,
+                req.department,
+                department_key(req.department),
+                req.commodity_group,
+                str(req.total_cost),
+                _cents(req.total_cost),
+                req.status.value,
+                sort_value(RequestSortField.STATUS, req),
+                _timestamp(req.created_at),
+                _timestamp(req.updated_at),
+            ),
+        ).lastrowid
+        assert seq is not None  # set by every successful INSERT
+        cls._insert_lines(conn, seq, req.order_lines)
+        values = (
+            req.commodity_group or "",
+            department_key(req.department),
+            req.vendor_name,
+            req.status.value,
+            _cents(req.total_cost),
+        )
+        conn.executemany(_UPSERT_ROLLUP, _rollup_rows(values, 1))
+
+    @staticmethod
+    def _insert_lines(
+        conn: sqlite3.Connection, seq: int, lines: Sequence[OrderLine]
+    ) -> None:
+        conn.executemany(
+            _INSERT_LINE,
+            [
+                (
+                    seq,
+                    position,
+                    line.id,
+                    line.position_description,
+                    str(line.unit_price),
+                    str(line.amount),
+                    line.unit,
+                    str(line.total_price),
+                )
+                for position, line in enumerate(lines)
+            ],
+        )
+
+    def _load(self, rows: Sequence[Sequence[Any]]) -> List[ProcurementRequest]:
+        """Build request models for rows, fetching all their order lines in one query."""
+        if not rows:
+            return []
+        lines: Dict[int, List[OrderLine]] = {row[0]: [] for row in rows}
+        seqs = list(lines)
+        conn = self._connection()
+        for start in range(0, len(seqs), _IN_BATCH):
+            batch = seqs[start : start + _IN_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for line in conn.execute(
+                "SELECT request_seq, line_id, position_description, unit_price, amount, "
+                f"unit, total_price FROM order_lines WHERE request_seq IN ({placeholders}) "
+                "ORDER BY request_seq, position",
+                batch,
+            ):
+                lines[line[0]].append(
+                    OrderLine.model_validate(
+                        {
+                            "id": line[1],
+                            "position_description": line[2],
+                            "unit_price": line[3],
+                            "amount": line[4],
+                            "unit": line[5],
+                            "total_price": line[6],
+                        }
+                    )
+                )
+        return [
+            ProcurementRequest(
+                id=row[1],
+                requestor_name=row[2],
+                title=row[3],
+                vendor_name=row[4],
+                vendor_vat_id=row[5],
+                department=row[6],
+                commodity_group=row[7],
+                total_cost=row[8],
+                status=row[9],
+                created_at=row[10],
+                updated_at=row[11],
+                order_lines=lines[row[0]],
+            )
+            for row in rows
+        ]
@@ -0,0 +1,93 @@
+import functools
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+import anyio
+
+from app.models.aggregates import SpendAggregates
+from app.models.request import ProcurementRequest, ProcurementRequestCreate
+from app.models.status import RequestStatus
+from app.repositories.base import AsyncRequestRepository, RequestRepository
+from app.repositories.pagination import RequestSortField
+
+_T = TypeVar("_T")
+
+
+class ThreadedAsyncRequestRepository(AsyncRequestRepository):
+    """
+    Expose a blocking RequestRepository to async code.
+
+    Every call runs in anyio's worker thread pool, so list building, model
+    validation and SQLite I/O no longer hold up the event loop. The wrapped
+    repository must be thread-safe (the in-memory store locks internally,
+    the SQLite store uses one connection per thread). ``limiter`` caps how
+    many repository calls run at once; anyio's default pool is used otherwise.
+    """
+
+    def __init__(
+        self,
+        repository: RequestRepository,
+        limiter: Optional[anyio.CapacityLimiter] = None,
+    ) -> None:
+        self._repo = repository
+        self._limiter = limiter
+
+    @property
+    def sync(self) -> RequestRepository:
+        return self._repo
+
+    async def _run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        return await anyio.to_thread.run_sync(
+            functools.partial(func, *args, **kwargs), limiter=self._limiter
+        )
+
+    async def list(
+        self,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[ProcurementRequest]:
+        return await self._run(
+            self._repo.list,
+            status_filter=status_filter,
+            department=department,
+            search=search,
+        )
+
+    async def list_page(
+        self,
+        sort: RequestSortField,
+        descending: bool = False,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[ProcurementRequest], Optional[str]]:
+        return await self._run(
+            self._repo.list_page,
+            sort=sort,
+            descending=descending,
+            limit=limit,
+            cursor=cursor,
+            status_filter=status_filter,
+            department=department,
+            search=search,
+        )
+
+    async def aggregates(self) -> SpendAggregates:
+        return await self._run(self._repo.aggregates)
+
+    async def get(self, request_id: UUID) -> Optional[ProcurementRequest]:
+        return await self._run(self._repo.get, request_id)
+
+    async def create(self, payload: ProcurementRequestCreate) -> ProcurementRequest:
+        return await self._run(self._repo.create, payload)
+
+    async def create_many(
+        self, payloads: Sequence[ProcurementRequestCreate]
+    ) -> List[ProcurementRequest]:
+        return await self._run(self._repo.create_many, payloads)
+
+    async def update(self, request: ProcurementRequest) -> ProcurementRequest:
+        return await self._run(self._repo.update, request)
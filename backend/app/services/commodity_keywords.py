@@ -0,0 +1,246 @@
+# app/services/commodity_keywords.py
+
+from typing import Dict
+
+# Keyword -> weight per commodity group (every group of COMMODITY_GROUPS_PROMPT
+# except "Other", the fallback). Keywords are lowercase and match anywhere in
+# the text, so stems also cover inflections and German compounds ("lizenz"
+# matches "Lizenzen", "laptop" matches "Firmenlaptop"); keywords of up to
+# three characters must match a whole word. Weights: 3 = near-certain,
+# 2 = typical, 1 = hint.
+COMMODITY_KEYWORDS: Dict[str, Dict[str, int]] = {
+    "General Services - Accommodation Rentals": {
+        "hotel": 3, "accommodation": 3, "unterkunft": 3, "übernachtung": 3,
+        "airbnb": 3, "apartment": 2, "booking.com": 2, "room rental": 2,
+    },
+    "General Services - Membership Fees": {
+        "membership": 3, "mitgliedschaft": 3, "mitgliedsbeitrag": 3,
+        "annual fee": 2, "jahresbeitrag": 3, "association": 1, "verband": 1,
+    },
+    "General Services - Workplace Safety": {
+        "workplace safety": 3, "arbeitssicherheit": 3, "arbeitsschutz": 3,
+        "first aid": 3, "erste hilfe": 3, "fire extinguisher": 3,
+        "feuerlöscher": 3, "safety shoes": 3, "sicherheitsschuh": 3,
+        "ppe": 2, "schutzausrüstung": 3, "helmet": 2,
+    },
+    "General Services - Consulting": {
+        "consulting": 3, "beratung": 3, "consultant": 3, "berater": 3,
+        "advisory": 2, "workshop": 1, "strategy": 1,
+    },
+    "General Services - Financial Services": {
+        "audit": 2, "wirtschaftsprüfung": 3, "steuerberatung": 3, "tax advisory": 3,
+        "accounting": 2, "buchhaltung": 3, "bank fee": 3, "bankgebühr": 3,
+        "payroll": 2, "lohnabrechnung": 3,
+    },
+    "General Services - Fleet Management": {
+        "fleet": 3, "fuhrpark": 3, "leasing": 2, "company car": 3,
+        "dienstwagen": 3, "firmenwagen": 3, "fuel card": 3, "tankkarte": 3,
+        "car rental": 2, "mietwagen": 2,
+    },
+    "General Services - Recruitment Services": {
+        "recruiting": 3, "recruitment": 3, "headhunter": 3, "personalvermittlung": 3,
+        "job posting": 3, "stellenanzeige": 3, "stepstone": 3, "talent": 1,
+    },
+    "General Services - Professional Development": {
+        "training": 2, "schulung": 3, "weiterbildung": 3, "seminar": 2,
+        "course": 2, "kurs": 1, "certification": 2, "zertifizierung": 2,
+        "coaching": 3, "conference ticket": 2,
+    },
+    "General Services - Miscellaneous Services": {
+        "translation": 3, "übersetzung": 3, "notary": 3, "notar": 3,
+        "legal": 1, "rechtsanwalt": 2, "service fee": 1,
+    },
+    "General Services - Insurance": {
+        "insurance": 3, "versicherung": 3, "liability": 2, "haftpflicht": 3,
+        "premium": 1, "police": 1,
+    },
+    "Facility Management - Electrical Engineering": {
+        "electrical": 3, "elektro": 3, "elektriker": 3, "wiring": 3,
+        "verkabelung": 2, "socket": 2, "steckdose": 3, "lighting": 2,
+        "beleuchtung": 2, "led": 1,
+    },
+    "Facility Management - Facility Management Services": {
+        "facility management": 3, "facility service": 3, "hausmeister": 3,
+        "janitor": 3, "gebäudemanagement": 3, "property management": 2,
+    },
+    "Facility Management - Security": {
+        "security guard": 3, "wachschutz": 3, "sicherheitsdienst": 3,
+        "alarm": 2, "cctv": 3, "video surveillance": 3, "videoüberwachung": 3,
+        "access control": 3, "zutrittskontrolle": 3, "doorman": 2,
+    },
+    "Facility Management - Renovations": {
+        "renovation": 3, "renovierung": 3, "refurbishment": 3, "sanierung": 3,
+        "painting": 2, "maler": 2, "flooring": 2, "bodenbelag": 2, "umbau": 3,
+        "drywall": 2, "trockenbau": 3,
+    },
+    "Facility Management - Office Equipment": {
+        "office chair": 3, "bürostuhl": 3, "bürostühle": 3, "desk": 2, "schreibtisch": 3,
+        "furniture": 2, "möbel": 2, "whiteboard": 2, "shelf": 1, "regal": 1,
+        "office supplies": 3, "büromaterial": 3, "stationery": 2,
+    },
+    "Facility Management - Energy Management": {
+        "energy": 2, "energie": 2, "electricity": 3, "strom": 2, "gas supply": 3,
+        "heating": 2, "heizung": 2, "solar": 2, "photovoltaik": 3,
+        "energy audit": 3,
+    },
+    "Facility Management - Maintenance": {
+        "building maintenance": 3, "gebäudewartung": 3, "hvac": 3, "klimaanlage": 3,
+        "elevator": 2, "aufzug": 2, "plumbing": 3, "sanitär": 2,
+        "inspection": 1, "wartung": 1,
+    },
+    "Facility Management - Cafeteria and Kitchenettes": {
+        "cafeteria": 3, "kantine": 3, "kitchen": 2, "küche": 2, "coffee": 2,
+        "kaffee": 2, "catering": 2, "beverage": 2, "getränk": 2, "snack": 2,
+        "water dispenser": 3, "wasserspender": 3, "fruit": 1, "obst": 1,
+    },
+    "Facility Management - Cleaning": {
+        "cleaning": 3, "reinigung": 3, "putz": 2, "glasreinigung": 3,
+        "janitorial": 3, "hygiene": 2, "waste disposal": 2, "entsorgung": 2,
+        "detergent": 2, "reinigungsmittel": 3,
+    },
+    "Publishing Production - Audio and Visual Production": {
+        "video production": 3, "videoproduktion": 3, "audio production": 3,
+        "filming": 3, "recording studio": 3, "tonstudio": 3,
+        "voice over": 3, "sprecher": 2, "camera crew": 3,
+    },
+    "Publishing Production - Books/Videos/CDs": {
+        "books": 2, "bücher": 2, "isbn": 3, "dvd": 3, "cd": 1, "blu-ray": 3,
+        "audiobook": 3, "hörbuch": 3,
+    },
+    "Publishing Production - Printing Costs": {
+        "printing": 3, "druck": 2, "druckerei": 3, "print run": 3, "auflage": 2,
+        "offset": 2, "flyer": 2, "brochure": 2, "broschüre": 2, "poster": 1,
+    },
+    "Publishing Production - Software Development for Publishing": {
+        "publishing software": 3, "cms": 2, "content management": 2,
+        "e-book conversion": 3, "epub": 3, "typesetting software": 3,
+    },
+    "Publishing Production - Material Costs": {
+        "paper": 2, "papier": 2, "ink": 2, "tinte": 2, "toner": 2,
+        "binding": 2, "bindung": 2, "cardboard": 1, "karton": 1,
+    },
+    "Publishing Production - Shipping for Production": {
+        "production shipping": 3, "print shipping": 3, "distribution of copies": 3,
+        "auslieferung": 2, "pallet shipping": 2,
+    },
+    "Publishing Production - Digital Product Development": {
+        "app development": 3, "app-entwicklung": 3, "web development": 3,
+        "webentwicklung": 3, "digital product": 3, "ux design": 3,
+        "ui design": 3, "prototype": 1,
+    },
+    "Publishing Production - Pre-production": {
+        "pre-production": 3, "vorproduktion": 3, "editing": 2, "lektorat": 3,
+        "proofreading": 3, "korrektorat": 3, "typesetting": 3, "satz": 1,
+        "layout": 2, "illustration": 2,
+    },
+    "Publishing Production - Post-production Costs": {
+        "post-production": 3, "postproduktion": 3, "color grading": 3,
+        "video editing": 3, "schnitt": 2, "mastering": 3, "subtitles": 3,
+        "untertitel": 3,
+    },
+    "Information Technology - Hardware": {
+        "laptop": 3, "notebook": 3, "macbook": 3, "thinkpad": 3, "desktop pc": 3,
+        "monitor": 3, "bildschirm": 3, "server": 2, "hardware": 3, "keyboard": 2,
+        "tastatur": 2, "mouse": 1, "maus": 1, "docking station": 3, "dockingstation": 3,
+        "printer": 2, "drucker": 2, "smartphone": 3, "iphone": 3, "ipad": 3,
+        "tablet": 2, "headset": 2, "ssd": 3, "router": 2, "switch": 1,
+    },
+    "Information Technology - IT Services": {
+        "it service": 3, "it-service": 3, "it support": 3, "helpdesk": 3,
+        "hosting": 3, "cloud": 2, "aws": 3, "azure": 3, "managed service": 3,
+        "it consulting": 3, "penetration test": 3, "domain": 2, "backup": 2,
+        "data center": 3, "rechenzentrum": 3,
+    },
+    "Information Technology - Software": {
+        "software": 3, "license": 3, "licence": 3, "lizenz": 3, "saas": 3,
+        "subscription": 2, "abonnement": 1, "adobe": 3, "microsoft 365": 3,
+        "office 365": 3, "jira": 3, "confluence": 3, "slack": 3, "salesforce": 3,
+        "figma": 3, "github": 3, "atlassian": 3, "antivirus": 3,
+    },
+    "Logistics - Courier, Express, and Postal Services": {
+        "courier": 3, "kurier": 3, "express delivery": 3, "postage": 3,
+        "porto": 3, "briefmarke": 3, "dhl": 2, "ups": 2, "fedex": 3,
+        "deutsche post": 3, "parcel": 2, "paket": 2,
+    },
+    "Logistics - Warehousing and Material Handling": {
+        "warehousing": 3, "lagerung": 3, "storage space": 3, "lagerfläche": 3,
+        "pallet": 2, "palette": 2, "picking": 2, "kommissionierung": 3,
+        "fulfillment": 3,
+    },
+    "Logistics - Transportation Logistics": {
+        "freight": 3, "fracht": 3, "spedition": 3, "forwarding": 3, "trucking": 3,
+        "lkw": 2, "container": 2, "customs": 2, "zoll": 2,
+    },
+    "Logistics - Delivery Services": {
+        "delivery service": 3, "lieferservice": 3, "last mile": 3,
+        "delivery fee": 2, "liefergebühr": 2, "zustellung": 2,
+    },
+    "Marketing & Advertising - Advertising": {
+        "advertising": 3, "werbung": 3, "advertisement": 3, "anzeige": 2,
+        "print ad": 3, "tv spot": 3, "radio spot": 3, "commercial": 2,
+    },
+    "Marketing & Advertising - Outdoor Advertising": {
+        "billboard": 3, "plakat": 3, "outdoor advertising": 3, "außenwerbung": 3,
+        "digital signage": 2, "bus advertising": 3, "litfaßsäule": 3,
+    },
+    "Marketing & Advertising - Marketing Agencies": {
+        "agency": 2, "agentur": 2, "marketing agency": 3, "werbeagentur": 3,
+        "creative agency": 3, "pr agency": 3, "branding": 2, "retainer": 2,
+    },
+    "Marketing & Advertising - Direct Mail": {
+        "direct mail": 3, "mailing": 2, "postwurf": 3, "direktmarketing": 3,
+        "letter shop": 3, "lettershop": 3,
+    },
+    "Marketing & Advertising - Customer Communication": {
+        "newsletter": 3, "customer communication": 3, "kundenkommunikation": 3,
+        "call center": 3, "callcenter": 3, "crm": 2, "sms": 2, "survey": 2,
+        "umfrage": 2,
+    },
+    "Marketing & Advertising - Online Marketing": {
+        "online marketing": 3, "campaign": 2, "kampagne": 2, "facebook": 3,
+        "instagram": 3, "linkedin": 3, "tiktok": 3, "google ads": 3, "seo": 3,
+        "social media": 3, "influencer": 3, "marketing": 1,
+        "affiliate": 3, "banner": 2,
+    },
+    "Marketing & Advertising - Events": {
+        "event": 2, "veranstaltung": 3, "trade fair": 3, "messe": 3, "booth": 3,
+        "messestand": 3, "conference": 2, "konferenz": 2, "venue": 3,
+        "location rental": 2, "party": 2, "stage": 1, "bühne": 1,
+    },
+    "Marketing & Advertising - Promotional Materials": {
+        "promotional": 3, "merchandise": 3, "merch": 3, "giveaway": 3,
+        "werbemittel": 3, "werbeartikel": 3, "branded": 2, "t-shirt": 2,
+        "mug": 2, "tasse": 2, "roll-up": 3, "rollup": 3, "sticker": 2,
+    },
+    "Production - Warehouse and Operational Equipment": {
+        "shelving": 3, "regalsystem": 3, "racking": 3, "hand truck": 3,
+        "sackkarre": 3, "workbench": 3, "werkbank": 3, "ladder": 2, "leiter": 2,
+    },
+    "Production - Production Machinery": {
+        "machine": 2, "maschine": 2, "cnc": 3, "lathe": 3, "drehbank": 3,
+        "milling": 3, "fräs": 3, "presse": 2, "conveyor": 3,
+        "förderband": 3, "robot": 2, "roboter": 2, "3d printer": 3, "3d-drucker": 3,
+    },
+    "Production - Spare Parts": {
+        "spare part": 3, "ersatzteil": 3, "replacement part": 3, "bearing": 2,
+        "gasket": 2, "dichtung": 2, "filter": 1, "belt": 1,
+    },
+    "Production - Internal Transportation": {
+        "forklift": 3, "gabelstapler": 3, "stapler": 2, "pallet truck": 3,
+        "hubwagen": 3, "agv": 3, "internal transport": 3, "innerbetrieblich": 3,
+    },
+    "Production - Production Materials": {
+        "raw material": 3, "rohstoff": 3, "rohmaterial": 3, "steel": 2, "stahl": 2,
+        "aluminium": 2, "aluminum": 2, "plastic granulate": 3, "granulat": 3,
+        "sheet metal": 3, "blech": 2, "resin": 2, "harz": 2,
+    },
+    "Production - Consumables": {
+        "consumable": 3, "verbrauchsmaterial": 3, "gloves": 2, "handschuh": 2,
+        "screws": 2, "schraube": 2, "adhesive": 2, "klebstoff": 2, "lubricant": 3,
+        "schmierstoff": 3, "welding wire": 3, "schweißdraht": 3, "tape": 1,
+    },
+    "Production - Maintenance and Repairs": {
+        "repair": 2, "reparatur": 3, "machine maintenance": 3, "instandhaltung": 3,
+        "servicing": 2, "calibration": 3, "kalibrierung": 3, "overhaul": 3,
+    },
+}
@@ -0,0 +1,246 @@
+# app/services/commodity_model.py
+
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.request import ProcurementRequest, ProcurementRequestCreate
+from app.services.commodity_keywords import COMMODITY_KEYWORDS
+
+_COMMODITY_MODEL: Optional["CommodityModel"] = None
+_COMMODITY_MODEL_MTIME: Optional[float] = None
+_COMMODITY_MODEL_LOCK = threading.Lock()
+
+MODEL_FORMAT_VERSION = 1
+NGRAM_SIZES = (2, 3, 4)
+# Character n-grams are hashed into 2**FEATURE_BITS columns (no vocabulary to store).
+FEATURE_BITS = 14
+# Rows vectorised at once; bounds the dense batch matrix to ~16 MB.
+_BATCH_ROWS = 256
+
+_HASH_BASE = np.uint64(1000003)
+_HASH_MIX = np.uint64(0x9E3779B97F4A7C15)
+_HASH_SHIFT = np.uint64(64 - FEATURE_BITS)
+
+RequestLike = Union[ProcurementRequest, ProcurementRequestCreate]
+
+
+def request_text(request: RequestLike) -> str:
+    """The text a request is classified by: title, vendor and order lines."""
+    parts = [request.title or "", request.vendor_name or ""]
+    parts.extend(line.position_description for line in request.order_lines)
+    return " ".join(" ".join(parts).casefold().split())
+
+
+def _ngram_ids(text: str) -> np.ndarray:
+    """Hashed feature ids of every character n-gram of ``text``."""
+    codes = np.frombuffer(f" {text} ".encode("utf-32-le"), dtype=np.uint32).astype(
+        np.uint64
+    )
+    ids = []
+    for size in NGRAM_SIZES:
+        count = len(codes) - size + 1
+        if count <= 0:
+            continue
+        # Polynomial hash of each window, computed for all windows at once.
+        h = np.full(count, size, dtype=np.uint64)
+        for offset in range(size):
+            h = h * _HASH_BASE + codes[offset : offset + count]
+        ids.append((h * _HASH_MIX) >> _HASH_SHIFT)
+    if not ids:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(ids).astype(np.int64)
+
+
+def _term_frequencies(ids: Sequence[np.ndarray]) -> np.ndarray:
+    """Dense sublinear term-frequency matrix (rows x features) for hashed ids."""
+    width = 1 << FEATURE_BITS
+    rows = np.repeat(np.arange(len(ids), dtype=np.int64), [len(i) for i in ids])
+    flat = rows * width + (np.concatenate(ids) if ids else np.empty(0, np.int64))
+    counts = np.bincount(flat, minlength=len(ids) * width).astype(np.float32)
+    return np.log1p(counts, out=counts).reshape(len(ids), width)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class CommodityModel:
+    """
+    Nearest-centroid commodity classifier over character n-gram TF-IDF vectors.
+
+    Each commodity group is the normalised mean of its training requests'
+    vectors; a request is assigned the group with the highest cosine
+    similarity. The model file holds the IDF weights and the centroids (as
+    float16) and is a few hundred KB compressed.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        idf: np.ndarray,
+        centroids: np.ndarray,
+        examples: int,
+        trained_at: datetime,
+    ) -> None:
+        self.labels = list(labels)
+        self.examples = examples
+        self.trained_at = trained_at
+        self._idf = idf.astype(np.float32)
+        # Transposed once so scoring is a single (rows x features) @ (features x groups).
+        self._centroids_t = np.ascontiguousarray(centroids.astype(np.float32).T)
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str]) -> "CommodityModel":
+        """Fit IDF weights and one centroid per label."""
+        if not texts or len(texts) != len(labels):
+            raise ValueError("Training needs the same, non-zero number of texts and labels.")
+        ids = [_ngram_ids(text) for text in texts]
+        width = 1 << FEATURE_BITS
+
+        df = np.zeros(width, dtype=np.int64)
+        for doc_ids in ids:
+            df[np.unique(doc_ids)] += 1
+        idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+
+        names = sorted(set(labels))
+        index = {name: i for i, name in enumerate(names)}
+        targets = np.array([index[label] for label in labels])
+        sums = np.zeros((len(names), width), dtype=np.float32)
+        for start in range(0, len(ids), _BATCH_ROWS):
+            vectors = _normalize_rows(_term_frequencies(ids[start : start + _BATCH_ROWS]) * idf)
+            np.add.at(sums, targets[start : start + _BATCH_ROWS], vectors)
+        centroids = _normalize_rows(sums)
+        return cls(names, idf, centroids, examples=len(texts), trained_at=datetime.utcnow())
+
+    def predict(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        """Return the best group and its cosine similarity for each text."""
+        results: List[Tuple[str, float]] = []
+        for start in range(0, len(texts), _BATCH_ROWS):
+            ids = [_ngram_ids(text) for text in texts[start : start + _BATCH_ROWS]]
+            vectors = _normalize_rows(_term_frequencies(ids) * self._idf)
+            scores = vectors @ self._centroids_t
+            best = scores.argmax(axis=1)
+            results.extend(
+                (self.labels[group], float(score))
+                for group, score in zip(best, scores[np.arange(len(best)), best])
+            )
+        return results
+
+    def save(self, path: str) -> None:
+        """Write the model atomically as a compressed .npz file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                np.savez_compressed(
+                    handle,
+                    format_version=np.array(MODEL_FORMAT_VERSION),
+                    feature_bits=np.array(FEATURE_BITS),
+                    ngram_sizes=np.array(NGRAM_SIZES),
+                    labels=np.array(self.labels),
+                    idf=self._idf.astype(np.float16),
+                    centroids=self._centroids_t.T.astype(np.float16),
+                    examples=np.array(self.examples),
+                    trained_at=np.array(self.trained_at.isoformat()),
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "CommodityModel":
+        """Read a model written by :meth:`save`."""
+        with np.load(path, allow_pickle=False) as data:
+            if (
+                int(data["format_version"]) != MODEL_FORMAT_VERSION
+                or int(data["feature_bits"]) != FEATURE_BITS
+                or tuple(data["ngram_sizes"]) != NGRAM_SIZES
+            ):
+                raise ValueError(f"Commodity model {path} was written by another version.")
+            return cls(
+                labels=[str(label) for label in data["labels"]],
+                idf=data["idf"],
+                centroids=data["centroids"],
+                examples=int(data["examples"]),
+                trained_at=datetime.fromisoformat(str(data["trained_at"])),
+            )
+
+
+# Every commodity group except "Other": the groups of the keyword table.
+_TRAINABLE_GROUPS = frozenset(COMMODITY_KEYWORDS)
+
+
+def train_from_requests(
+    requests: Iterable[RequestLike], min_examples: int
+) -> CommodityModel:
+    """
+    Train on every request whose commodity group is a known group.
+
+    "Other" is left out so the model never outvotes the keyword fallback
+    with a catch-all label. Groups are stored as the client sent them, so
+    free-text labels (e.g. an LLM suggestion like "IT - Software") are
+    skipped as well; the model only ever predicts valid groups. Only the
+    text and label of each request are kept, so ``requests`` can stream.
+    """
+    texts: List[str] = []
+    labels: List[str] = []
+    for request in requests:
+        group = request.commodity_group
+        if group is not None and group in _TRAINABLE_GROUPS:
+            texts.append(request_text(request))
+            labels.append(group)
+    if len(texts) < min_examples:
+        raise ValueError(
+            f"Need at least {min_examples} requests with a commodity group to train, "
+            f"found {len(texts)}."
+        )
+    return CommodityModel.train(texts, labels)
+
+
+def get_commodity_model() -> Optional[CommodityModel]:
+    """
+    Provide the process-wide model from ``settings.commodity_model_path``.
+
+    The file's mtime is checked on each call, so a model retrained by another
+    worker is picked up without a restart. Returns None when no model exists.
+    """
+    global _COMMODITY_MODEL, _COMMODITY_MODEL_MTIME
+    path = settings.commodity_model_path
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    if mtime == _COMMODITY_MODEL_MTIME:
+        return _COMMODITY_MODEL
+    with _COMMODITY_MODEL_LOCK:
+        if mtime != _COMMODITY_MODEL_MTIME:
+            try:
+                _COMMODITY_MODEL = CommodityModel.load(path)
+            except (OSError, ValueError, KeyError) as exc:
+                logging.getLogger("app").warning(
+                    "Ignoring commodity model %s: %s", path, exc
+                )
+                _COMMODITY_MODEL = None
+            _COMMODITY_MODEL_MTIME = mtime
+    return _COMMODITY_MODEL
+
+
+def set_commodity_model(model: CommodityModel) -> None:
+    """Save a freshly trained model and make it the process-wide one."""
+    global _COMMODITY_MODEL, _COMMODITY_MODEL_MTIME
+    path = settings.commodity_model_path
+    with _COMMODITY_MODEL_LOCK:
+        model.save(path)
+        _COMMODITY_MODEL = model
+        _COMMODITY_MODEL_MTIME = os.stat(path).st_mtime
@@ -1,9 +1,16 @@
 # app/services/commodity_service.py
 
-from fastapi import Depends
-
-from app.models.request import ProcurementRequestCreate
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from app.core.config import settings
+from app.services.commodity_keywords import COMMODITY_KEYWORDS
+from app.services.commodity_model import (
+    CommodityModel,
+    RequestLike,
+    get_commodity_model,
+    request_text,
+)
 
 COMMODITY_GROUPS_PROMPT = [
     "General Services - Accommodation Rentals",
@@ -60,29 +67,145 @@ COMMODITY_GROUPS_PROMPT = [
 ]
 
 
+# Title matches count double: titles name the purchase, order lines itemise it.
+TITLE_WEIGHT = 2
+VENDOR_WEIGHT = 1
+ORDER_LINE_WEIGHT = 1
+
+# Keywords this short only match whole words ("ups" must not match "upstream").
+_WHOLE_WORD_MAX_LEN = 3
+
+_Trie = Dict[str, "_Trie"]
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation that shares common prefixes (a trie).
+
+    At each text position the regex engine follows one branch per character
+    instead of trying every keyword, so the cost of a scan depends on the text
+    length and not on the number of keywords. Greedy optional groups make the
+    longest keyword win ("drucker" over "druck").
+    """
+    trie: _Trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: _Trie) -> str:
+        branches = [
+            re.escape(char) + render(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+class KeywordClassifier:
+    """
+    Weighted keyword scoring over a table of commodity group -> {keyword: weight}.
+
+    All keywords are compiled once into a single prefix-sharing regex, so
+    classifying a text is one left-to-right pass over it. Keywords match
+    anywhere, also inside German compounds ("Firmenlaptop"); only keywords
+    of up to three characters must be whole words.
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[str, int]]) -> None:
+        self._targets: Dict[str, List[Tuple[str, int]]] = {}
+        for group, words in keywords.items():
+            for word, weight in words.items():
+                self._targets.setdefault(word.lower(), []).append((group, weight))
+        self._pattern = re.compile(_trie_pattern(self._targets))
+        self._rank = {group: index for index, group in enumerate(keywords)}
+
+    def scores(self, fields: Iterable[Tuple[str, int]]) -> Dict[str, int]:
+        """Sum keyword weight x field weight per group over (text, weight) fields."""
+        totals: Dict[str, int] = {}
+        for text, field_weight in fields:
+            text = text.lower()
+            position = 0
+            while match := self._pattern.search(text, position):
+                word, start, end = match.group(), match.start(), match.end()
+                if len(word) <= _WHOLE_WORD_MAX_LEN and (
+                    (start > 0 and text[start - 1].isalnum())
+                    or (end < len(text) and text[end].isalnum())
+                ):
+                    # Not a whole word; a keyword may still start inside it.
+                    position = start + 1
+                    continue
+                for group, weight in self._targets[word]:
+                    totals[group] = totals.get(group, 0) + weight * field_weight
+                position = end
+        return totals
+
+    def classify(self, fields: Iterable[Tuple[str, int]]) -> Optional[str]:
+        """Return the best-scoring group, or None when no keyword matched."""
+        totals = self.scores(fields)
+        if not totals:
+            return None
+        # Ties go to the group listed first in the keyword table.
+        return max(totals, key=lambda group: (totals[group], -self._rank[group]))
+
+
+_KEYWORD_CLASSIFIER = KeywordClassifier(COMMODITY_KEYWORDS)
+
 
 class CommodityService:
-    """Determines commodity groups based on title, vendor, and order lines."""
-
-    def suggest_for_request(self, payload: ProcurementRequestCreate) -> str:
-        text = " ".join(
-            [
-                payload.title or "",
-                payload.vendor_name or "",
-                " ".join(line.position_description for line in payload.order_lines),
-            ]
-        ).lower()
-
-        if any(k in text for k in ["adobe", "license", "software", "saas"]):
-            return "Information Technology - Software"
-        if any(k in text for k in ["macbook", "laptop", "notebook", "hardware"]):
-            return "Information Technology - Hardware"
-        if any(k in text for k in ["campaign", "ads", "facebook", "instagram", "marketing"]):
-            return "Marketing & Advertising - Online Marketing"
+    """
+    Determines commodity groups based on title, vendor, and order lines.
+
+    A local model trained on stored requests is asked first; when it is
+    missing or not confident enough, weighted keyword rules decide.
+    """
+
+    def __init__(
+        self,
+        classifier: KeywordClassifier = _KEYWORD_CLASSIFIER,
+        model: Optional[CommodityModel] = None,
+        min_model_score: Optional[float] = None,
+    ) -> None:
+        self._classifier = classifier
+        self._model = model
+        self._min_model_score = (
+            settings.commodity_model_min_score if min_model_score is None else min_model_score
+        )
+
+    def suggest_for_request(self, payload: RequestLike) -> str:
+        return self.suggest_for_requests([payload])[0]
+
+    def suggest_for_requests(
+        self, payloads: Sequence[RequestLike]
+    ) -> List[str]:
+        """Suggest groups for several requests, scoring them with the model in one batch."""
+        predictions: Sequence[Optional[Tuple[str, float]]] = [None] * len(payloads)
+        if self._model is not None and payloads:
+            predictions = self._model.predict([request_text(p) for p in payloads])
+        return [
+            prediction[0]
+            if prediction is not None and prediction[1] >= self._min_model_score
+            else self._suggest_by_keywords(payload)
+            for payload, prediction in zip(payloads, predictions)
+        ]
 
+    def _suggest_by_keywords(self, payload: RequestLike) -> str:
+        fields = [
+            (payload.title or "", TITLE_WEIGHT),
+            (payload.vendor_name or "", VENDOR_WEIGHT),
+        ]
+        fields.extend(
+            (line.position_description, ORDER_LINE_WEIGHT) for line in payload.order_lines
+        )
         # Fallback
-        return "Other"
+        return self._classifier.classify(fields) or "Other"
 
 
 def get_commodity_service() -> CommodityService:
-    return CommodityService()
+    return CommodityService(model=get_commodity_model())
@@ -0,0 +1,176 @@
+# app/services/offer_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from app.clients.openai_client import OFFER_EXTRACTION_MODEL, OFFER_PROMPT_VERSION
+from app.core.config import settings
+
+_OFFER_CACHE: Optional["OfferExtractionCache"] = None
+
+
+def build_cache_key(
+    content_digest: str,
+    model: str = OFFER_EXTRACTION_MODEL,
+    prompt_version: str = OFFER_PROMPT_VERSION,
+) -> str:
+    """Combine the SHA-256 of the PDF with the model/prompt version into one key."""
+    return hashlib.sha256(
+        f"{content_digest}:{model}:{prompt_version}".encode("utf-8")
+    ).hexdigest()
+
+
+class OfferExtractionCache:
+    """
+    Two-tier, content-addressed cache for offer extraction results.
+
+    - Memory tier: LRU bounded by ``max_entries`` with per-entry TTL.
+    - Disk tier (optional): one JSON file per key below ``directory`` that
+      survives restarts; entries found on disk are promoted into memory.
+
+    Values are the JSON-serialisable dump of an OfferExtractionResult.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 7 * 24 * 3600,
+        directory: Optional[str] = None,
+    ) -> None:
+        self._max_entries = max(1, max_entries)
+        self._ttl = ttl_seconds
+        self._dir = Path(directory) if directory else None
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("app.offers")
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for ``key`` or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self._ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+
+        disk_entry = self._read_disk(key, now)
+        with self._lock:
+            if disk_entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, disk_entry[0], disk_entry[1])
+            return disk_entry[1]
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store ``value`` in memory and, if configured, on disk."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+        self._write_disk(key, now, value)
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = self.evictions = 0
+        if self._dir is not None:
+            for path in self._dir.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._memory),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "disk_enabled": self._dir is not None,
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, stored_at: float, value: Dict[str, Any]) -> None:
+        # Caller must hold self._lock.
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _path_for(self, key: str) -> Path:
+        assert self._dir is not None
+        return self._dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if self._dir is None:
+            return None
+        path = self._path_for(key)
+        try:
+            with path.open("r", encoding="utf-8") as fh:
+                payload = json.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            self._logger.warning("Ignoring unreadable cache file %s: %s", path, exc)
+            return None
+
+        stored_at = float(payload.get("stored_at", 0))
+        if now - stored_at > self._ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return stored_at, payload.get("value") or {}
+
+    def _write_disk(self, key: str, stored_at: float, value: Dict[str, Any]) -> None:
+        if self._dir is None:
+            return
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so concurrent readers never see partial JSON.
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"stored_at": stored_at, "value": value}, fh)
+            os.replace(tmp_name, path)
+        except OSError as exc:
+            self._logger.warning("Failed to write cache file %s: %s", path, exc)
+
+
+def get_offer_cache() -> Optional[OfferExtractionCache]:
+    """Provide the process-wide extraction cache, or None if caching is disabled."""
+    global _OFFER_CACHE
+    if not settings.offer_cache_enabled:
+        return None
+    if _OFFER_CACHE is None:
+        _OFFER_CACHE = OfferExtractionCache(
+            max_entries=settings.offer_cache_max_entries,
+            ttl_seconds=settings.offer_cache_ttl_seconds,
+            directory=settings.offer_cache_dir,
+        )
+    return _OFFER_CACHE
@@ -0,0 +1,138 @@
+# app/services/offer_chunking.py
+
+import io
+import logging
+import re
+from collections import Counter
+from decimal import Decimal
+from typing import List, Optional, Sequence, Tuple
+
+from pypdf import PdfReader, PdfWriter
+
+from app.core.uploads import SpooledUpload
+from app.models.offer import OfferExtractionResult
+from app.models.order_line import OrderLine
+from app.services.pdf_text import render_pages
+
+logger = logging.getLogger("app.offers")
+
+_TOLERANCE = Decimal("0.01")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+PageRange = Tuple[int, int]  # zero-based, end exclusive
+
+
+def page_groups(page_count: int, pages_per_chunk: int) -> List[PageRange]:
+    """Split ``page_count`` pages into consecutive groups of ``pages_per_chunk``."""
+    size = max(1, pages_per_chunk)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def count_pdf_pages(upload: SpooledUpload) -> int:
+    with upload.open_view() as view:
+        return len(PdfReader(view).pages)
+
+
+def split_pdf(upload: SpooledUpload, groups: Sequence[PageRange]) -> List[bytes]:
+    """Write each page group of the upload into its own small PDF."""
+    parts: List[bytes] = []
+    with upload.open_view() as view:
+        reader = PdfReader(view)
+        for start, end in groups:
+            writer = PdfWriter()
+            for index in range(start, end):
+                writer.add_page(reader.pages[index])
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            parts.append(buffer.getvalue())
+    return parts
+
+
+def chunk_note(group: PageRange, page_count: int) -> str:
+    """Tell the model where a page group sits in the offer and which total to report."""
+    start, end = group
+    return (
+        f"(Excerpt: pages {start + 1}-{end} of {page_count}. Extract the order lines "
+        "shown on these pages; header fields may be on other pages. Set total_cost "
+        "only if the overall offer total is printed on these pages, otherwise null: "
+        "do not add up the lines, and page subtotals or carry-overs (Übertrag) are "
+        "not the offer total.)"
+    )
+
+
+def render_chunk(pages: Sequence[str], group: PageRange) -> str:
+    """Render a page group of the text layer with its chunk_note."""
+    start, end = group
+    note = chunk_note(group, len(pages))
+    return f"{note}\n{render_pages(list(pages[start:end]), first_page=start + 1)}"
+
+
+def _line_key(line: OrderLine) -> Tuple[str, Decimal, Decimal, Decimal]:
+    description = _WHITESPACE_RE.sub(" ", line.position_description).strip().casefold()
+    return description, line.unit_price, line.amount, line.total_price
+
+
+def _boundary_overlap(previous: Sequence[object], current: Sequence[object]) -> int:
+    """Length of the longest run that ends ``previous`` and starts ``current``."""
+    for size in range(min(len(previous), len(current)), 0, -1):
+        if list(previous[-size:]) == list(current[:size]):
+            return size
+    return 0
+
+
+def merge_chunk_results(chunks: Sequence[OfferExtractionResult]) -> OfferExtractionResult:
+    """
+    Combine per-chunk extractions (in page order) into one offer.
+
+    - Header fields come from the first chunk that has them.
+    - Order lines are concatenated. Lines a chunk opens with that repeat the
+      lines the previous chunk ended with (same description, price, amount
+      and total) are carry-overs across the page break and are dropped; other
+      repeats are separate positions and kept.
+    - total_cost is reconciled against the sum of the merged lines: an explicit
+      total from the totals page (last chunk) or header (first chunk) is used
+      when it matches, otherwise the totals page wins and a warning is logged.
+    """
+
+    def first(field: str) -> Optional[str]:
+        return next((getattr(c, field) for c in chunks if getattr(c, field)), None)
+
+    order_lines: List[OrderLine] = []
+    previous: List[Tuple[str, Decimal, Decimal, Decimal]] = []
+    for chunk in chunks:
+        keys = [_line_key(line) for line in chunk.order_lines]
+        carried = _boundary_overlap(previous, keys)
+        order_lines.extend(chunk.order_lines[carried:])
+        previous = keys
+
+    lines_total = sum((line.total_price for line in order_lines), Decimal("0"))
+    declared = [c.total_cost for c in chunks if c.total_cost is not None]
+
+    total_cost: Optional[Decimal]
+    if not declared:
+        total_cost = lines_total if order_lines else None
+    elif any(abs(value - lines_total) <= _TOLERANCE for value in (declared[-1], declared[0])):
+        total_cost = lines_total
+    else:
+        logger.warning(
+            "Chunked extraction: line items sum to %s but the offer states %s",
+            lines_total,
+            declared[-1],
+        )
+        total_cost = declared[-1]
+
+    suggestions = Counter(
+        c.commodity_group_suggestion for c in chunks if c.commodity_group_suggestion
+    )
+    return OfferExtractionResult(
+        requestor_name=first("requestor_name"),
+        vendor_name=first("vendor_name"),
+        vendor_vat_id=first("vendor_vat_id"),
+        department=first("department"),
+        title=first("title"),
+        order_lines=order_lines,
+        total_cost=total_cost,
+        commodity_group_suggestion=(
+            suggestions.most_common(1)[0][0] if suggestions else None
+        ),
+    )
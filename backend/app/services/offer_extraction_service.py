@@ -1,42 +1,243 @@
 # app/services/offer_extraction_service.py
 
+import asyncio
 import logging
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 
 import anyio
 from fastapi import UploadFile
 
-from app.clients.openai_client import OpenAIClient
+from app.clients.openai_client import OpenAIClient, get_openai_client
+from app.core.config import settings
+from app.core.metrics import time_stage
+from app.core.uploads import SpooledUpload, spool_upload
 from app.models.offer import OfferExtractionResult
 from app.models.order_line import OrderLine
+from app.services.offer_cache import (
+    OfferExtractionCache,
+    build_cache_key,
+    get_offer_cache,
+)
+from app.services.offer_chunking import (
+    chunk_note,
+    count_pdf_pages,
+    merge_chunk_results,
+    page_groups,
+    render_chunk,
+    split_pdf,
+)
+from app.services.offer_rule_parser import RuleBasedOfferParser
+from app.services.pdf_text import extract_page_texts, has_text_layer, render_pages
 
 
 class OfferExtractionService:
     """Extract structured offer data from uploaded PDF documents."""
 
-    def __init__(self, openai_client: OpenAIClient) -> None:
+    def __init__(
+        self,
+        openai_client: OpenAIClient,
+        cache: Optional[OfferExtractionCache] = None,
+        rule_parser: Optional[RuleBasedOfferParser] = None,
+    ) -> None:
         self._openai = openai_client
+        self._cache = cache
+        self._rule_parser = rule_parser
         self._logger = logging.getLogger("app.offers")
 
-    async def extract(self, file: UploadFile) -> OfferExtractionResult:
-        """Read PDF content, call OpenAI on the whole file, and map the response."""
-        raw_bytes = await file.read()
-        self._logger.debug(
-            "Read %s bytes from uploaded file %s", len(raw_bytes), file.filename
+    async def extract(
+        self, file: UploadFile, use_cache: bool = True
+    ) -> OfferExtractionResult:
+        """Read PDF content, call OpenAI on its text (or the whole file), and map the response."""
+        upload = await spool_upload(
+            file,
+            max_bytes=settings.offer_upload_max_bytes,
+            spool_threshold=settings.offer_upload_spool_bytes,
         )
+        self._logger.debug("Read %s bytes from uploaded file %s", upload.size, file.filename)
+        try:
+            return await self.extract_upload(upload, use_cache=use_cache)
+        finally:
+            upload.close()
 
-        if not raw_bytes:
-            self._logger.warning("Uploaded file %s is empty", file.filename)
+    async def extract_bytes(
+        self, raw_bytes: bytes, filename: str, use_cache: bool = True
+    ) -> OfferExtractionResult:
+        """Extract an offer from PDF bytes that are already in memory."""
+        upload = SpooledUpload.from_bytes(raw_bytes, filename)
+        try:
+            return await self.extract_upload(upload, use_cache=use_cache)
+        finally:
+            upload.close()
+
+    async def extract_upload(
+        self, upload: SpooledUpload, use_cache: bool = True
+    ) -> OfferExtractionResult:
+        """Extract an offer from a spooled upload (used by background jobs)."""
+        filename = upload.filename
+        if not upload.size:
+            self._logger.warning("Uploaded file %s is empty", filename)
             return OfferExtractionResult(order_lines=[])
 
-        # Run the blocking OpenAI call in a worker thread
-        raw_dict = await anyio.to_thread.run_sync(
-            self._openai.extract_offer_from_pdf,
-            raw_bytes,
-            file.filename or "offer.pdf",
+        cache_key: Optional[str] = None
+        if self._cache is not None:
+            cache_key = build_cache_key(upload.sha256)
+            if use_cache:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._logger.info("Offer extraction cache hit for file %s", filename)
+                    return OfferExtractionResult.model_validate(cached)
+
+        pages: Optional[List[str]] = None
+        if settings.offer_text_layer_enabled:
+            # pdfplumber is CPU-bound, keep it off the event loop.
+            with time_stage("text_layer"):
+                pages = await anyio.to_thread.run_sync(self._extract_pdf_pages, upload)
+        offer_text = render_pages(pages) if pages is not None else None
+
+        result = None
+        if offer_text is not None and self._rule_parser is not None:
+            with time_stage("rule_parse"):
+                result = self._rule_parser.parse(offer_text)
+            if result is not None:
+                self._logger.info("Rule parser handled file %s without the LLM", filename)
+
+        if result is None:
+            page_count = await self._page_count(upload, pages)
+            if settings.offer_chunking_enabled and page_count > settings.offer_chunk_min_pages:
+                result = await self._extract_chunked(upload, pages, page_count)
+            else:
+                if offer_text is not None and len(offer_text) > settings.offer_text_max_chars:
+                    self._logger.debug(
+                        "Text layer too long (%s chars), sending file", len(offer_text)
+                    )
+                    offer_text = None
+                if offer_text is not None:
+                    raw_dict = await self._openai.extract_offer(offer_text, filename)
+                else:
+                    # Scanned (or unreadable) document: let the model read the file itself.
+                    raw_dict = await self._openai.extract_offer_from_pdf(upload, filename)
+                self._logger.debug("Raw offer extraction result: %s", raw_dict)
+                result = self._map_result(raw_dict)
+
+        if self._cache is not None and cache_key is not None:
+            # Bypassed lookups still refresh the entry with the fresh result.
+            self._cache.set(cache_key, result.model_dump(mode="json"))
+
+        self._logger.info(
+            "Offer extraction completed with %s order lines for file %s",
+            len(result.order_lines),
+            filename,
+        )
+        return result
+
+    async def extract_many(
+        self,
+        uploads: Sequence[SpooledUpload],
+        concurrency: int,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Tuple[int, Union[OfferExtractionResult, Exception]]]:
+        """
+        Extract several uploads concurrently, yielding (index, result) in completion order.
+
+        At most ``concurrency`` extractions run at once. A failing document yields
+        its exception instead of aborting the others.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        finished: asyncio.Queue[Tuple[int, Union[OfferExtractionResult, Exception]]] = (
+            asyncio.Queue()
         )
-        self._logger.debug("Raw offer extraction result: %s", raw_dict)
 
+        async def run(index: int, upload: SpooledUpload) -> None:
+            async with semaphore:
+                try:
+                    outcome: Union[OfferExtractionResult, Exception] = (
+                        await self.extract_upload(upload, use_cache=use_cache)
+                    )
+                except Exception as exc:  # noqa: BLE001
+                    self._logger.exception("Failed to parse offer %s in batch", upload.filename)
+                    outcome = exc
+            await finished.put((index, outcome))
+
+        tasks = [asyncio.create_task(run(i, upload)) for i, upload in enumerate(uploads)]
+        try:
+            for _ in tasks:
+                yield await finished.get()
+        finally:
+            # Stop outstanding work if the consumer goes away early.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _extract_chunked(
+        self, upload: SpooledUpload, pages: Optional[List[str]], page_count: int
+    ) -> OfferExtractionResult:
+        """
+        Extract a long offer as page groups in parallel and merge the results.
+
+        The shared client's semaphore bounds how many chunk calls run at once,
+        so latency follows the slowest chunk rather than the page count.
+        """
+        groups = page_groups(page_count, settings.offer_chunk_pages)
+        self._logger.info(
+            "Extracting %s-page file %s in %s chunks", page_count, upload.filename, len(groups)
+        )
+        if pages is not None:
+            calls = [
+                self._openai.extract_offer(render_chunk(pages, group), upload.filename)
+                for group in groups
+            ]
+        else:
+            parts = await anyio.to_thread.run_sync(split_pdf, upload, groups)
+            stem = upload.filename.rsplit(".", 1)[0]
+            calls = [
+                self._openai.extract_offer_from_pdf(
+                    part,
+                    f"{stem}_p{start + 1}-{end}.pdf",
+                    note=chunk_note((start, end), page_count),
+                )
+                for part, (start, end) in zip(parts, groups)
+            ]
+        # One failed chunk fails the offer; its siblings are cancelled, not awaited.
+        tasks = [asyncio.create_task(call) for call in calls]
+        try:
+            raw_dicts = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return merge_chunk_results([self._map_result(raw) for raw in raw_dicts])
+
+    async def _page_count(self, upload: SpooledUpload, pages: Optional[List[str]]) -> int:
+        if pages is not None:
+            return len(pages)
+        if not settings.offer_chunking_enabled:
+            return 0
+        try:
+            return await anyio.to_thread.run_sync(count_pdf_pages, upload)
+        except Exception as exc:  # noqa: BLE001
+            self._logger.warning("Could not count PDF pages: %s", exc)
+            return 0
+
+    def _extract_pdf_pages(self, upload: SpooledUpload) -> Optional[List[str]]:
+        """Return compact page texts if the PDF has a usable text layer, else None."""
+        try:
+            with upload.open_view() as view:
+                pages = extract_page_texts(view)
+        except Exception as exc:  # noqa: BLE001
+            self._logger.warning("Could not read PDF text layer: %s", exc)
+            return None
+
+        if not has_text_layer(pages, settings.offer_text_min_chars_per_page):
+            self._logger.debug("No usable text layer found (%s pages)", len(pages))
+            return None
+        return pages
+
+    def _map_result(self, raw_dict: Dict[str, Any]) -> OfferExtractionResult:
+        """Normalise the raw LLM JSON into an OfferExtractionResult."""
+        with time_stage("order_line_normalization"):
+            return self._normalize(raw_dict)
+
+    def _normalize(self, raw_dict: Dict[str, Any]) -> OfferExtractionResult:
         order_lines_raw = raw_dict.get("order_lines") or []
         order_lines: List[OrderLine] = []
 
@@ -97,16 +298,13 @@ class OfferExtractionService:
             total_cost=raw_dict.get("total_cost"),
             commodity_group_suggestion=raw_dict.get("commodity_group_suggestion"),
         )
-
-        self._logger.info(
-            "Offer extraction completed with %s order lines for file %s",
-            len(order_lines),
-            file.filename,
-        )
         return result
 
 
 def get_offer_extraction_service() -> OfferExtractionService:
-    """Provide OfferExtractionService with a configured OpenAI client."""
-    client = OpenAIClient()
-    return OfferExtractionService(openai_client=client)
+    """Provide OfferExtractionService backed by the shared OpenAI client."""
+    return OfferExtractionService(
+        openai_client=get_openai_client(),
+        cache=get_offer_cache(),
+        rule_parser=RuleBasedOfferParser() if settings.offer_rule_parser_enabled else None,
+    )
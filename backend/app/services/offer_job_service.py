@@ -0,0 +1,257 @@
+# app/services/offer_job_service.py
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Callable, Deque, List, Optional
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.uploads import SpooledUpload
+from app.models.offer import OfferExtractionJob, OfferJobStatus
+from app.services.offer_extraction_service import (
+    OfferExtractionService,
+    get_offer_extraction_service,
+)
+
+_OFFER_JOB_MANAGER: Optional["OfferJobManager"] = None
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the job queue has no room for another submission."""
+
+
+@dataclass
+class _JobEntry:
+    job: OfferExtractionJob
+    upload: Optional[SpooledUpload]
+    use_cache: bool
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+    finished_monotonic: Optional[float] = None
+
+
+class OfferJobManager:
+    """
+    Runs offer extractions in the background on a bounded pool of workers.
+
+    Submissions are queued (bounded by ``max_queue``) and picked up by
+    ``workers`` asyncio tasks, so the number of extractions running at once
+    stays fixed no matter how many uploads arrive. Finished jobs are kept for
+    ``ttl_seconds`` so clients can poll or stream their result; a background
+    task drops expired ones every ``purge_interval`` seconds.
+
+    Jobs live in this process only: with several server workers a poll that
+    lands on another worker gets a 404, so offer parsing needs a single
+    worker. Jobs interrupted by ``stop()`` keep their upload and are
+    requeued by the next ``start()``.
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], OfferExtractionService],
+        workers: int = 4,
+        max_queue: int = 100,
+        ttl_seconds: float = 3600,
+        purge_interval: float = 60,
+    ) -> None:
+        self._service_factory = service_factory
+        self._worker_count = max(1, workers)
+        self._max_queue = max_queue
+        self._ttl = ttl_seconds
+        self._purge_interval = purge_interval
+        self._jobs: "OrderedDict[str, _JobEntry]" = OrderedDict()
+        # Job ids in the order they finished, i.e. in the order they expire.
+        self._finished: Deque[str] = deque()
+        self._queue: Optional[asyncio.Queue[str]] = None
+        self._workers: List[asyncio.Task[None]] = []
+        self._purger_task: Optional[asyncio.Task[None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._logger = logging.getLogger("app.offers")
+
+    async def start(self) -> None:
+        """Spawn the worker tasks on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"offer-job-worker-{i}")
+            for i in range(self._worker_count)
+        ]
+        self._purger_task = asyncio.create_task(self._purger(), name="offer-job-purger")
+        # Jobs left unfinished by workers on a previous loop are requeued.
+        for job_id, entry in self._jobs.items():
+            if not entry.job.is_finished:
+                entry.job = entry.job.model_copy(update={"status": OfferJobStatus.QUEUED})
+                entry.changed = asyncio.Event()
+                self._queue.put_nowait(job_id)
+        self._logger.info("Started %s offer job workers", self._worker_count)
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks and wait for them to exit."""
+        workers, self._workers = self._workers, []
+        if self._purger_task is not None:
+            workers.append(self._purger_task)
+            self._purger_task = None
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._loop = None
+
+    async def submit(
+        self, upload: SpooledUpload, use_cache: bool = True
+    ) -> OfferExtractionJob:
+        """
+        Queue an extraction and return the job immediately.
+
+        The manager takes ownership of ``upload`` and closes it once the job
+        has run; on JobQueueFullError the caller still owns it.
+        """
+        await self.start()
+        assert self._queue is not None
+        self._purge_expired()
+
+        job = OfferExtractionJob(id=uuid4().hex, filename=upload.filename)
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull as exc:
+            raise JobQueueFullError("Offer extraction queue is full.") from exc
+        self._jobs[job.id] = _JobEntry(job=job, upload=upload, use_cache=use_cache)
+        self._logger.debug("Queued offer job %s for file %s", job.id, upload.filename)
+        return job
+
+    def get(self, job_id: str) -> Optional[OfferExtractionJob]:
+        """Return the current snapshot of a job, or None if unknown/expired."""
+        entry = self._jobs.get(job_id)
+        return entry.job if entry is not None else None
+
+    async def wait(
+        self, job_id: str, timeout: Optional[float] = None
+    ) -> Optional[OfferExtractionJob]:
+        """Wait up to ``timeout`` seconds (forever if None) for a job to finish."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            entry = self._jobs.get(job_id)
+            if entry is None or entry.job.is_finished:
+                return entry.job if entry is not None else None
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return entry.job
+            try:
+                await asyncio.wait_for(entry.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return entry.job
+
+    async def watch(
+        self, job_id: str, heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[OfferExtractionJob]]:
+        """
+        Yield the job on every state change until it finishes.
+
+        ``None`` is yielded when ``heartbeat`` seconds pass without a change so
+        streaming callers can keep idle connections alive.
+        """
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return
+        last_status: Optional[OfferJobStatus] = None
+        while True:
+            if entry.job.status != last_status:
+                last_status = entry.job.status
+                yield entry.job
+                if entry.job.is_finished:
+                    return
+                continue
+            try:
+                await asyncio.wait_for(entry.changed.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                yield None
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job_id = await queue.get()
+            try:
+                entry = self._jobs.get(job_id)
+                if entry is not None and entry.job.status == OfferJobStatus.QUEUED:
+                    await self._run(entry)
+            finally:
+                queue.task_done()
+
+    async def _run(self, entry: _JobEntry) -> None:
+        job = entry.job
+        self._transition(entry, status=OfferJobStatus.RUNNING, started_at=datetime.utcnow())
+        try:
+            assert entry.upload is not None
+            service = self._service_factory()
+            result = await service.extract_upload(entry.upload, use_cache=entry.use_cache)
+        except asyncio.CancelledError:
+            # stop() cancelled the worker: the job stays unfinished and keeps
+            # its upload, so the next start() can requeue it.
+            raise
+        except Exception:  # noqa: BLE001
+            self._logger.exception("Offer job %s failed for file %s", job.id, job.filename)
+            self._transition(
+                entry,
+                status=OfferJobStatus.FAILED,
+                error="Failed to parse offer document.",
+                finished_at=datetime.utcnow(),
+            )
+        else:
+            self._transition(
+                entry,
+                status=OfferJobStatus.SUCCEEDED,
+                result=result,
+                finished_at=datetime.utcnow(),
+            )
+        # The upload is no longer needed once the job has run.
+        if entry.upload is not None:
+            entry.upload.close()
+            entry.upload = None
+        entry.finished_monotonic = time.monotonic()
+        self._finished.append(job.id)
+
+    def _transition(self, entry: _JobEntry, **changes: object) -> None:
+        entry.job = entry.job.model_copy(update=changes)
+        # Wake everyone waiting on the old event and arm a fresh one.
+        changed, entry.changed = entry.changed, asyncio.Event()
+        changed.set()
+
+    async def _purger(self) -> None:
+        while True:
+            await asyncio.sleep(self._purge_interval)
+            self._purge_expired()
+
+    def _purge_expired(self) -> None:
+        # Unfinished jobs are never in the deque, so they cannot hold back
+        # the expiry of jobs that finished after they were submitted.
+        now = time.monotonic()
+        while self._finished:
+            entry = self._jobs.get(self._finished[0])
+            if (
+                entry is not None
+                and entry.finished_monotonic is not None
+                and now - entry.finished_monotonic < self._ttl
+            ):
+                break
+            job_id = self._finished.popleft()
+            self._jobs.pop(job_id, None)
+
+
+def get_offer_job_manager() -> OfferJobManager:
+    """Provide the process-wide job manager."""
+    global _OFFER_JOB_MANAGER
+    if _OFFER_JOB_MANAGER is None:
+        _OFFER_JOB_MANAGER = OfferJobManager(
+            service_factory=get_offer_extraction_service,
+            workers=settings.offer_job_workers,
+            max_queue=settings.offer_job_queue_size,
+            ttl_seconds=settings.offer_job_ttl_seconds,
+            purge_interval=settings.offer_job_purge_interval_seconds,
+        )
+    return _OFFER_JOB_MANAGER
@@ -0,0 +1,388 @@
+# app/services/offer_rule_parser.py
+
+import logging
+import re
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import List, Optional
+
+from app.models.offer import OfferExtractionResult
+from app.models.order_line import OrderLine
+
+_CENT = Decimal("0.01")
+_TOLERANCE = Decimal("0.01")
+_DEFAULT_UNIT = "Stk"
+
+# "1.467,61" (German), "1,467.61" (English) or "715,52"
+_MONEY = r"\d{1,3}(?:\.\d{3})+,\d{2}|\d{1,3}(?:,\d{3})+\.\d{2}|\d+[.,]\d{2}"
+# Labelled values may also be plain integers ("Total: €1500")
+_LOOSE_MONEY = rf"(?:{_MONEY}|\d+)"
+_QTY = r"\d+(?:[.,]\d{1,3})?"
+_UNIT = r"[A-Za-zÄÖÜäöü][\w.²³/]{0,11}"
+_POS = r"\d+(?:\.\d+)*[a-z]?\.?"
+
+# "<pos> <description> <qty> [unit] <unit price> [discount%] <total>"
+_ROW_TRAILING_QTY = re.compile(
+    rf"^(?:{_POS}\s+)?(?P<desc>.+?)\s+(?P<qty>{_QTY})(?:\s+(?P<unit>{_UNIT}))?"
+    rf"\s+€?\s?(?P<price>{_MONEY})\s?€?"
+    rf"(?:\s+(?P<discount>[-+]?\d+(?:[.,]\d+)?)\s?%)?"
+    rf"\s+€?\s?(?P<total>{_MONEY})\s?€?$"
+)
+# "<pos> <qty> [unit] <description> <unit price> <total> [tax code]"
+_ROW_LEADING_QTY = re.compile(
+    rf"^{_POS}\s+(?P<qty>\d+[.,]\d{{1,3}})\s+(?P<desc>.+?)"
+    rf"\s+€?\s?(?P<price>{_MONEY})\s?€?\s+€?\s?(?P<total>{_MONEY})\s?€?\s?\d{{0,2}}$"
+)
+# "<pos> <qty> [article no] <description> <unit price> E.P. [tax code]": a row
+# priced per unit only, as offers print alternatives to the previous position
+_ROW_UNIT_PRICE_ONLY = re.compile(
+    rf"^{_POS}\s+(?P<qty>\d+[.,]\d{{1,3}})\s+(?P<desc>.+?)"
+    rf"\s+€?\s?(?P<price>{_MONEY})\s?€?\s+E\.\s?P\.\s?\d{{0,2}}$"
+)
+# "Alternativ zu vorstehender Position", "4 Alternativ: Logo vertikal", "(Alt.)"
+_ALTERNATIVE = re.compile(rf"^(?:{_POS}\s+)?\(?(?:Alternativ|Alt\.)", re.IGNORECASE)
+_SHIPPING = re.compile(
+    rf"^(?P<desc>Versandkosten|Versand|Fracht(?:kosten)?|Shipping(?: costs?)?|Delivery)"
+    rf"(?:\s+(?:netto|net))?:?\s+€?\s?(?P<total>{_LOOSE_MONEY})\s?€?$",
+    re.IGNORECASE,
+)
+_NET_TOTAL = re.compile(
+    rf"^(?:Positionen netto|Nettosumme|Summe netto|Gesamt netto|Zwischensumme|"
+    rf"Subtotal|Net total|Total net|Total Offer Cost|Offer total)"
+    rf"(?:\s*\(EUR\))?:?\s+€?\s?(?P<total>{_LOOSE_MONEY})\s?€?$",
+    re.IGNORECASE,
+)
+_TOTAL_KEYWORDS = re.compile(
+    r"^(?:Positionen|Versandkosten|Summe|Gesamt|Netto|Zwischensumme|Endsumme|"
+    r"Übertrag|Seitensumme|Umsatzsteuer|MwSt|USt|Subtotal|Total|VAT)\b",
+    re.IGNORECASE,
+)
+
+_LABEL = re.compile(r"^(?P<label>[A-Za-zÄÖÜäöü ()/.-]+?):\s*(?P<value>.+)$")
+_ITEM_LABELS = {"product", "produkt", "item", "artikel", "position", "leistung"}
+_PRICE_LABELS = {"unit price", "einzelpreis", "stückpreis", "preis/einh", "price"}
+_QTY_LABELS = {"quantity", "qty", "menge", "anzahl"}
+_UNIT_LABELS = {"unit", "einheit"}
+_LINE_TOTAL_LABELS = {"total", "gesamt", "gesamtpreis", "line total"}
+
+_VAT_LABELLED = re.compile(
+    r"(?:USt\.?-?\s?Id(?:Nr|-?Nr\.?)?|USt\.?-ID|UID|Id-Nr|VAT(?: ID)?|"
+    r"Umsatzsteuer-Identifikationsnummer)[^:\n]{0,12}:?\s*(?P<vat>DE\s?\d{3}\s?\d{3}\s?\d{3})\b",
+    re.IGNORECASE,
+)
+_VAT_ANY = re.compile(r"\b(?P<vat>DE\s?\d{3}\s?\d{3}\s?\d{3})\b")
+
+_LEGAL_FORM = r"(?:GmbH(?: & Co\. KG)?|AG|UG|KG|OHG|SE|e\.K\.|Ltd\.?|Inc\.?|LLC)"
+_VENDOR_LABEL = re.compile(
+    r"^(?:Vendor(?: Name)?|Lieferant|Anbieter|Supplier)\s*:\s*(?P<name>.+)$", re.IGNORECASE
+)
+# Sender line above the address window: "Dream in Green GmbH | Street 1 | 12345 City"
+_SENDER_LINE = re.compile(rf"^(?P<name>[^|\n]{{2,60}}?\b{_LEGAL_FORM})\s*[|,]\s*\S")
+# Company footer: "Gärtner Gregg Tel. 02596/2070 USt.-IdNr.: ..."
+_FOOTER_LINE = re.compile(
+    r"^(?P<name>[A-ZÄÖÜ][^\d|\n]{2,60}?)\s+(?:Tel\.?|Telefon)\s?:?\s*[+\d(]"
+)
+_FOOTER_HINTS = re.compile(r"USt|Steuer|IBAN|Amtsgericht|HRB|Handelsregister", re.IGNORECASE)
+
+_REQUESTOR = re.compile(
+    r"(?:^|\b)(?:Herr|Frau|Mr\.?|Mrs\.?|Ms\.?|Attn\.?:?|z\.\s?Hd\.?)\s+"
+    r"(?P<name>[A-ZÄÖÜ][a-zäöüß]+(?:-[A-ZÄÖÜ][a-zäöüß]+)?\s+[A-ZÄÖÜ][a-zäöüß]+(?:-[A-ZÄÖÜ][a-zäöüß]+)?)"
+)
+_DEPARTMENT = re.compile(
+    r"^(?:Offered to|Department|Abteilung)\s*:\s*(?P<dept>.+?)(?:\s+Department)?$",
+    re.IGNORECASE,
+)
+
+
+def parse_decimal(raw: str) -> Optional[Decimal]:
+    """Parse German ("1.467,61") or English ("1,467.61") formatted numbers."""
+    value = raw.strip().lstrip("€").rstrip("€").strip()
+    if not value:
+        return None
+    if "," in value and "." in value:
+        if value.rfind(",") > value.rfind("."):
+            value = value.replace(".", "").replace(",", ".")
+        else:
+            value = value.replace(",", "")
+    elif "," in value:
+        value = value.replace(",", ".")
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return None
+
+
+@dataclass
+class _ParsedLine:
+    description: str
+    unit_price: Decimal
+    amount: Decimal
+    unit: str
+    total: Decimal
+    # Alternatives are listed as order lines but not counted in the total.
+    alternative: bool = False
+
+
+class RuleBasedOfferParser:
+    """
+    Deterministic parser for offers with a rigid, machine-generated layout.
+
+    Works on the text layer produced by app.services.pdf_text and only returns a
+    result when it can verify itself:
+    - every line has a printed total equal to unit_price * amount (after any
+      line discount),
+    - the item totals add up to an explicit net subtotal / offer total,
+    - a vendor name was found,
+    - every alternative position is a marked unit-price-only ("E.P.") row.
+    Otherwise it returns None and the caller falls back to the LLM.
+
+    Alternatives become order lines of their own, like the LLM prompt asks,
+    and are left out of the totals.
+    """
+
+    def __init__(self) -> None:
+        self._logger = logging.getLogger("app.offers")
+
+    def parse(self, text: str) -> Optional[OfferExtractionResult]:
+        lines = [
+            line.strip()
+            for line in text.splitlines()
+            if line.strip() and not line.startswith("--- Page ")
+        ]
+
+        labelled = self._parse_labelled_items(lines)
+        if labelled is None:
+            self._logger.debug("Rule parser: labelled item without a line total")
+            return None
+        items = labelled or self._parse_table_rows(lines)
+        if items is None:
+            self._logger.debug("Rule parser: alternative position it cannot verify")
+            return None
+        if not items:
+            self._logger.debug("Rule parser: no order lines recognised")
+            return None
+
+        for item in items:
+            expected = (item.unit_price * item.amount).quantize(_CENT, ROUND_HALF_UP)
+            if abs(expected - item.total) > _TOLERANCE:
+                self._logger.debug(
+                    "Rule parser: line total mismatch for '%s' (%s * %s != %s)",
+                    item.description,
+                    item.unit_price,
+                    item.amount,
+                    item.total,
+                )
+                return None
+
+        counted = [item for item in items if not item.alternative]
+        items_total = sum((item.total for item in counted), Decimal("0"))
+        declared_total = self._find_net_total(lines)
+        if declared_total is None or abs(declared_total - items_total) > _TOLERANCE:
+            self._logger.debug(
+                "Rule parser: items sum %s does not match declared total %s",
+                items_total,
+                declared_total,
+            )
+            return None
+
+        vendor_name = self._find_vendor(lines)
+        if not vendor_name:
+            self._logger.debug("Rule parser: vendor name not found")
+            return None
+
+        shipping = self._parse_shipping(lines)
+        items.extend(shipping)
+        total_cost = items_total + sum((item.total for item in shipping), Decimal("0"))
+
+        try:
+            order_lines = [
+                OrderLine(
+                    position_description=item.description,
+                    unit_price=item.unit_price,
+                    amount=item.amount,
+                    unit=item.unit,
+                    total_price=item.total,
+                )
+                for item in items
+            ]
+        except ValueError as exc:
+            self._logger.debug("Rule parser: order line validation failed: %s", exc)
+            return None
+
+        return OfferExtractionResult(
+            requestor_name=self._find_requestor(lines),
+            vendor_name=vendor_name,
+            vendor_vat_id=self._find_vat_id(text),
+            department=self._find_department(lines),
+            title=counted[0].description[:120],
+            order_lines=order_lines,
+            total_cost=total_cost,
+            commodity_group_suggestion=None,
+        )
+
+    def _parse_labelled_items(self, lines: List[str]) -> Optional[List[_ParsedLine]]:
+        """Labelled items, or None if one has no total to check it against."""
+        items: List[_ParsedLine] = []
+        unverifiable: List[str] = []
+        current: dict = {}
+
+        def flush() -> None:
+            price, qty, total = current.get("price"), current.get("qty"), current.get("total")
+            if current.get("desc") and price is not None and qty is not None:
+                if total is None:
+                    unverifiable.append(current["desc"])
+                    return
+                items.append(
+                    _ParsedLine(
+                        description=current["desc"],
+                        unit_price=price,
+                        amount=qty,
+                        unit=current.get("unit") or _DEFAULT_UNIT,
+                        total=total,
+                    )
+                )
+
+        for line in lines:
+            match = _LABEL.match(re.sub(r"^\d+[.)]\s+", "", line))
+            if not match:
+                continue
+            label = match.group("label").strip().lower()
+            value = match.group("value").strip()
+            if label in _ITEM_LABELS:
+                flush()
+                current = {"desc": value}
+            elif not current:
+                continue
+            elif label in _PRICE_LABELS:
+                current["price"] = parse_decimal(value)
+            elif label in _QTY_LABELS:
+                qty_match = re.match(rf"({_QTY})\s*(.*)$", value)
+                if qty_match:
+                    current["qty"] = parse_decimal(qty_match.group(1))
+                    current.setdefault("unit", qty_match.group(2) or None)
+            elif label in _UNIT_LABELS:
+                current["unit"] = value
+            elif label in _LINE_TOTAL_LABELS:
+                current["total"] = parse_decimal(value)
+        flush()
+        return None if unverifiable else items
+
+    def _parse_table_rows(self, lines: List[str]) -> Optional[List[_ParsedLine]]:
+        """
+        Table rows, or None if an alternative position is not a marked
+        unit-price-only row directly after its marker line.
+        """
+        items: List[_ParsedLine] = []
+        after_marker = False
+        for line in lines:
+            if _TOTAL_KEYWORDS.match(line):
+                continue
+            unit_price_only = _ROW_UNIT_PRICE_ONLY.match(line)
+            if unit_price_only:
+                if not after_marker:
+                    return None
+                after_marker = False
+                items.append(self._alternative_row(unit_price_only.groupdict()))
+                continue
+            if after_marker:
+                return None
+            if _ALTERNATIVE.match(line):
+                after_marker = True
+                continue
+            match = _ROW_TRAILING_QTY.match(line) or _ROW_LEADING_QTY.match(line)
+            if not match:
+                continue
+            groups = match.groupdict()
+            amount = parse_decimal(groups["qty"])
+            unit_price = parse_decimal(groups["price"])
+            total = parse_decimal(groups["total"])
+            if amount is None or unit_price is None or total is None or amount <= 0:
+                continue
+            if groups.get("discount"):
+                discount = parse_decimal(groups["discount"]) or Decimal("0")
+                unit_price = (unit_price * (1 + discount / 100)).quantize(_CENT, ROUND_HALF_UP)
+            # Drop a leading numeric article number ("00009 Moosbild ...").
+            description = re.sub(r"^\d{4,}\s+", "", groups["desc"]).strip(" -")
+            items.append(
+                _ParsedLine(
+                    description=description,
+                    unit_price=unit_price,
+                    amount=amount,
+                    unit=(groups.get("unit") or _DEFAULT_UNIT).rstrip("."),
+                    total=total,
+                )
+            )
+        return None if after_marker else items
+
+    def _alternative_row(self, groups: dict) -> _ParsedLine:
+        amount = parse_decimal(groups["qty"]) or Decimal("0")
+        unit_price = parse_decimal(groups["price"]) or Decimal("0")
+        description = re.sub(r"^\d{4,}\s+", "", groups["desc"]).strip(" -")
+        return _ParsedLine(
+            description=f"Alternativ: {description}",
+            unit_price=unit_price,
+            amount=amount,
+            unit=_DEFAULT_UNIT,
+            total=(unit_price * amount).quantize(_CENT, ROUND_HALF_UP),
+            alternative=True,
+        )
+
+    def _parse_shipping(self, lines: List[str]) -> List[_ParsedLine]:
+        for line in lines:
+            match = _SHIPPING.match(line)
+            if match:
+                total = parse_decimal(match.group("total"))
+                if total:
+                    return [
+                        _ParsedLine(
+                            description=match.group("desc"),
+                            unit_price=total,
+                            amount=Decimal("1"),
+                            unit=_DEFAULT_UNIT,
+                            total=total,
+                        )
+                    ]
+        return []
+
+    def _find_net_total(self, lines: List[str]) -> Optional[Decimal]:
+        for line in lines:
+            match = _NET_TOTAL.match(line)
+            if match:
+                return parse_decimal(match.group("total"))
+        return None
+
+    def _find_vendor(self, lines: List[str]) -> Optional[str]:
+        for line in lines:
+            match = _VENDOR_LABEL.match(line)
+            if match:
+                return match.group("name").strip()
+        for line in lines[:10]:
+            match = _SENDER_LINE.match(line)
+            if match:
+                return match.group("name").strip()
+        for line in lines:
+            if _FOOTER_HINTS.search(line):
+                match = _FOOTER_LINE.match(line)
+                if match:
+                    return match.group("name").strip()
+        return None
+
+    def _find_vat_id(self, text: str) -> Optional[str]:
+        match = _VAT_LABELLED.search(text) or _VAT_ANY.search(text)
+        if not match:
+            return None
+        return re.sub(r"\s", "", match.group("vat"))
+
+    def _find_requestor(self, lines: List[str]) -> Optional[str]:
+        for line in lines[:25]:
+            match = _REQUESTOR.search(line)
+            if match:
+                return match.group("name")
+        return None
+
+    def _find_department(self, lines: List[str]) -> Optional[str]:
+        for line in lines[:25]:
+            match = _DEPARTMENT.match(line)
+            if match:
+                return match.group("dept").strip()
+        return None
@@ -0,0 +1,70 @@
+# app/services/pdf_text.py
+
+import io
+import re
+from typing import BinaryIO, List, Optional, Union, cast
+
+import pdfplumber
+
+_WHITESPACE_RE = re.compile(r"[ \t ]+")
+# pdfminer emits "(cid:123)" for glyphs it cannot map to text (broken font encodings).
+_CID_RE = re.compile(r"\(cid:\d+\)")
+
+
+def _compact(text: str) -> str:
+    lines = (_WHITESPACE_RE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _render_table(rows: List[List[Optional[str]]]) -> str:
+    rendered = []
+    for row in rows:
+        cells = [_compact(cell or "").replace("\n", " ") for cell in row]
+        if any(cells):
+            rendered.append(" | ".join(cells))
+    return "\n".join(rendered)
+
+
+def extract_page_texts(pdf: Union[bytes, BinaryIO]) -> List[str]:
+    """
+    Return the compact text of every page, with tables rendered as ' | ' rows.
+
+    Text inside detected tables is taken out of the running text so that it is
+    only sent once. Raises whatever pdfplumber raises for unreadable PDFs.
+    """
+    pages: List[str] = []
+    # pdfplumber reads any seekable binary stream (e.g. an upload's mmap
+    # view); its annotation only names BytesIO.
+    source = io.BytesIO(pdf) if isinstance(pdf, bytes) else cast(io.BytesIO, pdf)
+    with pdfplumber.open(source) as document:
+        for page in document.pages:
+            tables = page.find_tables()
+            body = page
+            for table in tables:
+                body = body.outside_bbox(table.bbox)
+            parts = [_compact(body.extract_text() or "")]
+            for index, table in enumerate(tables, start=1):
+                rendered = _render_table(table.extract())
+                if rendered:
+                    parts.append(f"[Table {index}]\n{rendered}")
+            pages.append("\n".join(part for part in parts if part))
+    return pages
+
+
+def has_text_layer(pages: List[str], min_chars_per_page: int) -> bool:
+    """Heuristic: scanned PDFs have (almost) no extractable, readable characters."""
+    if not pages:
+        return False
+    text = "".join(pages)
+    if len(_CID_RE.findall(text)) * 8 > len(text):
+        return False
+    meaningful = sum(1 for ch in text if ch.isalnum())
+    return meaningful >= min_chars_per_page * len(pages)
+
+
+def render_pages(pages: List[str], first_page: int = 1) -> str:
+    """Join page texts with '--- Page N ---' markers understood by the prompt."""
+    return "\n".join(
+        f"--- Page {number} ---\n{text}"
+        for number, text in enumerate(pages, start=first_page)
+    )
@@ -0,0 +1,83 @@
+# app/services/request_export.py
+
+import csv
+import io
+from typing import AsyncIterable, AsyncIterator, List
+
+from app.models.request import ProcurementRequest
+
+CSV_COLUMNS = [
+    "request_id",
+    "status",
+    "created_at",
+    "updated_at",
+    "requestor_name",
+    "department",
+    "title",
+    "vendor_name",
+    "vendor_vat_id",
+    "commodity_group",
+    "total_cost",
+    "line_number",
+    "position_description",
+    "unit_price",
+    "amount",
+    "unit",
+    "total_price",
+]
+
+
+async def ndjson_chunks(
+    batches: AsyncIterable[List[ProcurementRequest]],
+) -> AsyncIterator[bytes]:
+    """One JSON object per request, one chunk per batch."""
+    async for batch in batches:
+        yield "".join(request.model_dump_json() + "\n" for request in batch).encode("utf-8")
+
+
+def _csv_rows(request: ProcurementRequest) -> List[list]:
+    header = [
+        str(request.id),
+        request.status.value,
+        request.created_at.isoformat(),
+        request.updated_at.isoformat(),
+        request.requestor_name,
+        request.department,
+        request.title,
+        request.vendor_name,
+        request.vendor_vat_id,
+        request.commodity_group or "",
+        str(request.total_cost),
+    ]
+    if not request.order_lines:
+        return [header + [""] * 6]
+    return [
+        header
+        + [
+            number,
+            line.position_description,
+            str(line.unit_price),
+            str(line.amount),
+            line.unit,
+            str(line.total_price),
+        ]
+        for number, line in enumerate(request.order_lines, start=1)
+    ]
+
+
+async def csv_chunks(
+    batches: AsyncIterable[List[ProcurementRequest]],
+) -> AsyncIterator[bytes]:
+    """CSV with a header row and one row per order line (requests repeat per line)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    async for batch in batches:
+        for request in batch:
+            writer.writerows(_csv_rows(request))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when nothing matched.
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,255 @@
+# app/services/request_reclassification.py
+
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import IO, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.models.commodity import GroupTransition, ReclassificationProgress
+from app.models.request import ProcurementRequest
+from app.repositories.base import RequestRepository
+from app.repositories.pagination import RequestSortField
+from app.services.commodity_service import CommodityService, get_commodity_service
+
+# Transition counts are keyed by (old group, new group); "" stands for no group.
+_Transitions = Counter
+
+_WORKER_SERVICE: Optional[CommodityService] = None
+
+
+def _init_worker() -> CommodityService:
+    """Build the CommodityService (and load the model) once per pool process."""
+    global _WORKER_SERVICE
+    _WORKER_SERVICE = get_commodity_service()
+    return _WORKER_SERVICE
+
+
+def _classify_chunk(requests: Sequence[ProcurementRequest]) -> List[str]:
+    """Pool task: suggest a group for each request of one page."""
+    service = _WORKER_SERVICE or _init_worker()
+    return service.suggest_for_requests(requests)
+
+
+def _try_lock(handle: IO[bytes]) -> bool:
+    """Take a non-blocking exclusive lock on an open file; False if it is held."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        handle.seek(0)
+        try:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+    else:
+        import fcntl
+
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+    return True
+
+
+class _InlineExecutor(Executor):
+    """Runs submissions immediately; used when ``workers`` is 0."""
+
+    def submit(self, fn, /, *args, **kwargs):  # type: ignore[override]
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        return future
+
+
+class RequestReclassifier:
+    """
+    Re-run commodity classification over every stored request.
+
+    Requests are walked in creation order with keyset pages; each page is
+    classified on a process pool (a few pages in flight at once) and its
+    changed groups are written back with one ``update_commodity_groups``
+    call. After every page the cursor and running diff are saved to a
+    checkpoint file, so an interrupted run resumes where it stopped.
+
+    Only one run may use a checkpoint at a time, across processes (API
+    workers and the CLI alike): an exclusive lock on a ``.lock`` file next
+    to the checkpoint guards it (``flock``, or ``msvcrt.locking`` on
+    Windows). The OS drops the lock when its holder exits, so a crashed run
+    never leaves a stale lock behind.
+
+    Pool workers are spawned rather than forked: the API runs this from a
+    thread of a multi-threaded server, where forking can copy held locks.
+    """
+
+    def __init__(
+        self,
+        repository: RequestRepository,
+        checkpoint_path: str,
+        chunk_size: int = 500,
+        workers: Optional[int] = None,
+    ) -> None:
+        self._repo = repository
+        self._checkpoint_path = checkpoint_path
+        self._chunk_size = max(1, chunk_size)
+        self._workers = (os.cpu_count() or 1) if workers is None else workers
+        self._logger = logging.getLogger("app")
+        self._lock_file: Optional[IO[bytes]] = None
+
+    def acquire(self) -> bool:
+        """Take the checkpoint's run lock; False if another run holds it."""
+        if self._lock_file is not None:
+            return True
+        lock_path = self._checkpoint_path + ".lock"
+        os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+        lock_file = open(lock_path, "a+b")
+        if not _try_lock(lock_file):
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._lock_file is not None:
+            # Closing the descriptor drops the lock.
+            self._lock_file.close()
+            self._lock_file = None
+
+    def run(self, restart: bool = False) -> Iterator[ReclassificationProgress]:
+        """
+        Yield progress after every written page, then the final summary.
+
+        Takes the run lock unless the caller already did (see ``acquire``)
+        and releases it when the generator finishes or is closed.
+        """
+        if not self.acquire():
+            raise RuntimeError("A re-classification run is already in progress.")
+        try:
+            yield from self._run(restart)
+        finally:
+            self.release()
+
+    def _run(self, restart: bool) -> Iterator[ReclassificationProgress]:
+        checkpoint = None if restart else self._load_checkpoint()
+        cursor: Optional[str] = None
+        scanned = changed = 0
+        transitions: _Transitions = Counter()
+        if checkpoint is not None:
+            cursor = checkpoint["cursor"]
+            scanned, changed = checkpoint["scanned"], checkpoint["changed"]
+            transitions.update(
+                {(old, new): count for old, new, count in checkpoint["transitions"]}
+            )
+            self._logger.info("Resuming re-classification after %s requests", scanned)
+        total = self._repo.aggregates().request_count
+
+        def progress(done: bool = False) -> ReclassificationProgress:
+            return ReclassificationProgress(
+                scanned=scanned,
+                changed=changed,
+                total=max(total, scanned),
+                resumed=checkpoint is not None,
+                done=done,
+                transitions=_summarize(transitions),
+            )
+
+        executor: Executor = (
+            ProcessPoolExecutor(
+                self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            if self._workers > 0
+            else _InlineExecutor()
+        )
+        pending: Deque[Tuple[List[ProcurementRequest], Optional[str], Future]] = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max(2 * self._workers, 1):
+                    page, cursor = self._repo.list_page(
+                        RequestSortField.CREATED_AT, limit=self._chunk_size, cursor=cursor
+                    )
+                    exhausted = cursor is None
+                    if page:
+                        future = executor.submit(_classify_chunk, page)
+                        pending.append((page, cursor, future))
+                if not pending:
+                    break
+
+                page, page_cursor, future = pending.popleft()
+                changes: Dict = {}
+                for request, group in zip(page, future.result()):
+                    if request.commodity_group != group:
+                        changes[request.id] = group
+                        transitions[(request.commodity_group or "", group)] += 1
+                if changes:
+                    self._repo.update_commodity_groups(changes)
+                scanned += len(page)
+                changed += len(changes)
+                if page_cursor is not None:
+                    self._save_checkpoint(page_cursor, scanned, changed, transitions)
+                yield progress()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        self._clear_checkpoint()
+        self._logger.info(
+            "Re-classified %s requests, %s changed group", scanned, changed
+        )
+        yield progress(done=True)
+
+    def _load_checkpoint(self) -> Optional[dict]:
+        try:
+            with open(self._checkpoint_path, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            self._logger.warning("Ignoring unreadable checkpoint: %s", exc)
+            return None
+
+    def _save_checkpoint(
+        self, cursor: str, scanned: int, changed: int, transitions: _Transitions
+    ) -> None:
+        state = {
+            "cursor": cursor,
+            "scanned": scanned,
+            "changed": changed,
+            "transitions": [[old, new, n] for (old, new), n in transitions.items()],
+        }
+        directory = os.path.dirname(os.path.abspath(self._checkpoint_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+        os.replace(tmp_path, self._checkpoint_path)
+
+    def _clear_checkpoint(self) -> None:
+        try:
+            os.remove(self._checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+
+def get_request_reclassifier(repository: RequestRepository) -> RequestReclassifier:
+    """A reclassifier for ``repository`` configured from the settings."""
+    return RequestReclassifier(
+        repository,
+        checkpoint_path=settings.reclassify_checkpoint_path,
+        chunk_size=settings.reclassify_chunk_size,
+        workers=settings.reclassify_workers,
+    )
+
+
+def _summarize(transitions: _Transitions) -> List[GroupTransition]:
+    return [
+        GroupTransition(old=old or None, new=new, count=count)
+        for (old, new), count in transitions.most_common()
+    ]
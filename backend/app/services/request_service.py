@@ -1,39 +1,125 @@
 import logging
 from decimal import Decimal
-from typing import List, Optional
+from typing import AsyncIterable, AsyncIterator, List, Optional, Sequence, Tuple
 from uuid import UUID
 
+import anyio
 from fastapi import Depends
+from pydantic import ValidationError
 
-from app.models.request import ProcurementRequest, ProcurementRequestCreate
+from app.core.config import settings
+from app.models.aggregates import SpendAggregates
+from app.models.request import (
+    ProcurementRequest,
+    ProcurementRequestCreate,
+    RequestImportError,
+    RequestImportResult,
+)
 from app.models.status import RequestStatus
-from app.repositories.base import RequestRepository
+from app.repositories.base import (
+    AsyncRequestRepository,
+    RequestRepository,
+    StaleRequestError,
+)
 from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.pagination import RequestSortField
+from app.repositories.sqlite_requests import SQLiteRequestRepository
+from app.repositories.threaded import ThreadedAsyncRequestRepository
 from app.services.commodity_service import CommodityService, get_commodity_service
 
-_REQUEST_REPOSITORY: Optional[InMemoryRequestRepository] = None
+_REQUEST_REPOSITORY: Optional[RequestRepository] = None
+# A status change re-reads and retries this often when another write wins.
+_STALE_UPDATE_ATTEMPTS = 3
 
 
-class RequestService:
-    """Encapsulates business logic around procurement requests."""
+def _resolve_sort(
+    sort: Optional[RequestSortField], search: Optional[str]
+) -> RequestSortField:
+    """Searches default to relevance order, plain lists to creation order."""
+    if sort is not None:
+        return sort
+    return RequestSortField.RELEVANCE if search else RequestSortField.CREATED_AT
+
+
+def _apply_derived_fields(
+    payload: ProcurementRequestCreate, commodity_service: CommodityService
+) -> None:
+    """Fill in the commodity group and recompute the total from the order lines."""
+    if not payload.commodity_group:
+        payload.commodity_group = commodity_service.suggest_for_request(payload)
+
+    calculated_total = sum(
+        (Decimal(str(line.total_price)) for line in payload.order_lines),
+        Decimal("0"),
+    )
+    current_total = Decimal(str(payload.total_cost))
+    if current_total != calculated_total:
+        payload.total_cost = calculated_total
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'line'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _parse_import_batch(
+    lines: Sequence[Tuple[int, Optional[bytes]]], commodity_service: CommodityService
+) -> Tuple[List[ProcurementRequestCreate], List[RequestImportError]]:
+    """Validate NDJSON lines into payloads with derived fields applied."""
+    payloads: List[ProcurementRequestCreate] = []
+    errors: List[RequestImportError] = []
+    for number, raw in lines:
+        if raw is None:
+            limit = settings.requests_import_max_line_bytes
+            errors.append(RequestImportError(line=number, error=f"Line exceeds {limit} bytes."))
+            continue
+        try:
+            payload = ProcurementRequestCreate.model_validate_json(raw)
+        except ValidationError as exc:
+            errors.append(
+                RequestImportError(line=number, error=_format_validation_error(exc))
+            )
+            continue
+        payloads.append(payload)
+
+    # Classify the whole batch at once instead of one request at a time.
+    unlabelled = [payload for payload in payloads if not payload.commodity_group]
+    for payload, group in zip(
+        unlabelled, commodity_service.suggest_for_requests(unlabelled)
+    ):
+        payload.commodity_group = group
+    for payload in payloads:
+        _apply_derived_fields(payload, commodity_service)
+    return payloads, errors
+
+
+class AsyncRequestService:
+    """
+    Encapsulates business logic around procurement requests.
+
+    Repository work is awaited instead of run on the event loop, so large
+    lists or disk-backed stores do not block concurrent requests.
+    """
 
     def __init__(
         self,
-        repository: RequestRepository,
+        repository: AsyncRequestRepository,
         commodity_service: CommodityService,
     ) -> None:
         self._repo = repository
         self._commodity_service = commodity_service
         self._logger = logging.getLogger("app")
 
-    def list_requests(
+    async def list_requests(
         self,
         status_filter: Optional[RequestStatus] = None,
         department: Optional[str] = None,
         search: Optional[str] = None,
     ) -> List[ProcurementRequest]:
         """Return requests filtered by optional status, department, and search query."""
-        results = self._repo.list(
+        results = await self._repo.list(
             status_filter=status_filter,
             department=department,
             search=search,
@@ -41,26 +127,73 @@ class RequestService:
         self._logger.debug("List returned %s requests", len(results))
         return results
 
-    def get_request(self, request_id: UUID) -> Optional[ProcurementRequest]:
-        """Retrieve a request by id or return None."""
-        return self._repo.get(request_id)
+    async def list_requests_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: Optional[RequestSortField] = None,
+        descending: bool = False,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> Tuple[List[ProcurementRequest], Optional[str]]:
+        """Return one page of requests and the cursor for the next one."""
+        page, next_cursor = await self._repo.list_page(
+            sort=_resolve_sort(sort, search),
+            descending=descending,
+            limit=limit,
+            cursor=cursor,
+            status_filter=status_filter,
+            department=department,
+            search=search,
+        )
+        self._logger.debug(
+            "Page returned %s requests (more=%s)", len(page), next_cursor is not None
+        )
+        return page, next_cursor
 
-    def create_request(self, payload: ProcurementRequestCreate) -> ProcurementRequest:
-        """Create a new procurement request with derived data."""
-        if not payload.commodity_group:
-            payload.commodity_group = self._commodity_service.suggest_for_request(
-                payload
+    async def iter_request_batches(
+        self,
+        batch_size: int,
+        status_filter: Optional[RequestStatus] = None,
+        department: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> AsyncIterator[List[ProcurementRequest]]:
+        """
+        Yield every matching request in creation order, ``batch_size`` at a time.
+
+        Walks keyset pages, so only one batch is held in memory and requests
+        created during the walk are not skipped or repeated.
+        """
+        cursor: Optional[str] = None
+        while True:
+            page, cursor = await self._repo.list_page(
+                sort=RequestSortField.CREATED_AT,
+                limit=batch_size,
+                cursor=cursor,
+                status_filter=status_filter,
+                department=department,
+                search=search,
             )
+            if page:
+                yield page
+            if cursor is None:
+                return
 
-        calculated_total = sum(
-            (Decimal(str(line.total_price)) for line in payload.order_lines),
-            Decimal("0"),
-        )
-        current_total = Decimal(str(payload.total_cost))
-        if current_total != calculated_total:
-            payload.total_cost = calculated_total
+    async def get_aggregates(self) -> SpendAggregates:
+        """Return request counts and spend per commodity group, department, vendor and status."""
+        return await self._repo.aggregates()
+
+    async def get_request(self, request_id: UUID) -> Optional[ProcurementRequest]:
+        """Retrieve a request by id or return None."""
+        return await self._repo.get(request_id)
 
-        created = self._repo.create(payload)
+    async def create_request(
+        self, payload: ProcurementRequestCreate
+    ) -> ProcurementRequest:
+        """Create a new procurement request with derived data."""
+        _apply_derived_fields(payload, self._commodity_service)
+        created = await self._repo.create(payload)
         self._logger.info(
             "Created procurement request %s for vendor %s (total=%s)",
             created.id,
@@ -69,41 +202,116 @@ class RequestService:
         )
         return created
 
-    def update_status(
+    async def import_requests(
+        self,
+        lines: AsyncIterable[Tuple[int, Optional[bytes]]],
+        batch_size: int = 1000,
+        max_errors: int = 1000,
+    ) -> RequestImportResult:
+        """
+        Create requests from numbered NDJSON lines, ``batch_size`` at a time.
+
+        Each batch is validated in a worker thread and stored with a single
+        ``create_many`` call. Invalid or oversized (None) lines are reported
+        (up to ``max_errors`` of them) without aborting the import.
+        """
+        result = RequestImportResult()
+        batch: List[Tuple[int, Optional[bytes]]] = []
+
+        async def flush() -> None:
+            payloads, errors = await anyio.to_thread.run_sync(
+                _parse_import_batch, list(batch), self._commodity_service
+            )
+            if payloads:
+                try:
+                    created = await self._repo.create_many(payloads)
+                except Exception as exc:  # noqa: BLE001
+                    self._logger.exception("Failed to store import batch")
+                    rejected = {error.line for error in errors}
+                    errors.extend(
+                        RequestImportError(line=number, error=str(exc))
+                        for number, _ in batch
+                        if number not in rejected
+                    )
+                    errors.sort(key=lambda error: error.line)
+                else:
+                    result.imported += len(created)
+            result.failed += len(errors)
+            room = max_errors - len(result.errors)
+            result.errors.extend(errors[:room])
+            result.errors_truncated = result.errors_truncated or len(errors) > room
+            batch.clear()
+
+        async for numbered_line in lines:
+            batch.append(numbered_line)
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+
+        self._logger.info(
+            "Bulk import finished: %s imported, %s failed", result.imported, result.failed
+        )
+        return result
+
+    async def update_status(
         self,
         request_id: UUID,
         new_status: RequestStatus,
     ) -> Optional[ProcurementRequest]:
-        """Update the status of an existing request."""
-        req = self._repo.get(request_id)
-        if req is None:
-            return None
-        if req.status == new_status:
-            return req
-
-        old_status = req.status
-        req.status = new_status
-        updated = self._repo.update(req)
-        self._logger.info(
-            "Status change for request %s: %s -> %s",
-            request_id,
-            old_status,
-            new_status,
-        )
-        return updated
+        """
+        Update the status of an existing request.
+
+        The change is applied to a fresh read, so it never reverts a write
+        that landed in between (e.g. a re-classified commodity group); if
+        another write wins the race every time, StaleRequestError propagates.
+        """
+        for attempt in range(_STALE_UPDATE_ATTEMPTS):
+            req = await self._repo.get(request_id)
+            if req is None:
+                return None
+            if req.status == new_status:
+                return req
+
+            old_status = req.status
+            req.status = new_status
+            try:
+                updated = await self._repo.update(req)
+            except StaleRequestError:
+                if attempt + 1 == _STALE_UPDATE_ATTEMPTS:
+                    raise
+                continue
+            self._logger.info(
+                "Status change for request %s: %s -> %s",
+                request_id,
+                old_status,
+                new_status,
+            )
+            return updated
+        return None
 
 
 def get_request_repository() -> RequestRepository:
-    """Provide a singleton-like repository instance."""
+    """Provide a singleton-like repository instance for the configured backend."""
     global _REQUEST_REPOSITORY
     if _REQUEST_REPOSITORY is None:
-        _REQUEST_REPOSITORY = InMemoryRequestRepository()
+        if settings.request_repository_backend == "sqlite":
+            _REQUEST_REPOSITORY = SQLiteRequestRepository(settings.request_sqlite_path)
+        else:
+            _REQUEST_REPOSITORY = InMemoryRequestRepository()
     return _REQUEST_REPOSITORY
 
 
-def get_request_service(
+def get_async_request_repository(
     repo: RequestRepository = Depends(get_request_repository),
+) -> AsyncRequestRepository:
+    """Offload the configured (blocking) repository to worker threads."""
+    return ThreadedAsyncRequestRepository(repo)
+
+
+def get_async_request_service(
+    repo: AsyncRequestRepository = Depends(get_async_request_repository),
     commodity_service: CommodityService = Depends(get_commodity_service),
-) -> RequestService:
-    """FastAPI dependency wiring for RequestService."""
-    return RequestService(repository=repo, commodity_service=commodity_service)
+) -> AsyncRequestService:
+    """FastAPI dependency wiring for AsyncRequestService."""
+    return AsyncRequestService(repository=repo, commodity_service=commodity_service)
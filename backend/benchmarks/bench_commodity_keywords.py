@@ -0,0 +1,77 @@
+"""
+Time commodity keyword classification as the keyword table grows.
+
+Compares the compiled single-pass matcher against a per-keyword
+``any(k in text ...)`` scan over the same table.
+
+Run from backend/:  python -m benchmarks.bench_commodity_keywords [--texts 20000]
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import Dict, List, Optional
+
+from app.services.commodity_keywords import COMMODITY_KEYWORDS
+from app.services.commodity_service import KeywordClassifier
+
+TITLES = [
+    "Adobe Creative Cloud Lizenzen für das Designteam",
+    "Neue Laptops und Dockingstationen für Onboarding",
+    "Messestand und Catering für die Hannover Messe",
+    "Druckkosten Broschüre Frühjahrskatalog, Auflage 5000",
+    "Quarterly office supplies and coffee for the kitchenette",
+]
+
+
+def inflate(extra_per_group: int, seed: int = 7) -> Dict[str, Dict[str, int]]:
+    """The real table plus ``extra_per_group`` random keywords per group."""
+    rng = random.Random(seed)
+    table = {group: dict(words) for group, words in COMMODITY_KEYWORDS.items()}
+    for words in table.values():
+        for _ in range(extra_per_group):
+            length = rng.randint(5, 12)
+            words["".join(rng.choices(string.ascii_lowercase, k=length))] = 1
+    return table
+
+
+def naive_classify(table: Dict[str, Dict[str, int]], text: str) -> Optional[str]:
+    text = text.lower()
+    best, best_score = None, 0
+    for group, words in table.items():
+        score = sum(weight for word, weight in words.items() if word in text)
+        if score > best_score:
+            best, best_score = group, score
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--texts", type=int, default=20000)
+    args = parser.parse_args()
+
+    texts: List[str] = [TITLES[i % len(TITLES)] for i in range(args.texts)]
+    for extra in (0, 50, 500):
+        table = inflate(extra)
+        keywords = sum(len(words) for words in table.values())
+        classifier = KeywordClassifier(table)
+
+        start = time.perf_counter()
+        for text in texts:
+            classifier.classify([(text, 1)])
+        compiled = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in texts[: max(1, args.texts // 20)]:
+            naive_classify(table, text)
+        naive = (time.perf_counter() - start) * 20
+
+        print(
+            f"{keywords:6d} keywords: compiled {compiled / args.texts * 1e6:7.1f} µs/text,"
+            f" per-keyword scan {naive / args.texts * 1e6:8.1f} µs/text"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Serialization cost of a GET /api/requests page: FastAPI's default path versus
+the TypeAdapter.dump_json bytes the route now returns.
+
+"legacy" repeats what FastAPI does for a response_model route that returns
+models: validate the list again, dump it to JSON-compatible Python, then
+json.dumps that. "dump_json" is the single pydantic-core call the route uses.
+Pages come from a seeded in-memory repository; gzip size and time are shown
+for the largest page size as well.
+
+Run from backend/:
+    python -m benchmarks.bench_list_serialization [--pages 50,100,500]
+        [--repeat 200] [--output serialization.json]
+"""
+
+import argparse
+import gzip
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from app.api.routes.requests import _REQUEST_LIST
+from app.core.json_response import _GZIP_LEVEL
+from app.models.request import ProcurementRequest
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.pagination import RequestSortField
+from benchmarks.results import write_results
+from benchmarks.synthetic import synthetic_payloads
+
+
+def legacy(page: List[ProcurementRequest]) -> bytes:
+    validated = _REQUEST_LIST.validate_python(page)
+    content = _REQUEST_LIST.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dump_json(page: List[ProcurementRequest]) -> bytes:
+    return _REQUEST_LIST.dump_json(page)
+
+
+def _best_seconds(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", default="50,100,500", help="Comma-separated page sizes.")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.pages.split(",")]
+    repo = InMemoryRequestRepository()
+    repo.create_many(list(synthetic_payloads(max(sizes))))
+
+    rows: List[Dict[str, Any]] = []
+    print(f"{'page':>6}{'KiB':>8}{'legacy ms':>12}{'dump_json ms':>14}{'speedup':>9}")
+    for size in sizes:
+        page, _ = repo.list_page(RequestSortField.CREATED_AT, limit=size)
+        assert json.loads(legacy(page)) == json.loads(dump_json(page))
+        legacy_s = _best_seconds(lambda: legacy(page), args.repeat)
+        dump_s = _best_seconds(lambda: dump_json(page), args.repeat)
+        body = dump_json(page)
+        rows.append(
+            {
+                "page": size,
+                "bytes": len(body),
+                "legacy_ms": legacy_s * 1000,
+                "dump_json_ms": dump_s * 1000,
+                "speedup": legacy_s / dump_s,
+            }
+        )
+        print(
+            f"{size:>6}{len(body) / 1024:>8.1f}{legacy_s * 1000:>12.3f}"
+            f"{dump_s * 1000:>14.3f}{legacy_s / dump_s:>8.1f}x"
+        )
+
+    compressed = gzip.compress(body, _GZIP_LEVEL)
+    gzip_s = _best_seconds(lambda: gzip.compress(body, _GZIP_LEVEL), max(args.repeat // 10, 1))
+    print(
+        f"gzip level {_GZIP_LEVEL} on the {sizes[-1]}-item page: "
+        f"{len(body) / 1024:.1f} -> {len(compressed) / 1024:.1f} KiB "
+        f"in {gzip_s * 1000:.2f} ms"
+    )
+    if args.output:
+        write_results(args.output, rows, gzip_level=_GZIP_LEVEL)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Offer extraction pipeline check: corpus match and normalization time.
+
+Every offer in docs/ goes through OpenAIClient.extract_offer_from_pdf and the
+service's normalization, and the result is compared field by field with
+benchmarks/offer_corpus.json. By default the client replays recorded
+responses from benchmarks/cassettes (no network, deterministic); --record
+calls the real API once (OPENAI_API_KEY) and stores the responses.
+--fake answers from the fake API instead.
+
+Corpus totals are net: total_cost is the offer's net sum of the positions it
+counts plus shipping, without VAT. Alternative positions ("Alternativ: ...")
+are listed as order lines but excluded from total_cost, as the offers do, so
+the lines of an offer with alternatives sum to more than its total.
+
+The recordings committed in benchmarks/cassettes are fake-API answers
+(--record --fake), i.e. the corpus itself. Replaying them checks the request,
+cassette, parsing and normalization path and times normalization; the match
+rate is 100% by construction and says nothing about extraction quality, so
+the output labels it as a pipeline check. Only runs against real-model
+recordings report field accuracy.
+
+Run from backend/:
+    python -m benchmarks.bench_offer_pipeline [--record] [--fake] [--repeat 200]
+        [--cassettes benchmarks/cassettes] [--output pipeline.json]
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import os
+import re
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import openai
+
+from app.clients.openai_cassette import CassetteTransport
+from app.clients.openai_client import OpenAIClient
+from app.clients.openai_responses import FAKE_MODEL
+from app.core.config import settings
+from app.models.offer import OfferExtractionResult
+from app.models.order_line import OrderLine
+from app.services.offer_extraction_service import OfferExtractionService
+from benchmarks.fake_openai import FakeResponsesAPI, load_corpus
+from benchmarks.load_offers import DOCS_DIR, load_documents
+from benchmarks.results import write_results
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+
+HEADER_FIELDS = ["requestor_name", "vendor_name", "vendor_vat_id", "department", "title"]
+LINE_FIELDS = ["position_description", "unit_price", "amount", "unit", "total_price"]
+# Free-text fields count as correct above this similarity ratio.
+_TEXT_SIMILARITY = 0.75
+_FUZZY_FIELDS = {"title", "position_description"}
+
+
+def _text(value: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (value or "").casefold()).strip()
+
+
+def field_matches(name: str, expected: Any, actual: Any) -> bool:
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    if isinstance(expected, Decimal):
+        return abs(Decimal(str(expected)) - Decimal(str(actual))) <= Decimal("0.01")
+    if name == "vendor_vat_id":
+        return expected.replace(" ", "").upper() == actual.replace(" ", "").upper()
+    if name in _FUZZY_FIELDS:
+        ratio = difflib.SequenceMatcher(None, _text(expected), _text(actual)).ratio()
+        return ratio >= _TEXT_SIMILARITY
+    return _text(expected) == _text(actual)
+
+
+def _line_score(expected: OrderLine, actual: OrderLine) -> int:
+    return sum(field_matches(f, getattr(expected, f), getattr(actual, f)) for f in LINE_FIELDS)
+
+
+def score(
+    expected: OfferExtractionResult, actual: OfferExtractionResult
+) -> Tuple[int, int, List[str]]:
+    """(correct fields, expected fields, names of the wrong ones) for one offer."""
+    checks: List[Tuple[str, bool]] = [
+        (name, field_matches(name, getattr(expected, name), getattr(actual, name)))
+        for name in HEADER_FIELDS + ["total_cost", "commodity_group_suggestion"]
+    ]
+    # Each expected line is paired with the best remaining extracted line.
+    remaining = list(actual.order_lines)
+    for index, line in enumerate(expected.order_lines):
+        best = max(remaining, key=lambda other: _line_score(line, other), default=None)
+        if best is not None:
+            remaining.remove(best)
+        for name in LINE_FIELDS:
+            ok = best is not None and field_matches(
+                name, getattr(line, name), getattr(best, name)
+            )
+            checks.append((f"order_lines[{index}].{name}", ok))
+    # Invented lines cost one field each.
+    checks.extend((f"extra_line[{i}]", False) for i in range(len(remaining)))
+    wrong = [name for name, ok in checks if not ok]
+    return len(checks) - len(wrong), len(checks), wrong
+
+
+def _best_seconds(fn: Any, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def replays_fake_answers(directory: str) -> bool:
+    """Whether any recording in ``directory`` holds a fake-API answer."""
+    if not os.path.isdir(directory):
+        return False
+    for name in os.listdir(directory):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), "r", encoding="utf-8") as handle:
+            entry = json.load(handle)
+        try:
+            if json.loads(entry["body"]).get("model") == FAKE_MODEL:
+                return True
+        except (KeyError, ValueError, AttributeError):
+            continue
+    return False
+
+
+def build_client(args: argparse.Namespace) -> OpenAIClient:
+    transport: httpx.AsyncBaseTransport
+    if args.fake and not args.record:
+        transport = FakeResponsesAPI(latency=0.0, jitter=0.0)
+    else:
+        # --record --fake records the fake API's answers instead of the real ones.
+        inner = FakeResponsesAPI(latency=0.0, jitter=0.0) if args.fake else None
+        transport = CassetteTransport(
+            args.cassettes, "record" if args.record else "replay", inner=inner
+        )
+    return OpenAIClient(
+        api_key=settings.openai_api_key if args.record and not args.fake else "replay",
+        http_client=httpx.AsyncClient(
+            transport=transport, timeout=settings.openai_timeout_seconds
+        ),
+    )
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    client = build_client(args)
+    service = OfferExtractionService(openai_client=client)
+    expected_by_name = load_corpus()
+    rows: List[Dict[str, Any]] = []
+    try:
+        for filename, content in load_documents(args.docs):
+            if filename not in expected_by_name:
+                print(f"{filename}: no expected result in the corpus, skipped")
+                continue
+            try:
+                raw = await client.extract_offer_from_pdf(content, filename)
+            except openai.NotFoundError:
+                rows.append({"document": filename, "missing": True})
+                continue
+            result = service._map_result(raw)
+            expected = service._map_result(expected_by_name[filename])
+            correct, total, wrong = score(expected, result)
+            seconds = _best_seconds(lambda: service._map_result(raw), args.repeat)
+            rows.append(
+                {
+                    "document": filename,
+                    "missing": False,
+                    "correct": correct,
+                    "fields": total,
+                    "match": correct / total,
+                    "lines_expected": len(expected.order_lines),
+                    "lines_extracted": len(result.order_lines),
+                    "normalize_us": seconds * 1e6,
+                    "wrong": wrong,
+                }
+            )
+    finally:
+        await client.aclose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--record", action="store_true", help="Call the API and record.")
+    parser.add_argument(
+        "--fake", action="store_true", help="Answer from the fake API (with --record: record it)."
+    )
+    parser.add_argument("--cassettes", default=CASSETTE_DIR)
+    parser.add_argument("--docs", default=DOCS_DIR)
+    parser.add_argument("--repeat", type=int, default=200, help="Normalization timing runs.")
+    parser.add_argument("--output", help="Write the per-document results as JSON.")
+    args = parser.parse_args()
+
+    fake_answers = args.fake or (not args.record and replays_fake_answers(args.cassettes))
+    if fake_answers:
+        print("Pipeline check on fake-API answers: the match rate is not a model accuracy.")
+    rows = asyncio.run(run(args))
+    scored = [row for row in rows if not row["missing"]]
+    print(f"{'document':<58}{'fields':>8}{'match':>10}{'lines':>8}{'norm us':>10}")
+    for row in rows:
+        if row["missing"]:
+            print(f"{row['document']:<58}  no recording (run with --record)")
+            continue
+        lines = f"{row['lines_extracted']}/{row['lines_expected']}"
+        print(
+            f"{row['document']:<58}{row['fields']:>8}{row['match']:>10.1%}"
+            f"{lines:>8}{row['normalize_us']:>10.1f}"
+        )
+        if row["wrong"]:
+            print(f"    wrong: {', '.join(row['wrong'])}")
+    if scored:
+        correct = sum(row["correct"] for row in scored)
+        total = sum(row["fields"] for row in scored)
+        label = "pipeline match (fake answers)" if fake_answers else "overall field accuracy"
+        print(f"{label} {correct / total:.1%} ({correct}/{total})")
+    if args.output:
+        source = "fake" if fake_answers else "model" if args.record else "cassette"
+        write_results(args.output, rows, model_source=source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure bulk NDJSON import throughput into the in-memory store.
+
+Run from backend/:  python -m benchmarks.bench_request_import [--requests 50000]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import AsyncIterator, List
+
+from app.core.ndjson import aiter_ndjson_lines
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.threaded import ThreadedAsyncRequestRepository
+from app.services.commodity_service import CommodityService
+from app.services.request_service import AsyncRequestService
+
+PRODUCTS = ["Laptop", "Monitor", "Desk", "Software licence", "Printer toner", "Headset"]
+
+
+def build_body(count: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for i in range(count):
+        product = rng.choice(PRODUCTS)
+        amount = rng.randint(1, 20)
+        price = rng.randint(10, 2000)
+        lines.append(
+            json.dumps(
+                {
+                    "requestor_name": "Jane Doe",
+                    "title": f"{product} order {i}",
+                    "vendor_name": f"Vendor {rng.randrange(500)}",
+                    "vendor_vat_id": "DE123456789",
+                    "department": rng.choice(["IT", "HR", "Marketing", "Facilities"]),
+                    "order_lines": [
+                        {
+                            "position_description": product,
+                            "unit_price": f"{price}.00",
+                            "amount": amount,
+                            "unit": "Stk",
+                            "total_price": f"{price * amount}.00",
+                        }
+                    ],
+                    "total_cost": f"{price * amount}.00",
+                }
+            )
+        )
+    return "\n".join(lines).encode("utf-8")
+
+
+async def chunked(body: bytes, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+async def run(count: int, batch_size: int) -> None:
+    body = build_body(count)
+    repo = InMemoryRequestRepository()
+    service = AsyncRequestService(
+        repository=ThreadedAsyncRequestRepository(repo),
+        commodity_service=CommodityService(),
+    )
+    start = time.perf_counter()
+    result = await service.import_requests(
+        aiter_ndjson_lines(chunked(body)), batch_size=batch_size
+    )
+    elapsed = time.perf_counter() - start
+    assert result.imported == count, result
+    print(
+        f"{count} requests ({len(body) / 1e6:.1f} MB) in {elapsed:.2f}s "
+        f"-> {count / elapsed:,.0f} requests/s (batch size {batch_size})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare InMemoryRequestRepository.list against the previous linear-scan filters.
+
+Run from backend/:  python -m benchmarks.bench_request_list [--requests 100000]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Optional
+
+from app.models.request import ProcurementRequest, ProcurementRequestCreate
+from app.models.status import RequestStatus
+from app.repositories.memory_requests import InMemoryRequestRepository
+
+DEPARTMENTS = [f"Department {i}" for i in range(50)]
+PRODUCTS = ["Laptop", "Monitor", "Desk", "Licence", "Printer", "Headset", "Chair"]
+
+
+def linear_list(
+    items: List[ProcurementRequest],
+    status_filter: Optional[RequestStatus] = None,
+    department: Optional[str] = None,
+    search: Optional[str] = None,
+) -> List[ProcurementRequest]:
+    """The filtering the repository did before the indexes were added."""
+    items = list(items)
+    if status_filter is not None:
+        items = [r for r in items if r.status == status_filter]
+    if department:
+        items = [r for r in items if r.department.lower() == department.lower()]
+    if search:
+        s = search.lower()
+        items = [r for r in items if s in r.title.lower() or s in r.vendor_name.lower()]
+    return items
+
+
+def build_repository(size: int, seed: int = 42) -> InMemoryRequestRepository:
+    rng = random.Random(seed)
+    repo = InMemoryRequestRepository()
+    statuses = list(RequestStatus)
+    for i in range(size):
+        created = repo.create(
+            ProcurementRequestCreate(
+                requestor_name="Jane Doe",
+                title=f"Request {i} {rng.choice(PRODUCTS)}",
+                vendor_name=f"Vendor {rng.randrange(size // 10 or 1)}",
+                vendor_vat_id="DE123456789",
+                department=rng.choice(DEPARTMENTS),
+                order_lines=[],
+                total_cost="0",
+            )
+        )
+        status = rng.choice(statuses)
+        if status is not RequestStatus.OPEN:
+            created.status = status
+            repo.update(created)
+    return repo
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    repo = build_repository(args.requests)
+    snapshot = repo.list()
+    cases = {
+        "status": {"status_filter": RequestStatus.CLOSED},
+        "department": {"department": "department 7"},
+        "status+department": {
+            "status_filter": RequestStatus.IN_PROGRESS,
+            "department": "Department 7",
+        },
+        "search": {"search": "4217"},
+    }
+
+    print(f"{args.requests} requests, best of {args.repeat} runs")
+    print(f"{'filter':<20}{'results':>9}{'linear ms':>12}{'indexed ms':>12}{'speedup':>9}")
+    for name, kwargs in cases.items():
+        expected = linear_list(snapshot, **kwargs)
+        assert {r.id for r in repo.list(**kwargs)} == {r.id for r in expected}
+        linear = best_of(lambda: linear_list(snapshot, **kwargs), args.repeat)
+        indexed = best_of(lambda: repo.list(**kwargs), args.repeat)
+        print(
+            f"{name:<20}{len(expected):>9}{linear * 1000:>12.2f}"
+            f"{indexed * 1000:>12.2f}{linear / indexed:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Memory per stored request: pydantic models versus compact RequestRecords.
+
+"models" is a dict of ProcurementRequest models, as the in-memory repository
+stored them before; "records" holds the same requests as RequestRecords;
+"repository" is a whole InMemoryRequestRepository, indexes included.
+Allocations are traced with tracemalloc (slower, but exact), and the cost of
+turning records back into models is timed as well.
+
+Run from backend/:  python -m benchmarks.bench_request_memory [--requests 100000]
+"""
+
+import argparse
+import gc
+import itertools
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List
+from uuid import uuid4
+
+from app.models.request import ProcurementRequest, ProcurementRequestCreate
+from app.models.status import RequestStatus
+from app.repositories.compact import RequestRecord
+from app.repositories.memory_requests import InMemoryRequestRepository
+from benchmarks.synthetic import synthetic_payloads
+
+_BATCH = 5_000
+
+
+def _batches(count: int) -> Iterator[List[ProcurementRequestCreate]]:
+    payloads = synthetic_payloads(count)
+    while batch := list(itertools.islice(payloads, _BATCH)):
+        yield batch
+
+
+def _models(batch: List[ProcurementRequestCreate]) -> List[ProcurementRequest]:
+    now = datetime.utcnow()
+    return [
+        ProcurementRequest.model_construct(
+            **dict(payload),
+            id=uuid4(),
+            status=RequestStatus.OPEN,
+            created_at=now,
+            updated_at=now,
+        )
+        for payload in batch
+    ]
+
+
+def build_models(count: int) -> Dict:
+    store = {}
+    for batch in _batches(count):
+        store.update((model.id, model) for model in _models(batch))
+    return store
+
+
+def build_records(count: int) -> Dict:
+    store = {}
+    for batch in _batches(count):
+        store.update((m.id, RequestRecord.from_model(m)) for m in _models(batch))
+    return store
+
+
+def build_repository(count: int) -> InMemoryRequestRepository:
+    repo = InMemoryRequestRepository()
+    for batch in _batches(count):
+        repo.create_many(batch)
+    return repo
+
+
+def traced_bytes(build: Callable[[int], object], count: int) -> int:
+    """Bytes still allocated by ``build(count)`` once its result is complete."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(count)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{args.requests} synthetic requests")
+    print(f"{'store':<12}{'MiB':>10}{'bytes/request':>16}")
+    sizes = {}
+    for name, build in (
+        ("models", build_models),
+        ("records", build_records),
+        ("repository", build_repository),
+    ):
+        sizes[name] = traced_bytes(build, args.requests)
+        print(
+            f"{name:<12}{sizes[name] / 2**20:>10.1f}"
+            f"{sizes[name] / args.requests:>16.0f}"
+        )
+    print(f"records use {sizes['records'] / sizes['models']:.0%} of the models' memory")
+
+    records = list(build_records(min(args.requests, 10_000)).values())
+    start = time.perf_counter()
+    for record in records:
+        record.to_model()
+    per_model = (time.perf_counter() - start) / len(records)
+    print(f"materializing one model from its record: {per_model * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Latency and throughput of the requests API at scale, on realistic synthetic data.
+
+Every case (get, filtered list, search, status update, create) runs against
+a store pre-seeded with N synthetic requests, both directly on the
+repository and end-to-end through the ASGI app (httpx, no network). Results
+are printed and optionally written as JSON; --compare prints the change
+against an earlier JSON result.
+
+Run from backend/:
+    python -m benchmarks.bench_requests [--sizes 1000,100000,1000000]
+        [--backend memory|sqlite] [--layers repository,api] [--ops 500]
+        [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+
+from app.models.status import RequestStatus
+from app.repositories.base import RequestRepository
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.pagination import RequestSortField
+from app.repositories.sqlite_requests import SQLiteRequestRepository
+from benchmarks.results import load_results, summarize, write_results
+from benchmarks.synthetic import DEPARTMENTS, synthetic_payload, synthetic_payloads
+
+_SEED_BATCH = 5_000
+_PAGE_LIMIT = 50
+_SEARCH_TERMS = ["monitor", "Müller", "schulung", "catering", "lizenz"]
+_STATUSES = [RequestStatus.IN_PROGRESS, RequestStatus.CLOSED, RequestStatus.OPEN]
+
+CASES = ["get", "list_status", "list_department", "search", "update_status", "create"]
+
+
+def seed_repository(
+    backend: str, size: int, sqlite_path: str
+) -> Tuple[RequestRepository, List[UUID]]:
+    """A repository holding ``size`` synthetic requests, about a third not open."""
+    repo: RequestRepository
+    if backend == "sqlite":
+        repo = SQLiteRequestRepository(sqlite_path)
+    else:
+        repo = InMemoryRequestRepository()
+    rng = random.Random(7)
+    ids: List[UUID] = []
+    payloads = synthetic_payloads(size)
+    while True:
+        batch = list(itertools.islice(payloads, _SEED_BATCH))
+        if not batch:
+            break
+        for created in repo.create_many(batch):
+            ids.append(created.id)
+            if rng.random() < 0.35:
+                created.status = rng.choice(_STATUSES[:2])
+                repo.update(created)
+    return repo, ids
+
+
+def _operations(
+    case: str, ids: List[UUID], ops: int, seed: int
+) -> Iterator[Tuple[int, Any]]:
+    """The argument of each operation of a case, drawn reproducibly."""
+    rng = random.Random(seed)
+    for i in range(ops):
+        if case in ("get", "update_status"):
+            yield i, rng.choice(ids)
+        elif case == "list_status":
+            yield i, _STATUSES[i % len(_STATUSES)]
+        elif case == "list_department":
+            yield i, rng.choice(DEPARTMENTS)
+        elif case == "search":
+            yield i, rng.choice(_SEARCH_TERMS)
+        else:
+            yield i, synthetic_payload(rng, 10_000_000 + i)
+
+
+def _repository_op(repo: RequestRepository, case: str) -> Callable[[int, Any], object]:
+    if case == "get":
+        return lambda i, request_id: repo.get(request_id)
+    if case == "list_status":
+        return lambda i, status: repo.list_page(
+            RequestSortField.CREATED_AT, limit=_PAGE_LIMIT, status_filter=status
+        )
+    if case == "list_department":
+        return lambda i, department: repo.list_page(
+            RequestSortField.CREATED_AT, limit=_PAGE_LIMIT, department=department
+        )
+    if case == "search":
+        return lambda i, term: repo.list_page(
+            RequestSortField.CREATED_AT, limit=_PAGE_LIMIT, search=term
+        )
+    if case == "update_status":
+
+        def update(i: int, request_id: UUID) -> object:
+            request = repo.get(request_id)
+            assert request is not None
+            request.status = _STATUSES[i % len(_STATUSES)]
+            return repo.update(request)
+
+        return update
+    return lambda i, payload: repo.create(payload)
+
+
+def run_repository_cases(
+    repo: RequestRepository, ids: List[UUID], ops: int
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for case in CASES:
+        op = _repository_op(repo, case)
+        samples = []
+        for i, argument in _operations(case, ids, ops, seed=len(results)):
+            start = time.perf_counter()
+            op(i, argument)
+            samples.append(time.perf_counter() - start)
+        results[case] = summarize(samples)
+    return results
+
+
+def _api_request(case: str, i: int, argument: Any) -> Tuple[str, str, Dict[str, Any]]:
+    base = "/api/requests"
+    if case == "get":
+        return "GET", f"{base}/{argument}", {}
+    if case == "list_status":
+        params = {"status_filter": argument.value, "limit": _PAGE_LIMIT}
+        return "GET", base, {"params": params}
+    if case == "list_department":
+        return "GET", base, {"params": {"department": argument, "limit": _PAGE_LIMIT}}
+    if case == "search":
+        # Creation order, like the repository case, rather than relevance.
+        params = {"search": argument, "sort": "created_at", "limit": _PAGE_LIMIT}
+        return "GET", base, {"params": params}
+    if case == "update_status":
+        status = _STATUSES[i % len(_STATUSES)].value
+        return "PATCH", f"{base}/{argument}/status", {"json": {"status": status}}
+    return "POST", base, {"content": argument.model_dump_json()}
+
+
+async def _run_api_cases(
+    repo: RequestRepository, ids: List[UUID], ops: int
+) -> Dict[str, Dict[str, float]]:
+    from app.main import create_app
+    from app.services.request_service import get_request_repository
+
+    app = create_app()
+    app.dependency_overrides[get_request_repository] = lambda: repo
+    # Request logging would dominate the timings and flood the terminal.
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    headers = {"content-type": "application/json"}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers=headers
+    ) as client:
+        for case in CASES:
+            samples = []
+            for i, argument in _operations(case, ids, ops, seed=len(results)):
+                method, url, kwargs = _api_request(case, i, argument)
+                start = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                samples.append(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{method} {url} -> {response.status_code}")
+            results[case] = summarize(samples)
+    return results
+
+
+def run_api_cases(
+    repo: RequestRepository, ids: List[UUID], ops: int
+) -> Dict[str, Dict[str, float]]:
+    return asyncio.run(_run_api_cases(repo, ids, ops))
+
+
+def _key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    return row["layer"], row["backend"], row["size"], row["case"]
+
+
+def print_rows(rows: List[Dict[str, Any]], baseline: Optional[Dict] = None) -> None:
+    previous = {_key(row): row for row in (baseline or {}).get("results", [])}
+    header = (
+        f"{'layer':<11}{'size':>9} {'case':<16}{'ops/s':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    print(header + ("  p50 vs baseline" if previous else ""))
+    for row in rows:
+        line = (
+            f"{row['layer']:<11}{row['size']:>9} {row['case']:<16}{row['ops_per_sec']:>10.0f}"
+            f"{row['p50_ms']:>9.3f}{row['p95_ms']:>9.3f}{row['p99_ms']:>9.3f}"
+        )
+        before = previous.get(_key(row))
+        if before is not None and before["p50_ms"]:
+            line += f"  {row['p50_ms'] / before['p50_ms']:>6.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="1000,100000",
+        help="Comma-separated store sizes; add 1000000 for the full run.",
+    )
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--layers", default="repository,api")
+    parser.add_argument("--ops", type=int, default=500, help="Operations per case.")
+    parser.add_argument("--output", help="Write the results as JSON to this path.")
+    parser.add_argument("--compare", help="A previous --output file to compare against.")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    layers = [layer for layer in args.layers.split(",") if layer]
+    runners = {"repository": run_repository_cases, "api": run_api_cases}
+    if unknown := set(layers) - set(runners):
+        parser.error(f"unknown layers: {', '.join(sorted(unknown))}")
+
+    rows: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for layer in layers:
+                # Each layer gets its own store, so creates and updates of one
+                # layer do not shift the data the next one sees.
+                start = time.perf_counter()
+                repo, ids = seed_repository(
+                    args.backend, size, os.path.join(directory, f"{layer}-{size}.db")
+                )
+                seconds = time.perf_counter() - start
+                print(f"seeded {size} requests in {seconds:.1f}s", file=sys.stderr)
+                for case, stats in runners[layer](repo, ids, args.ops).items():
+                    rows.append(
+                        {"layer": layer, "backend": args.backend, "size": size, "case": case}
+                        | stats
+                    )
+
+    print_rows(rows, load_results(args.compare) if args.compare else None)
+    if args.output:
+        write_results(args.output, rows, ops_per_case=args.ops)
+
+
+if __name__ == "__main__":
+    main()
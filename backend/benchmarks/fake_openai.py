@@ -0,0 +1,149 @@
+"""
+A local stand-in for the OpenAI Responses API, for load tests without real calls.
+
+FakeResponsesAPI answers POST .../responses with canned extraction JSON
+(benchmarks/offer_corpus.json, one answer per offer in docs/) after a
+configurable latency with jitter, and fails a configurable share of calls
+with 429/500 like the real API under load. Use it in-process as an httpx
+transport, or run it as a server and start the app with
+OPENAI_BASE_URL=http://127.0.0.1:8100/v1.
+
+Run from backend/:
+    python -m benchmarks.fake_openai [--port 8100] [--latency 2.0]
+        [--jitter 0.5] [--error-rate 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from app.clients.openai_responses import responses_payload
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "offer_corpus.json")
+
+
+def load_corpus(path: str = CORPUS_PATH) -> Dict[str, Dict[str, Any]]:
+    """Expected extraction JSON per offer file name."""
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+class FakeResponsesAPI(httpx.AsyncBaseTransport):
+    """
+    Canned Responses API with latency, jitter and injected errors.
+
+    The answer is picked by the offer file name found in the request (chunk
+    names like "offer_p1-4.pdf" map back to "offer.pdf"); unknown documents
+    get a corpus entry chosen by the size of the request body. Latency is
+    drawn from a normal distribution (``latency`` mean, ``jitter`` standard
+    deviation) and never negative.
+    """
+
+    def __init__(
+        self,
+        answers: Optional[Dict[str, Dict[str, Any]]] = None,
+        latency: float = 1.0,
+        jitter: float = 0.2,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self._answers = answers if answers is not None else load_corpus()
+        self._names = sorted(self._answers)
+        self._latency = latency
+        self._jitter = jitter
+        self._error_rate = error_rate
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "errors": self.errors, "peak_in_flight": self.peak_in_flight}
+
+    def _pick_answer(self, body: str) -> Dict[str, Any]:
+        for name in self._names:
+            stem = name.rsplit(".", 1)[0]
+            if name in body or f"{stem}_p" in body:
+                return self._answers[name]
+        return self._answers[self._names[len(body) % len(self._names)]]
+
+    async def respond(self, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """Status code and JSON body for one call, after the simulated latency."""
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(max(0.0, self._rng.gauss(self._latency, self._jitter)))
+            if self._rng.random() < self._error_rate:
+                self.errors += 1
+                status = self._rng.choice((429, 500))
+                message = "Rate limit reached" if status == 429 else "Internal server error"
+                return status, {"error": {"message": message, "type": "fake_error"}}
+            text = json.dumps(self._pick_answer(body.decode("utf-8", "replace")))
+            return 200, responses_payload(text, len(body) // 4, len(text) // 4)
+        finally:
+            self.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "POST" or not request.url.path.endswith("/responses"):
+            return httpx.Response(404, json={"error": {"message": "Not found"}})
+        status, payload = await self.respond(await request.aread())
+        return httpx.Response(status, json=payload)
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        """ASGI entry point, so the fake can also run as a standalone server."""
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        if scope["method"] == "POST" and scope["path"].endswith("/responses"):
+            status, payload = await self.respond(body)
+        else:
+            status, payload = 404, {"error": {"message": "Not found"}}
+        content = json.dumps(payload).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(content)).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": content})
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=2.0, help="Mean seconds per call.")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Std deviation in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    args = parser.parse_args()
+
+    fake = FakeResponsesAPI(
+        load_corpus(args.corpus),
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    uvicorn.run(fake, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
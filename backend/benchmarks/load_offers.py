@@ -0,0 +1,180 @@
+"""
+Load test POST /api/offers/parse against the fake OpenAI API.
+
+By default the app runs in-process (httpx ASGI transport) with its shared
+OpenAIClient wired to benchmarks.fake_openai, so a run costs nothing and
+needs no network. With --url the requests go to a running server instead
+(start the fake with python -m benchmarks.fake_openai and the app with
+OPENAI_BASE_URL=http://127.0.0.1:8100/v1). The offers in docs/ are uploaded
+round-robin at the given concurrency; throughput and p50/p95/p99 latency
+are reported per run.
+
+Run from backend/:
+    python -m benchmarks.load_offers [--concurrency 16] [--requests 200]
+        [--latency 2.0] [--jitter 0.5] [--error-rate 0.02] [--use-cache]
+        [--no-text-layer] [--no-rule-parser] [--openai-concurrency 8]
+        [--job-workers 4] [--url http://127.0.0.1:8000] [--output load.json]
+"""
+
+import argparse
+import asyncio
+import glob
+import itertools
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.fake_openai import FakeResponsesAPI
+from benchmarks.results import summarize, write_results
+
+DOCS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "docs")
+
+Document = Tuple[str, bytes]
+
+
+def load_documents(directory: str = DOCS_DIR) -> List[Document]:
+    documents = []
+    for path in sorted(glob.glob(os.path.join(directory, "*"))):
+        if path.lower().endswith(".pdf"):
+            with open(path, "rb") as handle:
+                documents.append((os.path.basename(path), handle.read()))
+    if not documents:
+        raise SystemExit(f"No PDF offers found in {directory}")
+    return documents
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    documents: List[Document],
+    concurrency: int,
+    total: int,
+    use_cache: bool,
+) -> Dict[str, Any]:
+    """Send ``total`` uploads from ``concurrency`` workers; return the run summary."""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    numbers = itertools.count()
+    params = {"use_cache": "true" if use_cache else "false"}
+
+    async def worker() -> None:
+        while (number := next(numbers)) < total:
+            filename, content = documents[number % len(documents)]
+            start = time.perf_counter()
+            try:
+                response = await client.post(
+                    "/api/offers/parse",
+                    params=params,
+                    files={"file": (filename, content, "application/pdf")},
+                )
+                outcome = str(response.status_code)
+            except httpx.HTTPError as exc:
+                outcome = type(exc).__name__
+            if outcome == "200":
+                latencies.append(time.perf_counter() - start)
+            statuses[outcome] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    stats = summarize(latencies)
+    return {
+        "requests": total,
+        "succeeded": len(latencies),
+        "wall_seconds": wall,
+        "throughput_per_sec": len(latencies) / wall if wall else 0.0,
+        "statuses": dict(statuses),
+        **{key: stats[key] for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms")},
+    }
+
+
+async def run_in_process(args: argparse.Namespace, documents: List[Document]) -> Dict[str, Any]:
+    from app.clients import openai_client
+    from app.core.config import settings
+    from app.main import create_app
+
+    settings.offer_text_layer_enabled = not args.no_text_layer
+    settings.offer_rule_parser_enabled = not args.no_rule_parser
+    settings.offer_job_workers = args.job_workers
+    # Every request is queued at once; the queue should not be the limit measured.
+    settings.offer_job_queue_size = max(settings.offer_job_queue_size, args.concurrency)
+    fake = FakeResponsesAPI(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=1
+    )
+    # Installed before startup, so the lifespan and the job workers use it.
+    openai_client._OPENAI_CLIENT = openai_client.OpenAIClient(
+        api_key="fake",
+        http_client=httpx.AsyncClient(transport=fake),
+        max_concurrency=args.openai_concurrency,
+    )
+    app = create_app()
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load", timeout=None
+        ) as client:
+            summary = await drive(
+                client, documents, args.concurrency, args.requests, args.use_cache
+            )
+    summary["fake_openai"] = fake.stats()
+    return summary
+
+
+async def run_remote(
+    url: str, args: argparse.Namespace, documents: List[Document]
+) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=None, limits=limits) as client:
+        return await drive(client, documents, args.concurrency, args.requests, args.use_cache)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--url", help="Drive a running server instead of the in-process app.")
+    parser.add_argument("--docs", default=DOCS_DIR, help="Directory of PDF offers to upload.")
+    parser.add_argument(
+        "--use-cache", action="store_true", help="Allow extraction cache hits (off by default)."
+    )
+    group = parser.add_argument_group("in-process only")
+    group.add_argument("--latency", type=float, default=2.0, help="Fake API mean seconds.")
+    group.add_argument("--jitter", type=float, default=0.5, help="Fake API std deviation.")
+    group.add_argument("--error-rate", type=float, default=0.0)
+    group.add_argument("--no-text-layer", action="store_true", help="Always send the PDF file.")
+    group.add_argument("--no-rule-parser", action="store_true")
+    group.add_argument("--openai-concurrency", type=int, default=8)
+    group.add_argument("--job-workers", type=int, default=4)
+    parser.add_argument("--output", help="Write the summary as JSON to this path.")
+    args = parser.parse_args()
+
+    documents = load_documents(args.docs)
+    summary: Optional[Dict[str, Any]]
+    if args.url:
+        summary = asyncio.run(run_remote(args.url, args, documents))
+    else:
+        summary = asyncio.run(run_in_process(args, documents))
+
+    print(
+        f"{summary['succeeded']}/{summary['requests']} ok in {summary['wall_seconds']:.1f}s "
+        f"at concurrency {args.concurrency}: {summary['throughput_per_sec']:.2f} req/s"
+    )
+    print(
+        f"latency ms  p50 {summary['p50_ms']:.0f}  p95 {summary['p95_ms']:.0f}  "
+        f"p99 {summary['p99_ms']:.0f}  mean {summary['mean_ms']:.0f}"
+    )
+    print(f"statuses {summary['statuses']}")
+    if "fake_openai" in summary:
+        print(f"fake OpenAI {summary['fake_openai']}")
+    if args.output:
+        config = {k: v for k, v in vars(args).items() if k != "output"}
+        write_results(args.output, [summary], config=config)
+
+
+if __name__ == "__main__":
+    main()
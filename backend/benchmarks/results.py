@@ -0,0 +1,58 @@
+"""Shared statistics and JSON output for the benchmarks."""
+
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Throughput and latency percentiles (ms) of per-operation timings."""
+    ordered = sorted(samples) or [0.0]
+
+    def pct(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    total = sum(ordered)
+    return {
+        "ops": len(samples),
+        "ops_per_sec": len(samples) / total if total else 0.0,
+        "mean_ms": total / len(ordered) * 1000,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_results(path: str, rows: List[Dict[str, Any]], **meta: Any) -> None:
+    """Write result rows with the commit, interpreter and platform they came from."""
+    document = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": rows,
+    }
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2)
@@ -0,0 +1,139 @@
+"""
+Deterministic synthetic procurement requests for benchmarks.
+
+Requests look like the real thing: German and English vendors, several
+order lines drawn from a per-commodity-group catalogue with realistic units
+and prices, totals that add up, and a skewed vendor distribution.
+"""
+
+import random
+from decimal import Decimal
+from typing import Dict, Iterator, List, Tuple
+
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequestCreate
+
+DEPARTMENTS = [
+    "IT", "HR", "Marketing", "Facilities", "Finance", "Legal", "Sales",
+    "Production", "Logistics", "Publishing", "Customer Service", "R&D",
+]
+
+REQUESTORS = [
+    "Jane Doe", "Max Mustermann", "Erika Musterfrau", "John Smith",
+    "Vladimir Keil", "Aylin Yilmaz", "Lukas Becker", "Sofia Rossi",
+]
+
+VENDOR_STEMS = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner",
+    "Becker", "Hoffmann", "Acme", "Globex", "Initech", "Umbrella", "Stark",
+]
+VENDOR_SUFFIXES = ["GmbH", "AG", "GmbH & Co. KG", "Ltd", "Inc", "SE"]
+
+# Commodity group -> (item description, unit, min price, max price).
+CATALOGUE: Dict[str, List[Tuple[str, str, int, int]]] = {
+    "Information Technology - Hardware": [
+        ("ThinkPad T14 Gen 4, 16 GB RAM", "Stk", 900, 1900),
+        ("Dell UltraSharp U2723QE Monitor", "Stk", 380, 720),
+        ("USB-C Dockingstation", "Stk", 120, 320),
+        ("Logitech MX Keys Tastatur", "Stk", 80, 130),
+    ],
+    "Information Technology - Software": [
+        ("Adobe Creative Cloud Lizenz (12 Monate)", "Lizenzen", 600, 900),
+        ("Microsoft 365 Business Premium", "Lizenzen", 200, 280),
+        ("Jira Software Cloud Standard", "Users", 80, 120),
+    ],
+    "Information Technology - IT Services": [
+        ("Managed Hosting Tarif M", "Monate", 150, 900),
+        ("IT-Support Stundenkontingent", "Std", 85, 140),
+    ],
+    "Facility Management - Office Equipment": [
+        ("Bürostuhl ergonomisch", "Stk", 250, 900),
+        ("Höhenverstellbarer Schreibtisch", "Stk", 400, 1200),
+        ("Büromaterial Paket", "Pakete", 20, 80),
+    ],
+    "Facility Management - Cleaning": [
+        ("Unterhaltsreinigung Büroflächen", "Monate", 900, 4000),
+        ("Glasreinigung Fassade", "Einsätze", 300, 1500),
+    ],
+    "Facility Management - Cafeteria and Kitchenettes": [
+        ("Kaffeebohnen Espresso 1kg", "kg", 15, 35),
+        ("Wasserspender Miete", "Monate", 30, 90),
+    ],
+    "Marketing & Advertising - Online Marketing": [
+        ("Google Ads Kampagne Q3", "Pauschal", 2000, 20000),
+        ("LinkedIn Sponsored Content", "Pauschal", 1000, 8000),
+    ],
+    "Marketing & Advertising - Events": [
+        ("Messestand 20 qm inkl. Aufbau", "Pauschal", 5000, 25000),
+        ("Catering für 50 Personen", "Personen", 25, 60),
+    ],
+    "Marketing & Advertising - Promotional Materials": [
+        ("Roll-up Banner 85x200", "Stk", 80, 200),
+        ("Werbeartikel Tassen mit Logo", "Stk", 4, 12),
+    ],
+    "Publishing Production - Printing Costs": [
+        ("Druck Broschüre A4, 32 Seiten", "Stk", 1, 4),
+        ("Flyer DIN lang, 4/4-farbig", "Stk", 0, 1),
+    ],
+    "Logistics - Courier, Express, and Postal Services": [
+        ("Kurierfahrt Express", "Fahrten", 40, 180),
+        ("DHL Paketversand national", "Pakete", 5, 15),
+    ],
+    "Production - Consumables": [
+        ("Nitril-Handschuhe, Box à 100", "Boxen", 6, 15),
+        ("Schrauben M6x20 verzinkt", "Pakete", 5, 20),
+    ],
+    "General Services - Professional Development": [
+        ("Schulung Projektmanagement (2 Tage)", "Teilnehmer", 800, 2000),
+        ("Online-Kurs Datenanalyse", "Teilnehmer", 150, 600),
+    ],
+    "General Services - Consulting": [
+        ("Beratung Prozessoptimierung", "Tage", 900, 1800),
+    ],
+}
+GROUPS = list(CATALOGUE)
+
+
+def _vendor(rng: random.Random) -> str:
+    # Zipf-like skew: a few vendors get most of the orders.
+    index = min(int(rng.paretovariate(1.2)) - 1, len(VENDOR_STEMS) * len(VENDOR_SUFFIXES) - 1)
+    stem = VENDOR_STEMS[index % len(VENDOR_STEMS)]
+    suffix = VENDOR_SUFFIXES[index // len(VENDOR_STEMS) % len(VENDOR_SUFFIXES)]
+    return f"{stem} {suffix}"
+
+
+def synthetic_payload(rng: random.Random, number: int) -> ProcurementRequestCreate:
+    """One request; ``number`` keeps titles unique for search benchmarks."""
+    group = rng.choice(GROUPS)
+    items = CATALOGUE[group]
+    lines: List[OrderLine] = []
+    for _ in range(rng.choices((1, 2, 3, 5, 8), weights=(40, 25, 20, 10, 5))[0]):
+        description, unit, low, high = rng.choice(items)
+        unit_price = Decimal(rng.randint(low * 100, max(high, low + 1) * 100)) / 100
+        amount = rng.choice((1, 1, 2, 3, 5, 10, 25, 100))
+        lines.append(
+            OrderLine(
+                position_description=description,
+                unit_price=unit_price,
+                amount=amount,
+                unit=unit,
+                total_price=unit_price * amount,
+            )
+        )
+    total = sum((line.total_price for line in lines), Decimal("0"))
+    return ProcurementRequestCreate(
+        requestor_name=rng.choice(REQUESTORS),
+        title=f"{lines[0].position_description} #{number}",
+        vendor_name=_vendor(rng),
+        vendor_vat_id=f"DE{rng.randrange(10**8, 10**9)}",
+        department=rng.choice(DEPARTMENTS),
+        commodity_group=group,
+        order_lines=lines,
+        total_cost=total,
+    )
+
+
+def synthetic_payloads(count: int, seed: int = 42) -> Iterator[ProcurementRequestCreate]:
+    rng = random.Random(seed)
+    for number in range(count):
+        yield synthetic_payload(rng, number)
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.request import ProcurementRequestCreate
+from app.models.status import RequestStatus
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.threaded import ThreadedAsyncRequestRepository
+from app.services.commodity_service import CommodityService
+from app.services.request_service import AsyncRequestService
+
+
+def _payload(title: str) -> ProcurementRequestCreate:
+    return ProcurementRequestCreate(
+        requestor_name="Jane Doe",
+        title=title,
+        vendor_name="Acme",
+        vendor_vat_id="DE123456789",
+        department="IT",
+        order_lines=[],
+        total_cost="0",
+    )
+
+
+class SlowRepository(InMemoryRequestRepository):
+    def list(self, *args, **kwargs):
+        time.sleep(0.2)
+        return super().list(*args, **kwargs)
+
+
+def test_blocking_repository_calls_do_not_stall_the_event_loop() -> None:
+    service = AsyncRequestService(
+        repository=ThreadedAsyncRequestRepository(SlowRepository()),
+        commodity_service=CommodityService(),
+    )
+
+    async def scenario() -> int:
+        ticks = 0
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        created = await service.create_request(_payload("Laptops"))
+        task = asyncio.create_task(ticker())
+        assert [r.id for r in await service.list_requests()] == [created.id]
+        task.cancel()
+        updated = await service.update_status(created.id, RequestStatus.CLOSED)
+        assert updated is not None and updated.status is RequestStatus.CLOSED
+        return ticks
+
+    assert asyncio.run(scenario()) >= 5
+
+
+def test_in_memory_repository_is_safe_across_threads() -> None:
+    repo = InMemoryRequestRepository()
+
+    def worker(offset: int) -> None:
+        for i in range(200):
+            created = repo.create(_payload(f"Request {offset}-{i}"))
+            if i % 2:
+                created.status = RequestStatus.IN_PROGRESS
+                repo.update(created)
+            repo.list(status_filter=RequestStatus.OPEN)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(8)))
+
+    assert len(repo.list()) == 1600
+    assert len(repo.list(status_filter=RequestStatus.IN_PROGRESS)) == 800
+    assert len(repo.list(search="request 3-1")) == 111
@@ -0,0 +1,142 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequestCreate
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.services import commodity_model
+from app.services.commodity_model import CommodityModel, request_text
+from app.services.commodity_service import CommodityService
+from app.services.request_service import get_request_repository
+
+EXAMPLES = {
+    "Information Technology - Hardware": ["ThinkPad T14", "Dell UltraSharp 27"],
+    "Facility Management - Cafeteria and Kitchenettes": ["Espresso beans", "Oat milk"],
+}
+
+
+def _payload(title: str, line: str, group=None) -> ProcurementRequestCreate:
+    return ProcurementRequestCreate(
+        requestor_name="Jane Doe",
+        title=title,
+        vendor_name="Acme GmbH",
+        vendor_vat_id="DE123456789",
+        department="IT",
+        commodity_group=group,
+        order_lines=[
+            OrderLine(
+                position_description=line,
+                unit_price=10,
+                amount=1,
+                unit="Stk",
+                total_price=10,
+            )
+        ],
+        total_cost=10,
+    )
+
+
+def _training_set():
+    return [
+        _payload(f"Order {i}", line, group)
+        for group, lines in EXAMPLES.items()
+        for i in range(5)
+        for line in lines
+    ]
+
+
+def test_model_round_trips_and_classifies_in_batches(tmp_path) -> None:
+    requests = _training_set()
+    model = CommodityModel.train(
+        [request_text(r) for r in requests], [r.commodity_group for r in requests]
+    )
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = CommodityModel.load(path)
+
+    assert loaded.labels == sorted(EXAMPLES)
+    assert loaded.examples == len(requests)
+    predictions = loaded.predict(["thinkpad t14 gen 4", "espresso beans 1kg"])
+    assert [group for group, _ in predictions] == [
+        "Information Technology - Hardware",
+        "Facility Management - Cafeteria and Kitchenettes",
+    ]
+    assert all(0 < score <= 1.0001 for _, score in predictions)
+
+
+def test_service_prefers_a_confident_model_and_falls_back_to_keywords() -> None:
+    requests = _training_set()
+    model = CommodityModel.train(
+        [request_text(r) for r in requests], [r.commodity_group for r in requests]
+    )
+    service = CommodityService(model=model, min_model_score=0.3)
+    suggestions = service.suggest_for_requests(
+        [
+            # No keyword matches this, but the model has seen it.
+            _payload("Order 99", "Oat milk"),
+            # Unlike anything in the training set: the keyword rules decide.
+            _payload("Google Ads campaign", "Search ads budget"),
+        ]
+    )
+    assert suggestions == [
+        "Facility Management - Cafeteria and Kitchenettes",
+        "Marketing & Advertising - Online Marketing",
+    ]
+
+
+def test_service_threshold_defaults_to_the_setting(monkeypatch) -> None:
+    requests = _training_set()
+    model = CommodityModel.train(
+        [request_text(r) for r in requests], [r.commodity_group for r in requests]
+    )
+    oat_milk = _payload("Order 99", "Oat milk")
+    monkeypatch.setattr(settings, "commodity_model_min_score", 1.01)
+    assert CommodityService(model=model).suggest_for_request(oat_milk) == "Other"
+    monkeypatch.setattr(settings, "commodity_model_min_score", 0.3)
+    assert (
+        CommodityService(model=model).suggest_for_request(oat_milk)
+        == "Facility Management - Cafeteria and Kitchenettes"
+    )
+
+
+def test_training_skips_other_and_unknown_groups() -> None:
+    requests = _training_set() + [
+        _payload("Order 7", "Office 365 licences", "IT - Software"),
+        _payload("Order 8", "Misc", "Other"),
+    ]
+    model = commodity_model.train_from_requests(requests, min_examples=1)
+    assert model.labels == sorted(EXAMPLES)
+    assert model.examples == len(requests) - 2
+
+
+def test_train_endpoint_uses_stored_requests(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "commodity_model_path", str(tmp_path / "model.npz"))
+    monkeypatch.setattr(settings, "commodity_model_min_examples", 10)
+    monkeypatch.setattr(commodity_model, "_COMMODITY_MODEL", None)
+    monkeypatch.setattr(commodity_model, "_COMMODITY_MODEL_MTIME", None)
+    repo = InMemoryRequestRepository()
+
+    def unpaged_list(*args, **kwargs):
+        raise AssertionError("training must page through the store")
+
+    monkeypatch.setattr(repo, "list", unpaged_list)
+    app.dependency_overrides[get_request_repository] = lambda: repo
+    client = TestClient(app)
+    try:
+        assert client.get("/api/commodity-model").status_code == 404
+        repo.create(
+            _payload("Order 1", "Oat milk", "Facility Management - Cafeteria and Kitchenettes")
+        )
+        assert client.post("/api/commodity-model/train").status_code == 400
+
+        repo.create_many(_training_set())
+        response = client.post("/api/commodity-model/train")
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["examples"] == 21
+        assert body["groups"] == sorted(EXAMPLES)
+        assert body["size_bytes"] > 0
+        assert commodity_model.get_commodity_model() is not None
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,81 @@
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequestCreate
+from app.services.commodity_keywords import COMMODITY_KEYWORDS
+from app.services.commodity_service import (
+    COMMODITY_GROUPS_PROMPT,
+    CommodityService,
+    KeywordClassifier,
+)
+
+
+def _payload(title: str, *lines: str) -> ProcurementRequestCreate:
+    return ProcurementRequestCreate(
+        requestor_name="Jane Doe",
+        title=title,
+        vendor_name="Acme GmbH",
+        vendor_vat_id="DE123456789",
+        department="IT",
+        order_lines=[
+            OrderLine(
+                position_description=line,
+                unit_price=10,
+                amount=1,
+                unit="Stk",
+                total_price=10,
+            )
+            for line in lines
+        ],
+        total_cost=10 * len(lines),
+    )
+
+
+def test_keyword_table_covers_every_commodity_group() -> None:
+    assert set(COMMODITY_KEYWORDS) == set(COMMODITY_GROUPS_PROMPT) - {"Other"}
+
+
+def test_suggestions_score_keywords_across_fields() -> None:
+    service = CommodityService()
+    assert (
+        service.suggest_for_request(_payload("Adobe Creative Cloud", "Lizenzen 2025"))
+        == "Information Technology - Software"
+    )
+    assert (
+        service.suggest_for_request(_payload("Neue Drucker", "HP LaserJet"))
+        == "Information Technology - Hardware"
+    )
+    assert (
+        service.suggest_for_request(_payload("Druckkosten Broschüre", "Auflage 5000"))
+        == "Publishing Production - Printing Costs"
+    )
+    # The title outweighs a single weaker order-line hint.
+    assert (
+        service.suggest_for_request(_payload("Messestand Frankfurt", "Catering"))
+        == "Marketing & Advertising - Events"
+    )
+    # German compounds match keywords inside the word, as plain substrings did.
+    assert (
+        service.suggest_for_request(_payload("Firmenlaptop"))
+        == "Information Technology - Hardware"
+    )
+    assert (
+        service.suggest_for_request(_payload("Laserdrucker HP"))
+        == "Information Technology - Hardware"
+    )
+    assert (
+        service.suggest_for_request(_payload("Gebäudereinigung"))
+        == "Facility Management - Cleaning"
+    )
+    assert service.suggest_for_request(_payload("Quarterly misc", "Item")) == "Other"
+
+
+def test_short_keywords_only_match_whole_words() -> None:
+    classifier = KeywordClassifier({"Courier": {"ups": 1}, "Software": {"software": 1}})
+    assert classifier.classify([("Upstream fees", 1)]) is None
+    assert classifier.classify([("UPS Express", 1)]) == "Courier"
+    assert classifier.classify([("Softwarelizenzen", 1)]) == "Software"
+    assert classifier.classify([("Groupsoftware", 1)]) == "Software"
+    assert classifier.classify([("Setups", 1)]) is None
+    assert classifier.scores([("ups, UPS and software", 2)]) == {
+        "Courier": 4,
+        "Software": 2,
+    }
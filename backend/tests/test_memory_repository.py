@@ -0,0 +1,181 @@
+from decimal import Decimal
+
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequestCreate
+from app.models.status import RequestStatus
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.pagination import RequestSortField
+
+
+def _payload(title: str, department: str) -> ProcurementRequestCreate:
+    return ProcurementRequestCreate(
+        requestor_name="Jane Doe",
+        title=title,
+        vendor_name="Acme",
+        vendor_vat_id="DE123456789",
+        department=department,
+        order_lines=[],
+        total_cost="0",
+    )
+
+
+def test_filters_follow_status_changes_written_by_update() -> None:
+    repo = InMemoryRequestRepository()
+    first = repo.create(_payload("Laptops", "IT"))
+    second = repo.create(_payload("Chairs", "Facilities"))
+    third = repo.create(_payload("Monitors", "it"))
+
+    assert [r.id for r in repo.list(department="IT")] == [first.id, third.id]
+
+    # Records are handed out as copies: a change counts once update() stores it.
+    first.status = RequestStatus.CLOSED
+    assert repo.list(status_filter=RequestStatus.CLOSED) == []
+    repo.update(first)
+
+    assert [r.id for r in repo.list(status_filter=RequestStatus.OPEN)] == [
+        second.id,
+        third.id,
+    ]
+    assert [
+        r.id for r in repo.list(status_filter=RequestStatus.CLOSED, department="it")
+    ] == [first.id]
+    assert repo.list(status_filter=RequestStatus.IN_PROGRESS) == []
+    assert [r.id for r in repo.list(department="it", search="mon")] == [third.id]
+    assert len(repo.list()) == 3
+
+
+def test_search_covers_vat_ids_and_order_lines_ranked_by_field() -> None:
+    repo = InMemoryRequestRepository()
+    in_line = repo.create(
+        _payload("Office equipment", "IT").model_copy(
+            update={
+                "order_lines": [
+                    OrderLine(
+                        position_description="Dell Monitor 27 inch",
+                        unit_price="200",
+                        amount=1,
+                        unit="Stk",
+                        total_price="200",
+                    )
+                ]
+            }
+        )
+    )
+    in_title = repo.create(_payload("Monitor arms", "IT"))
+    repo.create(_payload("Chairs", "Facilities"))
+
+    assert [r.id for r in repo.list(search="monitor")] == [in_title.id, in_line.id]
+    assert [r.id for r in repo.list(search="dell 27")] == [in_line.id]
+    assert len(repo.list(search="de123456789")) == 3
+    assert repo.list(search="printer") == []
+
+    in_title.title = "Desk lamps"
+    repo.update(in_title)
+    assert [r.id for r in repo.list(search="monitor")] == [in_line.id]
+
+
+def test_list_page_follows_updates_and_search_relevance() -> None:
+    repo = InMemoryRequestRepository()
+    created = [repo.create(_payload(f"Laptop {i}", "IT")) for i in range(3)]
+    repo.create(_payload("Laptop bag", "HR"))
+
+    created[0].status = RequestStatus.CLOSED
+    repo.update(created[0])
+    page, cursor = repo.list_page(RequestSortField.UPDATED_AT, descending=True, limit=1)
+    assert [r.id for r in page] == [created[0].id]
+
+    page, cursor = repo.list_page(
+        RequestSortField.RELEVANCE, limit=2, search="laptop", department="it"
+    )
+    rest, last = repo.list_page(
+        RequestSortField.RELEVANCE, limit=2, cursor=cursor, search="laptop", department="it"
+    )
+    assert [r.id for r in page + rest] == [r.id for r in created]
+    assert last is None
+
+
+def _walk_pages(repo: InMemoryRequestRepository, sort: RequestSortField, **filters) -> list:
+    ids, cursor = [], None
+    while True:
+        page, cursor = repo.list_page(sort, limit=3, cursor=cursor, **filters)
+        ids.extend(r.id for r in page)
+        if cursor is None:
+            return ids
+
+
+def test_filtered_and_searched_pages_walk_in_order_and_see_writes() -> None:
+    repo = InMemoryRequestRepository()
+    created = [
+        repo.create(
+            _payload("Laptop" if i % 3 == 0 else "Chair", "IT" if i % 2 else "HR").model_copy(
+                update={"total_cost": Decimal(100 - i)}
+            )
+        )
+        for i in range(40)
+    ]
+    laptops = [r for r in created if r.title == "Laptop"]
+    chairs = [r for r in created if r.title == "Chair"]
+
+    # Selective (ordered once and cached) and broad (walked from the index) matches.
+    assert _walk_pages(repo, RequestSortField.TOTAL_COST, search="laptop") == [
+        r.id for r in reversed(laptops)
+    ]
+    assert _walk_pages(repo, RequestSortField.TOTAL_COST, search="chair") == [
+        r.id for r in reversed(chairs)
+    ]
+    assert _walk_pages(
+        repo, RequestSortField.CREATED_AT, search="chair", department="it"
+    ) == [r.id for r in chairs if r.department == "IT"]
+
+    # A write between pages is visible on the next page of the same query.
+    laptops = laptops[:4]
+    for laptop in created[12:]:
+        repo.update(laptop.model_copy(update={"title": "Desk"}))
+    page, cursor = repo.list_page(RequestSortField.CREATED_AT, limit=2, search="laptop")
+    renamed = laptops[-1].model_copy(update={"title": "Monitor"})
+    repo.update(renamed)
+    rest, _ = repo.list_page(
+        RequestSortField.CREATED_AT, limit=100, cursor=cursor, search="laptop"
+    )
+    assert [r.id for r in page + rest] == [r.id for r in laptops[:-1]]
+
+
+def test_compact_storage_round_trips_requests_and_hands_out_copies() -> None:
+    repo = InMemoryRequestRepository()
+    lines = [
+        OrderLine(
+            position_description="Moosbild",
+            unit_price="559.00",
+            amount="1.28",
+            unit="qm",
+            total_price="715.52",
+        ),
+        OrderLine(
+            position_description="Versand",
+            unit_price="5",
+            amount=1,
+            unit="Pcs",
+            total_price="5",
+        ),
+    ]
+    created = repo.create(
+        _payload("Moss wall", "Facilities").model_copy(
+            update={"order_lines": lines, "total_cost": Decimal("720.52")}
+        )
+    )
+
+    stored = repo.get(created.id)
+    assert stored == created
+    # Amounts keep their scale, so the JSON output is unchanged.
+    assert stored.model_dump_json() == created.model_dump_json()
+
+    stored.title = "Changed without update"
+    assert repo.get(created.id).title == "Moss wall"
+
+    repo.create(_payload("Cheap", "Facilities"))
+    page, cursor = repo.list_page(RequestSortField.TOTAL_COST, descending=True, limit=1)
+    assert [r.id for r in page] == [created.id]
+    rest, _ = repo.list_page(
+        RequestSortField.TOTAL_COST, descending=True, limit=1, cursor=cursor
+    )
+    assert [r.title for r in rest] == ["Cheap"]
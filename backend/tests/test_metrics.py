@@ -0,0 +1,86 @@
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.clients.openai_client import OpenAIClient
+from app.clients.openai_responses import responses_payload
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+from app.main import app
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.services.request_service import get_request_repository
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_registry_renders_prometheus_text_format() -> None:
+    registry = MetricsRegistry()
+    hits = registry.register(Counter("hits_total", "Hits.", ("route",)))
+    latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+    hits.labels('/a"b').inc(2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    text = registry.render()
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{route="/a\\"b"} 2' in text
+    assert 'latency_seconds_bucket{le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{le="1"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+    assert _sample(text, "latency_seconds_sum") == pytest.approx(3.65)
+
+
+def test_metrics_endpoint_reports_routes_repository_and_list_timings() -> None:
+    repo = InMemoryRequestRepository()
+    app.dependency_overrides[get_request_repository] = lambda: repo
+    client = TestClient(app)
+    try:
+        before = client.get("/metrics").text
+        client.get("/api/requests", params={"status_filter": "Open"})
+        client.get("/api/requests/00000000-0000-0000-0000-000000000000")
+        response = client.get("/metrics")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    route = 'method="GET",route="/api/requests/{request_id}"'
+    key = f'http_requests_total{{{route},status="404"}}'
+    assert _sample(text, key) == _sample(before, key) + 1
+    assert f"http_request_duration_seconds_count{{{route}}}" in text
+    assert 'http_requests_in_flight{method="GET",route="/metrics"} 1' in text
+    assert "request_repository_requests 0" in text
+    assert (
+        'request_repository_list_seconds_count{operation="list_page",filters="status"}'
+        in text
+    )
+
+
+@pytest.mark.asyncio
+async def test_openai_client_records_stage_timings_and_token_usage() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = responses_payload(json.dumps({"order_lines": []}), 120, 30)
+        return httpx.Response(200, json=body)
+
+    client = OpenAIClient(
+        api_key="test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    try:
+        await client.extract_offer_from_pdf(b"%PDF-1.4")
+    finally:
+        await client.aclose()
+
+    text = TestClient(app).get("/metrics").text
+    assert 'openai_tokens_total{model="fake-model",kind="input"} 120' in text
+    assert 'openai_tokens_total{model="fake-model",kind="output"} 30' in text
+    for stage in ("base64_encode", "openai_roundtrip", "json_parse"):
+        assert f'offer_extraction_stage_seconds_count{{stage="{stage}"}}' in text
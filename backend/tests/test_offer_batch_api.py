@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.offer_extraction_service import (
+    OfferExtractionService,
+    get_offer_extraction_service,
+)
+
+
+class FakeOpenAIClient:
+    async def extract_offer_from_pdf(self, pdf, filename: str = "offer.pdf"):
+        if filename == "broken.pdf":
+            raise RuntimeError("boom")
+        return {"vendor_name": filename, "order_lines": []}
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    service = OfferExtractionService(openai_client=FakeOpenAIClient())
+    app.dependency_overrides[get_offer_extraction_service] = lambda: service
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_batch_streams_one_line_per_file(client: TestClient) -> None:
+    files = [
+        ("files", ("a.pdf", b"%PDF-1.4 a", "application/pdf")),
+        ("files", ("notes.txt", b"hello", "text/plain")),
+        ("files", ("broken.pdf", b"%PDF-1.4 b", "application/pdf")),
+    ]
+
+    response = client.post("/api/offers/parse/batch", files=files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = {
+        item["index"]: item
+        for item in (json.loads(line) for line in response.text.splitlines())
+    }
+    assert lines[0]["status"] == "ok"
+    assert lines[0]["result"]["vendor_name"] == "a.pdf"
+    assert lines[1]["status"] == "error"
+    assert lines[2] == {
+        "index": 2,
+        "filename": "broken.pdf",
+        "status": "error",
+        "error": "Failed to parse offer document.",
+    }
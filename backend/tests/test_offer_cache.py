@@ -0,0 +1,83 @@
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from app.services.offer_cache import OfferExtractionCache, build_cache_key
+from app.services.offer_extraction_service import OfferExtractionService
+
+
+class CountingOpenAIClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def extract_offer_from_pdf(self, pdf_bytes: bytes, filename: str = "offer.pdf"):
+        self.calls += 1
+        return {
+            "vendor_name": "Acme Corp",
+            "order_lines": [
+                {
+                    "position_description": "Adobe Creative Cloud",
+                    "unit_price": 50,
+                    "amount": 2,
+                    "unit": "licenses",
+                    "total_price": 100,
+                }
+            ],
+            "total_cost": 100,
+        }
+
+
+def _upload(content: bytes) -> UploadFile:
+    return UploadFile(
+        filename="offer.pdf",
+        file=BytesIO(content),
+        headers={"content-type": "application/pdf"},
+    )
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = OfferExtractionCache(max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries_after_ttl() -> None:
+    cache = OfferExtractionCache(ttl_seconds=-1)
+    cache.set("a", {"v": 1})
+    assert cache.get("a") is None
+    assert cache.misses == 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path) -> None:
+    OfferExtractionCache(directory=str(tmp_path)).set("k" * 64, {"v": 1})
+
+    fresh = OfferExtractionCache(directory=str(tmp_path))
+    assert fresh.get("k" * 64) == {"v": 1}
+    assert fresh.disk_hits == 1
+
+
+def test_cache_key_depends_on_model_and_prompt_version() -> None:
+    assert build_cache_key("abc", "m1", "1") != build_cache_key("abc", "m2", "1")
+    assert build_cache_key("abc", "m1", "1") != build_cache_key("abc", "m1", "2")
+
+
+@pytest.mark.asyncio
+async def test_service_serves_repeated_upload_from_cache() -> None:
+    client = CountingOpenAIClient()
+    cache = OfferExtractionCache()
+    service = OfferExtractionService(openai_client=client, cache=cache)
+
+    first = await service.extract(_upload(b"%PDF-1.4 same bytes"))
+    second = await service.extract(_upload(b"%PDF-1.4 same bytes"))
+    await service.extract(_upload(b"%PDF-1.4 same bytes"), use_cache=False)
+
+    assert first == second
+    assert client.calls == 2
+    assert cache.stats()["hits"] == 1
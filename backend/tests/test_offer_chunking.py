@@ -0,0 +1,149 @@
+import asyncio
+import io
+from decimal import Decimal
+
+import pytest
+from pypdf import PdfWriter
+
+from app.models.offer import OfferExtractionResult
+from app.models.order_line import OrderLine
+from app.services.offer_chunking import merge_chunk_results, page_groups
+from app.services.offer_extraction_service import OfferExtractionService
+
+
+def _line(description: str, price: float, amount: float = 1) -> OrderLine:
+    return OrderLine(
+        position_description=description,
+        unit_price=price,
+        amount=amount,
+        unit="Stk",
+        total_price=price * amount,
+    )
+
+
+def test_page_groups_cover_every_page() -> None:
+    assert page_groups(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert page_groups(0, 4) == []
+
+
+def test_merge_drops_carry_over_lines_and_reconciles_total() -> None:
+    first = OfferExtractionResult(
+        vendor_name="Acme GmbH",
+        order_lines=[_line("Laptop", 1000), _line("Dock", 200)],
+    )
+    second = OfferExtractionResult(
+        vendor_vat_id="DE123456789",
+        order_lines=[_line(" dock ", 200), _line("Monitor", 300, 2)],
+        total_cost=1800,
+    )
+
+    merged = merge_chunk_results([first, second])
+
+    assert merged.vendor_name == "Acme GmbH"
+    assert merged.vendor_vat_id == "DE123456789"
+    assert [line.position_description for line in merged.order_lines] == [
+        "Laptop",
+        "Dock",
+        "Monitor",
+    ]
+    assert merged.total_cost == Decimal("1800")
+
+
+def test_merge_keeps_repeated_positions_away_from_the_page_break() -> None:
+    merged = merge_chunk_results(
+        [
+            OfferExtractionResult(order_lines=[_line("Cable", 10), _line("Cable", 10)]),
+            OfferExtractionResult(order_lines=[_line("Dock", 200), _line("Cable", 10)]),
+            OfferExtractionResult(order_lines=[], total_cost=230),
+        ]
+    )
+
+    assert [line.position_description for line in merged.order_lines] == [
+        "Cable",
+        "Cable",
+        "Dock",
+        "Cable",
+    ]
+    assert merged.total_cost == Decimal("230")
+
+
+def test_merge_keeps_stated_total_when_lines_disagree() -> None:
+    merged = merge_chunk_results(
+        [
+            OfferExtractionResult(order_lines=[_line("Laptop", 1000)]),
+            OfferExtractionResult(order_lines=[], total_cost=1190),
+        ]
+    )
+    assert merged.total_cost == Decimal("1190")
+
+
+class RecordingClient:
+    def __init__(self) -> None:
+        self.filenames = []
+        self.notes = []
+
+    async def extract_offer_from_pdf(self, pdf, filename, note=None):
+        self.filenames.append(filename)
+        self.notes.append(note)
+        await asyncio.sleep(0)
+        return {
+            "vendor_name": "Acme GmbH",
+            "order_lines": [
+                {"position_description": filename, "unit_price": 10, "amount": 1}
+            ],
+        }
+
+
+def test_long_scanned_offer_is_split_into_page_chunks(monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "offer_chunk_min_pages", 4)
+    monkeypatch.setattr(settings, "offer_chunk_pages", 3)
+
+    writer = PdfWriter()
+    for _ in range(7):
+        writer.add_blank_page(width=200, height=200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    client = RecordingClient()
+    service = OfferExtractionService(openai_client=client)  # type: ignore[arg-type]
+    result = asyncio.run(service.extract_bytes(buffer.getvalue(), "offer.pdf"))
+
+    assert sorted(client.filenames) == [
+        "offer_p1-3.pdf",
+        "offer_p4-6.pdf",
+        "offer_p7-7.pdf",
+    ]
+    assert all("of 7" in note and "total_cost" in note for note in client.notes)
+    assert len(result.order_lines) == 3
+    assert result.total_cost == Decimal("30")
+
+
+def test_failed_chunk_cancels_its_siblings(monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "offer_chunk_min_pages", 2)
+    monkeypatch.setattr(settings, "offer_chunk_pages", 1)
+    cancelled = []
+
+    class FailingFirstChunk:
+        async def extract_offer_from_pdf(self, pdf, filename, note=None):
+            if filename.endswith("_p1-1.pdf"):
+                raise RuntimeError("chunk failed")
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(filename)
+                raise
+
+    writer = PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+
+    service = OfferExtractionService(openai_client=FailingFirstChunk())  # type: ignore[arg-type]
+    with pytest.raises(RuntimeError, match="chunk failed"):
+        asyncio.run(service.extract_bytes(buffer.getvalue(), "offer.pdf"))
+    assert sorted(cancelled) == ["offer_p2-2.pdf", "offer_p3-3.pdf"]
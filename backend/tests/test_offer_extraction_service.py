@@ -1,38 +1,48 @@
+import json
 from io import BytesIO
 
+import httpx
 import pytest
 from fastapi import UploadFile
 
+from app.clients.openai_client import OpenAIClient
+from app.clients.openai_responses import responses_payload
+from app.core.config import settings
 from app.services.offer_extraction_service import OfferExtractionService
 
-
-class FakeOpenAIClient:
-    def extract_offer(self, offer_text: str):
-        return {
-            "vendor_name": "Acme Corp",
-            "vendor_vat_id": "DE123",
-            "department": "IT",
-            "title": "Adobe License",
-            "order_lines": [
-                {
-                    "position_description": "Adobe Creative Cloud",
-                    "unit_price": 49.99,
-                    "amount": 2,
-                    "unit": "licenses",
-                    "total_price": 99.98,
-                }
-            ],
-            "total_cost": 99.98,
-            "commodity_group_suggestion": "IT - Software",
+EXTRACTED = {
+    "vendor_name": "Acme Corp",
+    "vendor_vat_id": "DE123",
+    "department": "IT",
+    "title": "Adobe License",
+    "order_lines": [
+        {
+            "position_description": "Adobe Creative Cloud",
+            "unit_price": 49.99,
+            "amount": 2,
+            "unit": "licenses",
+            "total_price": 99.98,
         }
+    ],
+    "total_cost": 99.98,
+    "commodity_group_suggestion": "IT - Software",
+}
 
 
 @pytest.mark.asyncio
 async def test_offer_extraction_service_maps_response(monkeypatch) -> None:
-    service = OfferExtractionService(openai_client=FakeOpenAIClient())
-    monkeypatch.setattr(
-        service, "_extract_pdf_text", lambda _: "Dummy PDF text for extraction"
+    # The real client against a stubbed Responses API, so the test follows its interface.
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=responses_payload(json.dumps(EXTRACTED)))
+
+    monkeypatch.setattr(settings, "offer_chunking_enabled", False)
+    client = OpenAIClient(
+        api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
     )
+    service = OfferExtractionService(openai_client=client)
 
     dummy_pdf = BytesIO(b"%PDF-1.4\n% test pdf bytes")
     upload = UploadFile(
@@ -41,7 +51,16 @@ async def test_offer_extraction_service_maps_response(monkeypatch) -> None:
         headers={"content-type": "application/pdf"},
     )
 
-    result = await service.extract(upload)
+    try:
+        result = await service.extract(upload)
+    finally:
+        await client.aclose()
+
+    # Without a readable text layer the file itself is sent.
+    assert len(requests) == 1
+    content = requests[0]["input"][0]["content"]
+    assert content[0]["type"] == "input_file"
+    assert content[0]["filename"] == "dummy.pdf"
 
     assert result.vendor_name == "Acme Corp"
     assert result.vendor_vat_id == "DE123"
@@ -0,0 +1,131 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.offer import OfferExtractionResult
+from app.services.offer_job_service import OfferJobManager, get_offer_job_manager
+
+
+class StubExtractionService:
+    async def extract_upload(self, upload, use_cache: bool = True):
+        if b"broken" in upload.read_bytes():
+            raise RuntimeError("boom")
+        return OfferExtractionResult(vendor_name="Acme Corp", order_lines=[])
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    manager = OfferJobManager(service_factory=StubExtractionService, workers=2)
+    app.dependency_overrides[get_offer_job_manager] = lambda: manager
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+def _pdf(content: bytes = b"%PDF-1.4 test") -> dict:
+    return {"file": ("offer.pdf", content, "application/pdf")}
+
+
+def test_job_can_be_polled_until_finished(client: TestClient) -> None:
+    submit = client.post("/api/offers/jobs", files=_pdf())
+    assert submit.status_code == 202, submit.text
+    job_id = submit.json()["id"]
+
+    poll = client.get(f"/api/offers/jobs/{job_id}", params={"wait": 5})
+    assert poll.status_code == 200
+    body = poll.json()
+    assert body["status"] == "succeeded"
+    assert body["result"]["vendor_name"] == "Acme Corp"
+
+
+def test_job_events_stream_ends_with_terminal_state(client: TestClient) -> None:
+    job_id = client.post("/api/offers/jobs", files=_pdf(b"%PDF broken")).json()["id"]
+
+    with client.stream("GET", f"/api/offers/jobs/{job_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            line.removeprefix("event: ")
+            for line in response.iter_lines()
+            if line.startswith("event: ")
+        ]
+
+    assert events[-1] == "failed"
+
+
+def test_sync_parse_endpoint_wraps_job(client: TestClient) -> None:
+    response = client.post("/api/offers/parse", files=_pdf())
+    assert response.status_code == 200
+    assert response.json()["vendor_name"] == "Acme Corp"
+
+    assert client.get("/api/offers/jobs/unknown").status_code == 404
+
+
+def test_finished_jobs_expire_behind_a_running_one() -> None:
+    import asyncio
+
+    from app.core.uploads import SpooledUpload
+
+    release = asyncio.Event()
+
+    class SlowOnRequest(StubExtractionService):
+        async def extract_upload(self, upload, use_cache: bool = True):
+            if b"slow" in upload.read_bytes():
+                await release.wait()
+            return await super().extract_upload(upload, use_cache)
+
+    async def scenario() -> None:
+        manager = OfferJobManager(
+            service_factory=SlowOnRequest, workers=2, ttl_seconds=0, purge_interval=0.01
+        )
+        slow = await manager.submit(SpooledUpload.from_bytes(b"%PDF slow", "slow.pdf"))
+        fast = await manager.submit(SpooledUpload.from_bytes(b"%PDF fast", "fast.pdf"))
+        assert (await manager.wait(fast.id, timeout=5)).status == "succeeded"
+        await asyncio.sleep(0.05)
+        # The purge timer dropped the finished job; the running one stays.
+        assert manager.get(fast.id) is None
+        assert manager.get(slow.id).status == "running"
+        release.set()
+        await manager.wait(slow.id, timeout=5)
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_job_interrupted_by_stop_is_requeued_on_start() -> None:
+    import asyncio
+
+    from app.core.uploads import SpooledUpload
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    class Blocking(StubExtractionService):
+        async def extract_upload(self, upload, use_cache: bool = True):
+            started.set()
+            await release.wait()
+            return await super().extract_upload(upload, use_cache)
+
+    async def scenario() -> None:
+        manager = OfferJobManager(service_factory=Blocking, workers=1)
+        job = await manager.submit(SpooledUpload.from_bytes(b"%PDF slow", "slow.pdf"))
+        await started.wait()
+        await manager.stop()
+        assert manager.get(job.id).status == "running"
+
+        release.set()
+        await manager.start()
+        finished = await manager.wait(job.id, timeout=5)
+        assert finished.status == "succeeded"
+        assert finished.result.vendor_name == "Acme Corp"
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_sync_parse_endpoint_times_out_with_504(client: TestClient, monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "offer_parse_timeout_seconds", 0)
+    response = client.post("/api/offers/parse", files=_pdf())
+    assert response.status_code == 504
+    assert "/api/offers/jobs/" in response.json()["detail"]
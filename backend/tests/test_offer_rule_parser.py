@@ -0,0 +1,104 @@
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from app.services.offer_extraction_service import OfferExtractionService
+from app.services.offer_rule_parser import RuleBasedOfferParser, parse_decimal
+
+DOCS_DIR = Path(__file__).resolve().parents[2] / "docs"
+
+SAMPLE_OFFER = """
+Vendor Name: Global Tech Solutions
+Umsatzsteuer-Identifikationsnummer (VAT ID): DE987654321
+Offer Date: March 23, 2024
+
+Offered to: Creative Marketing Department
+
+Items Offered:
+1. Product: Adobe Photoshop License
+   Unit Price: €150
+   Quantity: 10
+   Total: €1500
+
+2. Product: Adobe Illustrator License
+   Unit Price: €120
+   Quantity: 5
+   Total: €600
+
+Total Offer Cost: €{total}
+"""
+
+
+class FailingOpenAIClient:
+    async def extract_offer(self, offer_text: str, filename: str = "offer.pdf"):
+        raise AssertionError("LLM must not be called for confident offers")
+
+    async def extract_offer_from_pdf(self, pdf_bytes: bytes, filename: str = "offer.pdf"):
+        raise AssertionError("LLM must not be called for confident offers")
+
+
+def test_parse_decimal_handles_german_and_english_formats() -> None:
+    assert parse_decimal("1.467,61") == Decimal("1467.61")
+    assert parse_decimal("1,467.61") == Decimal("1467.61")
+    assert parse_decimal("€150") == Decimal("150")
+
+
+def test_labelled_offer_is_parsed_when_totals_reconcile() -> None:
+    result = RuleBasedOfferParser().parse(SAMPLE_OFFER.format(total="2100"))
+
+    assert result is not None
+    assert result.vendor_name == "Global Tech Solutions"
+    assert result.vendor_vat_id == "DE987654321"
+    assert result.department == "Creative Marketing"
+    assert [line.total_price for line in result.order_lines] == [1500, 600]
+    assert result.total_cost == Decimal("2100")
+
+
+def test_parser_declines_when_totals_do_not_reconcile() -> None:
+    assert RuleBasedOfferParser().parse(SAMPLE_OFFER.format(total="2500")) is None
+
+
+def test_parser_declines_labelled_items_without_line_totals() -> None:
+    # Without a printed line total there is nothing to check price * quantity against.
+    offer = SAMPLE_OFFER.format(total="2100").replace("   Total: €600\n", "")
+    assert RuleBasedOfferParser().parse(offer) is None
+
+
+@pytest.mark.asyncio
+async def test_service_skips_llm_for_tabular_offer() -> None:
+    pdf = DOCS_DIR / "AngebotA0492_23.Pdf"
+    service = OfferExtractionService(
+        openai_client=FailingOpenAIClient(), rule_parser=RuleBasedOfferParser()
+    )
+
+    result = await service.extract_bytes(pdf.read_bytes(), pdf.name)
+
+    assert result.vendor_vat_id == "DE198570491"
+    assert result.requestor_name == "Vladimir Keil"
+    # Both alternatives to position 1.1 are listed but not counted.
+    assert [line.total_price for line in result.order_lines] == [
+        Decimal("1438.00"),
+        Decimal("1926.00"),
+        Decimal("1685.00"),
+        Decimal("320.00"),
+    ]
+    assert result.order_lines[1].position_description.startswith("Alternativ: ")
+    assert result.total_cost == Decimal("1758.00")
+
+
+def test_parser_declines_alternatives_priced_like_regular_rows() -> None:
+    # The alternative's row carries a total like any other, so nothing tells
+    # the parser which rows the net total includes.
+    offer = """
+Acme Moos GmbH | Hauptstr. 1 | 12345 Berlin
+1 Moosbild 160x80 1,00 Stk. 700,00 700,00
+2 Alternativ: Logo vertikal
+3 Logointegration vertikal 1,00 Stk. 430,00 430,00
+Positionen netto 700,00 €
+"""
+    parser = RuleBasedOfferParser()
+    assert parser.parse(offer) is None
+    # Without the alternative the same layout is parsed.
+    plain = "\n".join(line for line in offer.splitlines() if not line.startswith(("2 ", "3 ")))
+    assert [line.total_price for line in parser.parse(plain).order_lines] == [700]
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import httpx
+import openai
+import pytest
+
+from app.clients.openai_cassette import CassetteTransport
+from app.clients.openai_client import OpenAIClient
+from app.clients.openai_responses import responses_payload
+
+
+@pytest.mark.asyncio
+async def test_client_bounds_in_flight_requests() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        body = json.dumps({"vendor_name": "Acme Corp", "order_lines": []})
+        return httpx.Response(200, json=responses_payload(body))
+
+    client = OpenAIClient(
+        api_key="test",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        max_concurrency=2,
+    )
+    try:
+        results = await asyncio.gather(
+            *(client.extract_offer_from_pdf(b"%PDF-1.4") for _ in range(6))
+        )
+    finally:
+        await client.aclose()
+
+    assert all(r["vendor_name"] == "Acme Corp" for r in results)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_cassette_replays_recorded_responses_without_network(tmp_path) -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        body = json.dumps({"vendor_name": "Acme Corp", "order_lines": []})
+        return httpx.Response(200, json=responses_payload(body))
+
+    def client_for(mode: str, inner=None) -> OpenAIClient:
+        transport = CassetteTransport(str(tmp_path), mode, inner=inner)
+        return OpenAIClient(api_key="test", http_client=httpx.AsyncClient(transport=transport))
+
+    recorder = client_for("record", httpx.MockTransport(handler))
+    try:
+        recorded = await recorder.extract_offer_from_pdf(b"%PDF-1.4 a", "a.pdf")
+    finally:
+        await recorder.aclose()
+    assert calls == 1
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    player = client_for("replay")
+    try:
+        assert await player.extract_offer_from_pdf(b"%PDF-1.4 a", "a.pdf") == recorded
+        # Another document hashes differently and is not in the cassette.
+        with pytest.raises(openai.NotFoundError, match="No cassette recording"):
+            await player.extract_offer_from_pdf(b"%PDF-1.4 b", "a.pdf")
+    finally:
+        await player.aclose()
+    assert calls == 1
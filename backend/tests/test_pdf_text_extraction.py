@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from app.services.offer_extraction_service import OfferExtractionService
+from app.services.pdf_text import extract_page_texts, has_text_layer
+
+DOCS_DIR = Path(__file__).resolve().parents[2] / "docs"
+APPLE_QUOTE = DOCS_DIR / "Quote_1__Lio_Technologies_GmbH__1x_MBA___2212618452.pdf"
+
+
+class RecordingOpenAIClient:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def extract_offer(self, offer_text: str, filename: str = "offer.pdf"):
+        self.calls.append(("text", offer_text))
+        return {"vendor_name": "Apple", "order_lines": []}
+
+    async def extract_offer_from_pdf(self, pdf_bytes: bytes, filename: str = "offer.pdf"):
+        self.calls.append(("file", pdf_bytes))
+        return {"vendor_name": "Apple", "order_lines": []}
+
+
+def test_digital_offer_has_text_layer() -> None:
+    pages = extract_page_texts(APPLE_QUOTE.read_bytes())
+
+    assert len(pages) == 1
+    assert "MacBook Air" in pages[0]
+    assert has_text_layer(pages, min_chars_per_page=100)
+
+
+def test_blank_pages_are_treated_as_scanned() -> None:
+    assert not has_text_layer(["", "  "], min_chars_per_page=100)
+
+
+@pytest.mark.asyncio
+async def test_service_sends_text_for_digital_pdf() -> None:
+    client = RecordingOpenAIClient()
+    service = OfferExtractionService(openai_client=client)
+
+    await service.extract_bytes(APPLE_QUOTE.read_bytes(), APPLE_QUOTE.name)
+
+    kind, payload = client.calls[0]
+    assert kind == "text"
+    assert payload.startswith("--- Page 1 ---")
+    assert "Gesamtsumme" in payload
+
+
+@pytest.mark.asyncio
+async def test_service_falls_back_to_file_when_pdf_is_unreadable() -> None:
+    client = RecordingOpenAIClient()
+    service = OfferExtractionService(openai_client=client)
+
+    await service.extract_bytes(b"%PDF-1.4 not really a pdf", "broken.pdf")
+
+    assert client.calls[0][0] == "file"
@@ -0,0 +1,143 @@
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequestCreate
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.sqlite_requests import SQLiteRequestRepository
+from app.services.request_reclassification import RequestReclassifier
+from app.services.request_service import get_request_repository
+
+HARDWARE = "Information Technology - Hardware"
+SOFTWARE = "Information Technology - Software"
+
+
+def _payload(title: str, group=None) -> ProcurementRequestCreate:
+    return ProcurementRequestCreate(
+        requestor_name="Jane Doe",
+        title=title,
+        vendor_name="Acme GmbH",
+        vendor_vat_id="DE123456789",
+        department="IT",
+        commodity_group=group,
+        order_lines=[
+            OrderLine(
+                position_description=title,
+                unit_price=10,
+                amount=1,
+                unit="Stk",
+                total_price=10,
+            )
+        ],
+        total_cost=10,
+    )
+
+
+def _seed(repo) -> None:
+    repo.create_many(
+        [
+            _payload("ThinkPad laptops", "Other"),
+            _payload("Adobe licences", SOFTWARE),
+            _payload("Monitors", None),
+            _payload("Jira licences", HARDWARE),
+            _payload("Docking stations", HARDWARE),
+        ]
+    )
+
+
+def test_reclassification_writes_changes_and_reports_a_diff(tmp_path) -> None:
+    repo = InMemoryRequestRepository()
+    _seed(repo)
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    events = list(
+        RequestReclassifier(repo, checkpoint, chunk_size=2, workers=0).run()
+    )
+
+    assert [e.scanned for e in events] == [2, 4, 5, 5]
+    summary = events[-1]
+    assert summary.done and summary.total == 5 and summary.changed == 3
+    assert {(t.old, t.new, t.count) for t in summary.transitions} == {
+        ("Other", HARDWARE, 1),
+        (None, HARDWARE, 1),
+        (HARDWARE, SOFTWARE, 1),
+    }
+    assert {r.title: r.commodity_group for r in repo.list()}["Jira licences"] == SOFTWARE
+    assert not os.path.exists(checkpoint)
+
+
+def test_interrupted_run_resumes_from_its_checkpoint(tmp_path) -> None:
+    repo = InMemoryRequestRepository()
+    _seed(repo)
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    run = RequestReclassifier(repo, checkpoint, chunk_size=2, workers=0).run()
+    first = next(run)
+    run.close()
+    assert first.scanned == 2
+    assert json.load(open(checkpoint))["scanned"] == 2
+    assert RequestReclassifier(repo, checkpoint).acquire()
+
+    events = list(RequestReclassifier(repo, checkpoint, chunk_size=2, workers=0).run())
+    assert [e.scanned for e in events] == [4, 5, 5]
+    assert events[-1].resumed and events[-1].changed == 3
+
+
+def test_process_pool_run_keeps_sqlite_rollups_in_step(tmp_path) -> None:
+    repo = SQLiteRequestRepository(str(tmp_path / "requests.db"))
+    _seed(repo)
+
+    events = list(
+        RequestReclassifier(
+            repo, str(tmp_path / "checkpoint.json"), chunk_size=2, workers=2
+        ).run()
+    )
+
+    assert events[-1].changed == 3
+    groups = {b.key: b.request_count for b in repo.aggregates().by_commodity_group}
+    assert groups == {HARDWARE: 3, SOFTWARE: 2}
+    repo.close()
+
+
+def test_admin_endpoint_streams_progress(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "reclassify_checkpoint_path", str(tmp_path / "cp.json"))
+    monkeypatch.setattr(settings, "reclassify_workers", 0)
+    monkeypatch.setattr(settings, "reclassify_chunk_size", 2)
+    repo = InMemoryRequestRepository()
+    _seed(repo)
+    app.dependency_overrides[get_request_repository] = lambda: repo
+    try:
+        response = TestClient(app).post("/api/admin/requests/reclassify")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1]["done"] is True
+    assert events[-1]["changed"] == 3
+
+
+def test_run_lock_is_shared_through_the_checkpoint_file(tmp_path, monkeypatch) -> None:
+    checkpoint = str(tmp_path / "cp.json")
+    monkeypatch.setattr(settings, "reclassify_checkpoint_path", checkpoint)
+    repo = InMemoryRequestRepository()
+    _seed(repo)
+    holder = RequestReclassifier(repo, checkpoint)
+    assert holder.acquire()
+    # Another instance stands in for another worker or the CLI.
+    assert not RequestReclassifier(repo, checkpoint).acquire()
+
+    app.dependency_overrides[get_request_repository] = lambda: repo
+    try:
+        client = TestClient(app)
+        assert client.post("/api/admin/requests/reclassify").status_code == 409
+        holder.release()
+        assert client.post("/api/admin/requests/reclassify").status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+    assert RequestReclassifier(repo, checkpoint).acquire()
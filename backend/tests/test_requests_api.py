@@ -1,3 +1,7 @@
+import base64
+import csv
+import io
+import json
 from decimal import Decimal
 
 import pytest
@@ -5,6 +9,7 @@ from fastapi.testclient import TestClient
 
 from app.main import app
 from app.repositories.memory_requests import InMemoryRequestRepository
+from app.services.request_export import CSV_COLUMNS
 from app.services.request_service import get_request_repository
 
 
@@ -60,3 +65,220 @@ def test_create_and_fetch_request(client: TestClient) -> None:
     )
     assert patch_resp.status_code == 200
     assert patch_resp.json()["status"] == "In Progress"
+
+
+def _create(client: TestClient, title: str, total: str) -> str:
+    payload = {
+        "requestor_name": "Jane Doe",
+        "title": title,
+        "vendor_name": "Acme",
+        "vendor_vat_id": "DE123456789",
+        "department": "IT",
+        "commodity_group": "031",
+        "order_lines": [
+            {
+                "position_description": title,
+                "unit_price": total,
+                "amount": 1,
+                "unit": "Stk",
+                "total_price": total,
+            }
+        ],
+        "total_cost": total,
+    }
+    response = client.post("/api/requests", json=payload)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_list_requests_paginates_with_cursor(client: TestClient) -> None:
+    totals = ["30.00", "10.00", "50.00", "10.00", "40.00"]
+    ids = [_create(client, f"Request {i}", total) for i, total in enumerate(totals)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"sort": "total_cost", "order": "desc", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/requests", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert [Decimal(item["total_cost"]) for item in seen] == [50, 40, 30, 10, 10]
+    assert sorted(item["id"] for item in seen) == sorted(ids)
+    # Ties are broken by creation order, reversed along with the sort.
+    assert [item["id"] for item in seen[3:]] == [ids[3], ids[1]]
+
+    first_page = client.get("/api/requests", params={"limit": 2})
+    assert [item["id"] for item in first_page.json()] == ids[:2]
+    mismatched = client.get(
+        "/api/requests",
+        params={"limit": 2, "sort": "status", "cursor": first_page.headers["X-Next-Cursor"]},
+    )
+    assert mismatched.status_code == 400
+    assert client.get("/api/requests", params={"cursor": "not-a-cursor"}).status_code == 400
+    for forged in (
+        {"s": "total_cost", "d": False, "v": "abc", "t": 1},
+        {"s": "total_cost", "d": False, "v": "NaN", "t": 1},
+        {"s": "total_cost", "d": False, "v": "10", "t": "x"},
+        {"s": "status", "d": False, "v": 1e400, "t": 1},
+    ):
+        token = base64.urlsafe_b64encode(json.dumps(forged).encode()).decode()
+        response = client.get(
+            "/api/requests", params={"sort": forged["s"], "cursor": token}
+        )
+        assert response.status_code == 400, forged
+
+
+def test_list_response_matches_models_and_gzips_large_pages(
+    client: TestClient, monkeypatch
+) -> None:
+    from app.core.config import settings
+
+    ids = [_create(client, f"Request {i}", "10.00") for i in range(3)]
+    expected = [client.get(f"/api/requests/{request_id}").json() for request_id in ids]
+
+    page = client.get("/api/requests", params={"limit": 2})
+    assert page.headers["content-type"] == "application/json"
+    assert "content-encoding" not in page.headers
+    assert page.json() == expected[:2]
+    assert page.headers["X-Next-Cursor"]
+
+    monkeypatch.setattr(settings, "requests_list_gzip_min_bytes", 1)
+    compressed = client.get("/api/requests", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.json() == expected
+    plain = client.get("/api/requests", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == expected
+
+
+def test_import_requests_from_ndjson_reports_bad_lines(client: TestClient) -> None:
+    good = {
+        "requestor_name": "Jane Doe",
+        "title": "Laptops",
+        "vendor_name": "Acme",
+        "vendor_vat_id": "DE123456789",
+        "department": "IT",
+        "order_lines": [
+            {
+                "position_description": "Laptop",
+                "unit_price": "1000.00",
+                "amount": 2,
+                "unit": "Stk",
+                "total_price": "2000.00",
+            }
+        ],
+        "total_cost": "1.00",
+    }
+    body = "\n".join(
+        [
+            json.dumps(good),
+            "{not json",
+            "",
+            json.dumps({**good, "vendor_vat_id": None}),
+            json.dumps({**good, "title": "Monitors"}),
+        ]
+    )
+
+    response = client.post(
+        "/api/requests/import",
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["failed"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 4]
+    assert "vendor_vat_id" in result["errors"][1]["error"]
+
+    items = client.get("/api/requests").json()
+    assert [item["title"] for item in items] == ["Laptops", "Monitors"]
+    assert Decimal(items[0]["total_cost"]) == Decimal("2000.00")
+    assert items[0]["commodity_group"]
+
+
+def test_import_reports_oversized_lines_and_keeps_going(client: TestClient, monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "requests_import_batch_size", 1)
+    monkeypatch.setattr(settings, "requests_import_max_line_bytes", 2048)
+    line = json.dumps(
+        {
+            "requestor_name": "Jane Doe",
+            "title": "Laptops",
+            "vendor_name": "Acme",
+            "vendor_vat_id": "DE123456789",
+            "department": "IT",
+            "order_lines": [],
+            "total_cost": "0",
+        }
+    )
+    oversized = json.dumps({"title": "x" * 10_000})
+    body = "\n".join([line, oversized, line, oversized]).encode()
+
+    def chunks():
+        for start in range(0, len(body), 1000):
+            yield body[start : start + 1000]
+
+    response = client.post(
+        "/api/requests/import",
+        content=chunks(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["imported"], result["failed"]) == (2, 2)
+    assert [error["line"] for error in result["errors"]] == [2, 4]
+    assert "2048 bytes" in result["errors"][0]["error"]
+
+
+def test_export_streams_ndjson_and_csv(client: TestClient, monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "requests_export_batch_size", 2)
+    titles = ["Laptops", "Monitors", "Desks", "Chairs", "Lamps"]
+    ids = [_create(client, title, f"{i + 1}0.00") for i, title in enumerate(titles)]
+
+    response = client.get("/api/requests/export")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["id"] for item in exported] == ids
+
+    response = client.get(
+        "/api/requests/export", params={"format": "csv", "search": "chairs"}
+    )
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["request_id"], row["line_number"]) for row in rows] == [(ids[3], "1")]
+    assert rows[0]["total_price"] == "40.00"
+
+    empty = client.get("/api/requests/export", params={"format": "csv", "search": "none"})
+    assert empty.text.strip() == ",".join(CSV_COLUMNS)
+
+
+def test_aggregates_follow_creates_and_status_changes(client: TestClient) -> None:
+    first = _create(client, "Laptops", "1200.50")
+    _create(client, "Monitors", "300.25")
+    client.patch(f"/api/requests/{first}/status", json={"status": "Closed"})
+
+    response = client.get("/api/requests/aggregates")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["request_count"] == 2
+    assert Decimal(body["total_spend"]) == Decimal("1500.75")
+    assert [
+        (bucket["key"], bucket["request_count"]) for bucket in body["by_status"]
+    ] == [("Closed", 1), ("Open", 1)]
+    # Departments are bucketed by the case-insensitive key the filters use.
+    assert [bucket["key"] for bucket in body["by_department"]] == ["it"]
@@ -0,0 +1,192 @@
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.models.order_line import OrderLine
+from app.models.request import ProcurementRequestCreate
+from app.models.status import RequestStatus
+from app.repositories.base import RequestRepository, StaleRequestError
+from app.repositories.memory_requests import InMemoryRequestRepository
+from app.repositories.pagination import RequestSortField
+from app.repositories.sqlite_requests import SQLiteRequestRepository
+from app.repositories.threaded import ThreadedAsyncRequestRepository
+from app.services.commodity_service import CommodityService
+from app.services.request_service import AsyncRequestService
+
+
+def _payload(
+    title: str, department: str, total: str, line: str = "Item"
+) -> ProcurementRequestCreate:
+    return ProcurementRequestCreate(
+        requestor_name="Jane Doe",
+        title=title,
+        vendor_name="Müller GmbH",
+        vendor_vat_id="DE123456789",
+        department=department,
+        order_lines=[
+            OrderLine(
+                position_description=line,
+                unit_price=total,
+                amount=1,
+                unit="Stk",
+                total_price=total,
+            )
+        ],
+        total_cost=total,
+    )
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    repository = SQLiteRequestRepository(str(tmp_path / "requests.db"))
+    yield repository
+    repository.close()
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def any_repo(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryRequestRepository()
+        return
+    repository = SQLiteRequestRepository(str(tmp_path / "requests.db"))
+    yield repository
+    repository.close()
+
+
+def test_update_rejects_unknown_ids_and_stale_copies(any_repo) -> None:
+    created = any_repo.create(_payload("Laptops", "IT", "1200.50"))
+    with pytest.raises(KeyError):
+        any_repo.update(created.model_copy(update={"id": uuid4()}))
+
+    stale = any_repo.get(created.id)
+    any_repo.update_commodity_groups({created.id: "Information Technology - Hardware"})
+    stale.status = RequestStatus.CLOSED
+    with pytest.raises(StaleRequestError):
+        any_repo.update(stale)
+    assert any_repo.get(created.id).status == RequestStatus.OPEN
+
+    # The service re-reads, so a status change keeps the re-classified group.
+    service = AsyncRequestService(ThreadedAsyncRequestRepository(any_repo), CommodityService())
+    updated = asyncio.run(service.update_status(created.id, RequestStatus.CLOSED))
+    stored = any_repo.get(created.id)
+    assert updated.status == stored.status == RequestStatus.CLOSED
+    assert stored.commodity_group == "Information Technology - Hardware"
+    # The returned copy is current, so it can be updated again.
+    updated.title = "ThinkPads"
+    any_repo.update(updated)
+    assert any_repo.get(created.id).title == "ThinkPads"
+
+
+def test_requests_survive_a_new_repository_instance(tmp_path) -> None:
+    path = str(tmp_path / "requests.db")
+    first = SQLiteRequestRepository(path)
+    created = first.create(_payload("Laptops", "IT", "1200.50", "ThinkPad X1"))
+    created.status = RequestStatus.IN_PROGRESS
+    first.update(created)
+    first.close()
+
+    second = SQLiteRequestRepository(path)
+    loaded = second.get(created.id)
+    second.close()
+
+    assert loaded is not None
+    assert loaded.status is RequestStatus.IN_PROGRESS
+    assert loaded.total_cost == Decimal("1200.50")
+    assert loaded.order_lines[0].position_description == "ThinkPad X1"
+    assert loaded.created_at == created.created_at
+
+
+def test_matches_in_memory_filters_search_and_pages(repo) -> None:
+    memory = InMemoryRequestRepository()
+    rows = [
+        ("Laptop", "IT", "300.00", "Dell Monitor"),
+        ("Chairs", "Facilities", "100.00", "Office chair"),
+        ("Monitor arms", "it", "100.00", "Arm"),
+        ("Laptop bag", "HR", "50.00", "Bag"),
+        ("Müller Schrauben", "Facilities", "20.00", "Schrauben"),
+    ]
+    for title, department, total, line in rows:
+        for store in (memory, repo):
+            store.create(_payload(title, department, total, line))
+
+    def titles(items):
+        return [r.title for r in items]
+
+    assert titles(repo.list(department="IT")) == titles(memory.list(department="IT"))
+    assert titles(repo.list(search="monitor")) == titles(memory.list(search="monitor"))
+    assert titles(repo.list(search="MÜLLER schrauben")) == ["Müller Schrauben"]
+    assert repo.list(status_filter=RequestStatus.CLOSED) == []
+
+    for sort in (RequestSortField.TOTAL_COST, RequestSortField.CREATED_AT):
+        for descending in (False, True):
+            collected, cursor = [], None
+            while True:
+                page, cursor = repo.list_page(
+                    sort, descending=descending, limit=2, cursor=cursor
+                )
+                collected.extend(page)
+                if cursor is None:
+                    break
+            expected, _ = memory.list_page(sort, descending=descending, limit=10)
+            assert titles(collected) == titles(expected)
+
+
+def test_filtered_queries_use_indexes(repo) -> None:
+    conn = repo._connection()
+    plan = " ".join(
+        row[-1]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT seq FROM requests WHERE department_key = ? ORDER BY seq",
+            ("it",),
+        )
+    )
+    assert "ix_requests_department" in plan
+
+
+def test_spend_rollups_match_a_full_scan(tmp_path) -> None:
+    path = str(tmp_path / "requests.db")
+    repo = SQLiteRequestRepository(path)
+    memory = InMemoryRequestRepository()
+    for store in (repo, memory):
+        laptops = store.create(_payload("Laptops", "IT", "1200.50"))
+        store.create_many(
+            [_payload("Monitors", "it", "300.25"), _payload("Desks", "Facilities", "99.99")]
+        )
+        laptops.status = RequestStatus.CLOSED
+        laptops.total_cost = Decimal("1000.00")
+        store.update(laptops)
+
+    scanned = RequestRepository.aggregates(memory)
+    assert memory.aggregates() == scanned
+    assert repo.aggregates() == scanned
+    assert scanned.request_count == 3
+    assert scanned.total_spend == Decimal("1400.24")
+    assert [(b.key, b.request_count) for b in scanned.by_status] == [
+        ("Closed", 1),
+        ("Open", 2),
+    ]
+    # "IT" and "it" share a bucket, as they share the department filter.
+    assert [(b.key, b.request_count) for b in scanned.by_department] == [
+        ("it", 2),
+        ("facilities", 1),
+    ]
+
+    # Department rollups keyed by the raw name are rebuilt on open.
+    conn = repo._connection()
+    conn.execute(
+        "UPDATE request_rollups SET key = 'IT' WHERE dimension = 'department' AND key = 'it'"
+    )
+    conn.commit()
+    repo.close()
+    repo = SQLiteRequestRepository(path)
+    assert repo.aggregates() == scanned
+
+    # Databases written before the rollup table existed are backfilled on open.
+    repo._connection().execute("DELETE FROM request_rollups")
+    repo._connection().commit()
+    repo.close()
+    reopened = SQLiteRequestRepository(path)
+    assert reopened.aggregates() == scanned
+    reopened.close()
@@ -0,0 +1,83 @@
+import base64
+import hashlib
+from io import BytesIO
+
+import pytest
+from fastapi import FastAPI, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.uploads import (
+    UploadSizeLimitMiddleware,
+    UploadTooLargeError,
+    encode_base64,
+    spool_upload,
+)
+from app.main import app, create_app
+
+
+def _upload(content: bytes) -> UploadFile:
+    return UploadFile(filename="offer.pdf", file=BytesIO(content))
+
+
+@pytest.mark.asyncio
+async def test_large_upload_spools_to_disk_with_streamed_hash() -> None:
+    content = b"%PDF-1.4" + bytes(range(256)) * 2000
+
+    upload = await spool_upload(_upload(content), max_bytes=10**6, spool_threshold=1024)
+    try:
+        assert upload.size == len(content)
+        assert upload.sha256 == hashlib.sha256(content).hexdigest()
+        assert encode_base64(upload) == base64.b64encode(content).decode("ascii")
+        with upload.open_view() as view:
+            assert view.read(8) == b"%PDF-1.4"
+    finally:
+        upload.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_over_limit_is_rejected() -> None:
+    with pytest.raises(UploadTooLargeError):
+        await spool_upload(_upload(b"x" * 5000), max_bytes=4096)
+
+
+def test_oversized_file_is_rejected_with_413(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "offer_upload_max_bytes", 1024)
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/offers/parse",
+        files={"file": ("offer.pdf", b"x" * 2048, "application/pdf")},
+    )
+
+    assert response.status_code == 413
+
+
+def test_middleware_rejects_oversized_body_before_route() -> None:
+    limited = FastAPI()
+    limited.add_middleware(UploadSizeLimitMiddleware, max_body_bytes=100, path_prefix="/up")
+
+    @limited.post("/up")
+    async def upload(request: Request) -> dict:
+        return {"size": len(await request.body())}
+
+    client = TestClient(limited)
+    assert client.post("/up", content=b"x" * 50).json() == {"size": 50}
+    assert client.post("/up", content=b"x" * 101).status_code == 413
+
+
+def test_single_file_route_is_capped_while_streaming_with_cors_headers(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "offer_upload_max_bytes", 1024)
+    client = TestClient(create_app())
+    origin = settings.cors_allow_origins[0]
+
+    response = client.post(
+        "/api/offers/parse",
+        files={"file": ("offer.pdf", b"x" * 32 * 1024, "application/pdf")},
+        headers={"Origin": origin},
+    )
+
+    # Refused by the middleware (not after spooling), and readable by the browser.
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Request body exceeds")
+    assert response.headers["access-control-allow-origin"] == origin
@@ -1,17 +1,17 @@
 // src/app/requests/page.tsx
 
 import Link from 'next/link';
-import type { ProcurementRequest } from '@/lib/types';
-import { listProcurementRequests, ApiError } from '@/lib/api';
+import { listProcurementRequests, ApiError, type ProcurementRequestPage } from '@/lib/api';
 import { RequestsOverview } from '@/components/RequestsOverview';
 import { Button } from '@/components/ui/button';
 
 export default async function RequestsPage() {
-  let requests: ProcurementRequest[] = [];
+  let page: ProcurementRequestPage = { requests: [], nextCursor: null };
   let error: string | null = null;
 
   try {
-    requests = await listProcurementRequests();
+    // Only the first page; the overview loads more on demand.
+    page = await listProcurementRequests(undefined, { sort: 'created_at', order: 'desc' });
   } catch (err) {
     console.error('Failed to load procurement requests', err);
     error = err instanceof ApiError ? err.message : 'Unable to load requests. Please try again.';
@@ -31,7 +31,7 @@ export default async function RequestsPage() {
         </Button>
       </header>
 
-      <RequestsOverview requests={requests} error={error} />
+      <RequestsOverview initialPage={page} error={error} />
     </div>
   );
 }
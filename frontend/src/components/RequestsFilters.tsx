@@ -98,14 +98,14 @@ export function RequestsFilters({
 
         <Input
           className="w-full sm:w-[220px]"
-          placeholder="Search by title or vendor"
+          placeholder="Search title, vendor or items"
           value={searchValue}
           onChange={(e) => setSearchValue(e.target.value)}
         />
 
         <Input
           className="w-full sm:w-[180px]"
-          placeholder="Department"
+          placeholder="Department (exact name)"
           value={departmentValue}
           onChange={(e) => setDepartmentValue(e.target.value)}
         />
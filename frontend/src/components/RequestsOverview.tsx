@@ -1,8 +1,15 @@
 'use client';
 
-import { useMemo, useState } from 'react';
+import { useMemo, useRef, useState } from 'react';
 import Link from 'next/link';
-import type { ProcurementRequest, RequestStatus } from '@/lib/types';
+import type { RequestStatus } from '@/lib/types';
+import {
+  ApiError,
+  listProcurementRequests,
+  type ProcurementRequestFilters,
+  type ProcurementRequestPage,
+  type RequestSortColumn,
+} from '@/lib/api';
 import { RequestsFilters } from '@/components/RequestsFilters';
 import { StatusBadge } from '@/components/StatusBadge';
 import {
@@ -22,33 +29,58 @@ import {
   TableRow,
 } from '@/components/ui/table';
 
-type SortColumn =
-  | 'id'
-  | 'title'
-  | 'vendor_name'
-  | 'department'
-  | 'total_cost'
-  | 'created_at'
-  | 'status';
+// Columns the API can order by; the list is paged, so sorting happens server-side.
+type SortColumn = Exclude<RequestSortColumn, 'updated_at'>;
 
 interface RequestsOverviewProps {
-  requests: ProcurementRequest[];
+  initialPage: ProcurementRequestPage;
   error?: string | null;
 }
 
 const sortLabel = (active: boolean, direction: 'asc' | 'desc') =>
   active ? (direction === 'asc' ? '^' : 'v') : '<>';
 
-export function RequestsOverview({ requests, error }: RequestsOverviewProps) {
-  const [filters, setFilters] = useState<{
-    status?: RequestStatus;
-    search?: string;
-    department?: string;
-  }>({});
+const loadErrorMessage = (err: unknown) =>
+  err instanceof ApiError ? err.message : 'Unable to load requests. Please try again.';
+
+export function RequestsOverview({ initialPage, error: initialError }: RequestsOverviewProps) {
+  const [requests, setRequests] = useState(initialPage.requests);
+  const [nextCursor, setNextCursor] = useState(initialPage.nextCursor);
+  const [error, setError] = useState(initialError ?? null);
+  const [loading, setLoading] = useState(false);
+  const [filters, setFilters] = useState<ProcurementRequestFilters>({});
   const [sort, setSort] = useState<{ column: SortColumn; direction: 'asc' | 'desc' }>({
     column: 'created_at',
     direction: 'desc',
   });
+  // Responses to superseded queries (filters or sort changed meanwhile) are dropped.
+  const queryRef = useRef(0);
+
+  const loadPage = async (
+    nextFilters: ProcurementRequestFilters,
+    nextSort: { column: SortColumn; direction: 'asc' | 'desc' },
+    cursor: string | null
+  ) => {
+    const query = cursor ? queryRef.current : ++queryRef.current;
+    setLoading(true);
+    try {
+      const page = await listProcurementRequests(nextFilters, {
+        sort: nextSort.column,
+        order: nextSort.direction,
+        cursor,
+      });
+      if (query !== queryRef.current) return;
+      setRequests((prev) => (cursor ? [...prev, ...page.requests] : page.requests));
+      setNextCursor(page.nextCursor);
+      setError(null);
+    } catch (err) {
+      if (query !== queryRef.current) return;
+      console.error('Failed to load procurement requests', err);
+      setError(loadErrorMessage(err));
+    } finally {
+      if (query === queryRef.current) setLoading(false);
+    }
+  };
 
   const currencyFormatter = useMemo(
     () =>
@@ -69,72 +101,30 @@ export function RequestsOverview({ requests, error }: RequestsOverviewProps) {
   );
 
   const toggleSort = (column: SortColumn) => {
-    setSort((prev) => {
-      if (prev.column === column) {
-        return { column, direction: prev.direction === 'asc' ? 'desc' : 'asc' };
-      }
+    let direction: 'asc' | 'desc';
+    if (sort.column === column) {
+      direction = sort.direction === 'asc' ? 'desc' : 'asc';
+    } else {
       // Default to ascending except for created_at where descending is more useful
-      const defaultDirection = column === 'created_at' ? 'desc' : 'asc';
-      return { column, direction: defaultDirection };
-    });
+      direction = column === 'created_at' ? 'desc' : 'asc';
+    }
+    const next = { column, direction };
+    setSort(next);
+    void loadPage(filters, next, null);
   };
 
-  const filteredRequests = useMemo(() => {
-    const searchTerm = filters.search?.toLowerCase() ?? '';
-    const departmentTerm = filters.department?.toLowerCase() ?? '';
-
-    return requests.filter((req) => {
-      const matchesStatus = !filters.status || req.status === filters.status;
-      const matchesDepartment =
-        !departmentTerm || req.department.toLowerCase().includes(departmentTerm);
-      const matchesSearch =
-        !searchTerm ||
-        [req.title, req.vendor_name].some((value) => value.toLowerCase().includes(searchTerm));
-      return matchesStatus && matchesDepartment && matchesSearch;
-    });
-  }, [requests, filters]);
-
-  const sortedRequests = useMemo(() => {
-    const sorted = [...filteredRequests];
-    sorted.sort((a, b) => {
-      let comparison = 0;
-
-      switch (sort.column) {
-        case 'total_cost':
-          comparison = a.total_cost - b.total_cost;
-          break;
-        case 'created_at':
-          comparison =
-            new Date(a.created_at).getTime() - new Date(b.created_at).getTime();
-          break;
-        case 'id':
-        case 'title':
-        case 'vendor_name':
-        case 'department':
-        case 'status':
-          comparison = a[sort.column].toString().localeCompare(b[sort.column].toString(), undefined, {
-            sensitivity: 'base',
-          });
-          break;
-        default:
-          comparison = 0;
-      }
-
-      return sort.direction === 'asc' ? comparison : -comparison;
-    });
-    return sorted;
-  }, [filteredRequests, sort]);
-
-  const handleApplyFilters = (next: {
-    status?: RequestStatus;
-    search?: string;
-    department?: string;
-  }) => {
+  const handleApplyFilters = (next: ProcurementRequestFilters) => {
     setFilters(next);
+    void loadPage(next, sort, null);
   };
 
   const handleResetFilters = () => {
     setFilters({});
+    void loadPage({}, sort, null);
+  };
+
+  const handleLoadMore = () => {
+    if (nextCursor) void loadPage(filters, sort, nextCursor);
   };
 
   if (error) {
@@ -162,53 +152,31 @@ export function RequestsOverview({ requests, error }: RequestsOverviewProps) {
         onReset={handleResetFilters}
       />
 
-      {sortedRequests.length === 0 ? (
+      {requests.length === 0 ? (
         <EmptyState />
       ) : (
         <Card className="overflow-hidden shadow-sm">
           <CardHeader className="space-y-1">
             <CardTitle className="text-base">Requests</CardTitle>
-            <CardDescription>{sortedRequests.length} results</CardDescription>
+            <CardDescription>
+              {requests.length} {nextCursor ? 'loaded, more available' : 'results'}
+            </CardDescription>
           </CardHeader>
           <CardContent className="overflow-x-auto">
             <Table>
               <TableHeader>
                 <TableRow>
                   <TableHead className="whitespace-nowrap">
-                    <SortableHeader
-                      label="ID"
-                      column="id"
-                      activeColumn={sort.column}
-                      direction={sort.direction}
-                      onToggle={toggleSort}
-                    />
+                    <ColumnLabel label="ID" />
                   </TableHead>
                   <TableHead>
-                    <SortableHeader
-                      label="Title"
-                      column="title"
-                      activeColumn={sort.column}
-                      direction={sort.direction}
-                      onToggle={toggleSort}
-                    />
+                    <ColumnLabel label="Title" />
                   </TableHead>
                   <TableHead>
-                    <SortableHeader
-                      label="Vendor"
-                      column="vendor_name"
-                      activeColumn={sort.column}
-                      direction={sort.direction}
-                      onToggle={toggleSort}
-                    />
+                    <ColumnLabel label="Vendor" />
                   </TableHead>
                   <TableHead>
-                    <SortableHeader
-                      label="Department"
-                      column="department"
-                      activeColumn={sort.column}
-                      direction={sort.direction}
-                      onToggle={toggleSort}
-                    />
+                    <ColumnLabel label="Department" />
                   </TableHead>
                   <TableHead className="text-right">
                     <SortableHeader
@@ -242,7 +210,7 @@ export function RequestsOverview({ requests, error }: RequestsOverviewProps) {
                 </TableRow>
               </TableHeader>
               <TableBody>
-                {sortedRequests.map((request) => (
+                {requests.map((request) => (
                   <TableRow key={request.id} className="align-top">
                     <TableCell className="font-mono text-xs text-slate-600">
                       {request.id.slice(0, 8)}...
@@ -268,6 +236,18 @@ export function RequestsOverview({ requests, error }: RequestsOverviewProps) {
                 ))}
               </TableBody>
             </Table>
+            {nextCursor && (
+              <div className="flex justify-center pt-4">
+                <Button
+                  type="button"
+                  variant="outline"
+                  onClick={handleLoadMore}
+                  disabled={loading}
+                >
+                  {loading ? 'Loading...' : 'Load more'}
+                </Button>
+              </div>
+            )}
           </CardContent>
         </Card>
       )}
@@ -305,6 +285,12 @@ function SortableHeader({
   );
 }
 
+function ColumnLabel({ label }: { label: string }) {
+  return (
+    <span className="text-xs font-semibold uppercase tracking-wide text-slate-600">{label}</span>
+  );
+}
+
 function EmptyState() {
   return (
     <Card className="border-dashed">
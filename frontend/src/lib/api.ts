@@ -2,6 +2,7 @@
 
 import type {
   ProcurementRequest,
+  OfferExtractionJob,
   OfferExtractionResult,
   RequestStatus,
   OrderLine,
@@ -94,19 +95,40 @@ export async function createProcurementRequest(
   return handleApiResponse<ProcurementRequest>(response);
 }
 
+export type RequestSortColumn = 'created_at' | 'updated_at' | 'total_cost' | 'status';
+
+export interface ProcurementRequestPageOptions {
+  sort?: RequestSortColumn;
+  order?: 'asc' | 'desc';
+  cursor?: string | null;
+  limit?: number;
+}
+
+export interface ProcurementRequestPage {
+  requests: ProcurementRequest[];
+  nextCursor: string | null;
+}
+
+export const REQUESTS_PAGE_SIZE = 100;
+
 export async function listProcurementRequests(
-  filters?: ProcurementRequestFilters
-): Promise<ProcurementRequest[]> {
+  filters?: ProcurementRequestFilters,
+  options?: ProcurementRequestPageOptions
+): Promise<ProcurementRequestPage> {
   const params = new URLSearchParams();
-  if (filters?.status) params.set('status', filters.status);
+  if (filters?.status) params.set('status_filter', filters.status);
   if (filters?.department) params.set('department', filters.department);
   if (filters?.search) params.set('search', filters.search);
+  if (options?.sort) params.set('sort', options.sort);
+  if (options?.order) params.set('order', options.order);
+  if (options?.cursor) params.set('cursor', options.cursor);
+  params.set('limit', String(options?.limit ?? REQUESTS_PAGE_SIZE));
 
   const response = await fetch(buildUrl('/requests', params), {
     cache: 'no-store',
   });
-
-  return handleApiResponse<ProcurementRequest[]>(response);
+  const requests = await handleApiResponse<ProcurementRequest[]>(response);
+  return { requests, nextCursor: response.headers.get('X-Next-Cursor') };
 }
 
 export async function getProcurementRequest(
@@ -136,15 +158,34 @@ export async function updateRequestStatus(
   return handleApiResponse<ProcurementRequest>(response);
 }
 
+// Long-poll window per status request; the backend caps this at 30 seconds.
+const OFFER_JOB_POLL_WAIT_SECONDS = 25;
+
 export async function parseOffer(file: File): Promise<OfferExtractionResult> {
   const formData = new FormData();
   formData.append('file', file);
 
-  const response = await fetch(buildUrl('/offers/parse'), {
+  // Submit as a background job so no single HTTP call spans the whole LLM round-trip.
+  const submitResponse = await fetch(buildUrl('/offers/jobs'), {
     method: 'POST',
     body: formData,
     cache: 'no-store',
   });
+  let job = await handleApiResponse<OfferExtractionJob>(submitResponse);
+
+  while (job.status === 'queued' || job.status === 'running') {
+    const params = new URLSearchParams({
+      wait: String(OFFER_JOB_POLL_WAIT_SECONDS),
+    });
+    const pollResponse = await fetch(
+      buildUrl(`/offers/jobs/${encodeURIComponent(job.id)}`, params),
+      { cache: 'no-store' }
+    );
+    job = await handleApiResponse<OfferExtractionJob>(pollResponse);
+  }
 
-  return handleApiResponse<OfferExtractionResult>(response);
+  if (job.status === 'failed' || !job.result) {
+    throw new ApiError(500, job.error ?? 'Failed to parse offer document.', job);
+  }
+  return job.result;
 }
@@ -37,6 +37,19 @@ export interface OfferExtractionResult {
   commodity_group_suggestion?: string | null;
 }
 
+export type OfferJobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface OfferExtractionJob {
+  id: string;
+  filename: string;
+  status: OfferJobStatus;
+  result?: OfferExtractionResult | null;
+  error?: string | null;
+  created_at: string;
+  started_at?: string | null;
+  finished_at?: string | null;
+}
+
 // Optional: simple list of commodity groups for selects etc.
 export const COMMODITY_GROUPS: string[] = [
   // General Services